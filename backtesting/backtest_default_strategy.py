@@ -1,76 +1,61 @@
-import requests
-import pandas as pd
-
-import backtrader as bt
-
-
-class SoltradeStrategy(bt.Strategy):
-    def __init__(self):
-        self.rsi = bt.ind.RSI(self.data.close, period=14)
-        self.bb = bt.ind.BollingerBands(self.data.close, period=14)
-        self.ema_short = bt.ind.ExponentialMovingAverage(self.data.close, period=5)
-        self.ema_medium = bt.ind.ExponentialMovingAverage(self.data.close, period=20)
-        self.stoploss = 0
-        self.takeprofit = 0
-
-    def next(self):
+"""Backtest the configured strategy on locally cached Binance candles.
 
-        if not self.position:
-            if (
-                self.ema_short > self.ema_medium or self.data.close < self.bb.lines.bot
-            ) and self.rsi <= 31:
-                self.buy()
-                self.stoploss = self.data.close * 0.925
-                self.takeprofit = self.data.close * 1.25
-        else:
-            if self.data.close <= self.stoploss or self.data.close >= self.takeprofit:
-                self.close()
+Run from the repository root with ``python -m backtesting.backtest_default_strategy``.
+"""
 
-            if (
-                self.ema_short < self.ema_medium or self.data.close > self.bb.lines.top
-            ) and self.rsi >= 68:
-                self.close()
+import argparse
+import time
 
+import pandas as pd
 
-def format_data():
-    url = "https://api.binance.us/api/v3/klines"
-    params = {
-        "symbol": "SOLUSDT",
-        "interval": "15m",
-        "limit": 1500,
-    }
-    response = requests.get(url, params=params)
-    candle_dict = response.json()
-
-    columns = [
-        "time",
-        "open",
-        "high",
-        "low",
-        "close",
-        "volume",
-        "CT",
-        "QV",
-        "N",
-        "TB",
-        "TQ",
-        "I",
-    ]
-    df = pd.DataFrame(candle_dict, columns=columns)
-    df["time"] = pd.to_datetime(df["time"], utc=True, unit="ms")
-    df["open"] = pd.to_numeric(df["open"])
-    df["high"] = pd.to_numeric(df["high"])
-    df["low"] = pd.to_numeric(df["low"])
-    df["close"] = pd.to_numeric(df["close"])
-    df["volume"] = pd.to_numeric(df["volume"])
-    formatted_df = df.set_index("time")
-    return formatted_df
-
-
-data = bt.feeds.PandasData(dataname=format_data())
-
-cerebro = bt.Cerebro()
-cerebro.addstrategy(SoltradeStrategy)
-cerebro.adddata(data)
-cerebro.run()
-cerebro.plot()
+from soltrade.async_runtime import runtime
+from soltrade.backtest import run_backtest
+from soltrade.history import load_frame
+from soltrade.http_client import close_clients
+
+
+def add_data_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--symbol", default="SOLUSDT")
+    parser.add_argument("--days", type=float, default=30, help="history length when --start is not given")
+    parser.add_argument("--start", default=None, help="e.g. 2024-01-01")
+    parser.add_argument("--end", default=None, help="defaults to the last closed minute")
+    parser.add_argument(
+        "--interval-minutes", type=int, default=None, help="defaults to trading_interval_minutes"
+    )
+    parser.add_argument("--offline", action="store_true", help="only use locally stored history")
+
+
+def load_data(args: argparse.Namespace) -> pd.DataFrame:
+    start = args.start if args.start is not None else int(time.time() - args.days * 86400)
+    try:
+        return load_frame(
+            args.symbol, start, args.end, args.interval_minutes, download=not args.offline
+        )
+    finally:
+        # The download client is done with once the history is stored
+        runtime().run(close_clients())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    add_data_arguments(parser)
+    parser.add_argument("--strategy", default=None, help="defaults to the configured strategy")
+    parser.add_argument("--fee-pct", type=float, default=0.1)
+    parser.add_argument("--slippage-pct", type=float, default=0.05)
+    args = parser.parse_args()
+
+    result = run_backtest(
+        load_data(args),
+        strategy_name=args.strategy,
+        fee_pct=args.fee_pct,
+        slippage_pct=args.slippage_pct,
+    )
+    for key, value in result.summary().items():
+        print(f"{key:>18}: {value:.2f}" if isinstance(value, float) else f"{key:>18}: {value}")
+    if not result.trades.empty:
+        print()
+        print(result.trades.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
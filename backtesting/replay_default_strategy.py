@@ -0,0 +1,54 @@
+"""Replay cached Binance candles through the live trading loop against local API stand-ins.
+
+Run from the repository root with ``python -m backtesting.replay_default_strategy``.
+Each configured secondary symbol is replayed from ``<SYMBOL><QUOTE>`` history.
+"""
+
+import argparse
+import time
+
+from soltrade.async_runtime import runtime
+from soltrade.config import config
+from soltrade.history import load_candles
+from soltrade.http_client import close_clients
+from soltrade.replay import run_replay
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--quote", default="USDT", help="Binance quote asset of the recorded pairs")
+    parser.add_argument("--days", type=float, default=1, help="history length when --start is not given")
+    parser.add_argument("--start", default=None, help="e.g. 2024-01-01")
+    parser.add_argument("--end", default=None, help="defaults to the last closed minute")
+    parser.add_argument("--offline", action="store_true", help="only use locally stored history")
+    parser.add_argument("--speed", type=float, default=1000, help="virtual seconds per real second")
+    parser.add_argument("--cycles", type=int, default=None, help="stop after this many updates")
+    parser.add_argument("--balance", type=float, default=1000, help="starting primary mint balance")
+    parser.add_argument("--fee-bps", type=float, default=0)
+    parser.add_argument("--fill-latency-ms", type=float, default=0, help="delay added to each fill")
+    args = parser.parse_args()
+
+    start = args.start if args.start is not None else int(time.time() - args.days * 86400)
+    try:
+        candles = {
+            symbol: load_candles(f"{symbol}{args.quote}", start, args.end, download=not args.offline)
+            for symbol in config().secondary_mint_symbols
+        }
+    finally:
+        runtime().run(close_clients())
+    report = run_replay(
+        candles,
+        speed=args.speed,
+        initial_balance=args.balance,
+        max_cycles=args.cycles,
+        fee_bps=args.fee_bps,
+        fill_latency=args.fill_latency_ms / 1000,
+    )
+    for line in report.summary_lines():
+        print(line)
+    for mint, balance in report.final_balances.items():
+        print(f"{mint}: {balance:.6f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Walk-forward and Monte Carlo robustness report for one or more strategies.
+
+Run from the repository root with ``python -m backtesting.robustness_default_strategy``.
+"""
+
+import argparse
+
+import pandas as pd
+
+from backtesting.backtest_default_strategy import add_data_arguments, load_data
+from backtesting.sweep_default_strategy import GRID, RANGES
+from soltrade.robustness import robustness_report
+from soltrade.sweep import parameter_grid, random_parameters
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    add_data_arguments(parser)
+    parser.add_argument("--strategies", nargs="*", default=[None], help="defaults to the configured strategy")
+    parser.add_argument("--in-sample-bars", type=int, default=20000)
+    parser.add_argument("--out-of-sample-bars", type=int, default=5000)
+    parser.add_argument("--samples", type=int, default=0, help="random configurations instead of the grid")
+    parser.add_argument("--simulations", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--fee-pct", type=float, default=0.1)
+    parser.add_argument("--slippage-pct", type=float, default=0.05)
+    args = parser.parse_args()
+
+    if args.samples:
+        parameter_sets = random_parameters(RANGES, args.samples, args.seed)
+    else:
+        parameter_sets = parameter_grid(GRID)
+    report = robustness_report(
+        load_data(args),
+        parameter_sets,
+        args.in_sample_bars,
+        args.out_of_sample_bars,
+        strategies=args.strategies,
+        simulations=args.simulations,
+        seed=args.seed,
+        workers=args.workers,
+        fee_pct=args.fee_pct,
+        slippage_pct=args.slippage_pct,
+    )
+    with pd.option_context("display.width", 200, "display.float_format", "{:.2f}".format):
+        print(report)
+
+
+if __name__ == "__main__":
+    main()
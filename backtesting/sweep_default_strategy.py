@@ -0,0 +1,49 @@
+"""Sweep stoploss/takeprofit/trailing settings of the configured strategy.
+
+Run from the repository root with ``python -m backtesting.sweep_default_strategy``.
+"""
+
+import argparse
+
+from backtesting.backtest_default_strategy import add_data_arguments, load_data
+from soltrade.sweep import parameter_grid, random_parameters, run_sweep
+
+GRID = {
+    "stoploss": [2, 3, 5, 7.5, 10],
+    "takeprofit": [4, 6, 10, 15, 25],
+    "trailing_stoploss": [1, 2, 3, 5],
+    "trailing_stoploss_target": [2, 5, 8, 12],
+}
+
+RANGES = {name: (min(values), max(values)) for name, values in GRID.items()}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    add_data_arguments(parser)
+    parser.add_argument("--strategy", default=None, help="defaults to the configured strategy")
+    parser.add_argument("--samples", type=int, default=0, help="random configurations instead of the grid")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--fee-pct", type=float, default=0.1)
+    parser.add_argument("--slippage-pct", type=float, default=0.05)
+    parser.add_argument("--top", type=int, default=20)
+    args = parser.parse_args()
+
+    if args.samples:
+        parameter_sets = random_parameters(RANGES, args.samples, args.seed)
+    else:
+        parameter_sets = parameter_grid(GRID)
+    report = run_sweep(
+        load_data(args),
+        parameter_sets,
+        strategy_name=args.strategy,
+        workers=args.workers,
+        fee_pct=args.fee_pct,
+        slippage_pct=args.slippage_pct,
+    )
+    print(report.head(args.top).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+"""Hot-path benchmark cases over synthetic candles.
+
+Every case is a ``setup`` that builds its inputs and returns the callable
+being timed, so data generation never counts towards the measurement.
+"""
+
+import asyncio
+import base64
+import io
+import json
+import os
+import tempfile
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+import pandas as pd
+from rich.console import Console
+from solders.hash import Hash
+from solders.keypair import Keypair
+from solders.message import MessageV0
+from solders.signature import Signature
+from solders.system_program import TransferParams, transfer
+from solders.transaction import VersionedTransaction
+
+from soltrade import strategy as strategy_module
+from soltrade.candles import frame_records, records_frame
+from soltrade.dashboard import DashboardRenderer, DashboardSnapshot, market_rows
+from soltrade.journal import POSITION_COLUMNS, TradeJournal
+from soltrade.market_data import parse_prices
+from soltrade.panel import records_panel
+from soltrade.strategy import calc_trailing_stoploss
+from soltrade.signer import Signer
+from soltrade.transactions import sign_transaction
+from strategies.default_strategy import DefaultStrategy
+
+MINTS = (1, 10, 100, 500)
+BARS = (50, 1_000, 10_000, 100_000)
+QUICK_MINTS = (1, 10, 100)
+QUICK_BARS = (50, 1_000, 10_000)
+SIGN_BATCHES = (1, 10, 100)
+
+# Bars in each live strategy window: the default strategy's declared lookback
+WINDOW_BARS = DefaultStrategy.lookback
+# Extra bars per mint that successive live windows slide over
+_SLIDE_BARS = 2_000
+
+
+@dataclass
+class Case:
+    name: str
+    setup: Callable[[], Callable[[], Any]]
+    params: Dict[str, int] = field(default_factory=dict)
+    # Units of work per call, e.g. signatures in a batch, for a per-item cost
+    items: int = 1
+
+    @property
+    def key(self) -> str:
+        if not self.params:
+            return self.name
+        return f"{self.name}[{','.join(f'{k}={v}' for k, v in self.params.items())}]"
+
+
+def synthetic_candles(bars: int, seed: int = 0) -> pd.DataFrame:
+    """Random-walk 1-minute candles, deterministic per ``seed``."""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.002, bars)))
+    open_ = np.r_[close[0], close[:-1]]
+    spread = np.abs(rng.normal(0, 0.001, bars)) * close
+    start = 1_700_000_000 // 60 * 60
+    return pd.DataFrame(
+        {
+            "time": pd.to_datetime(start + np.arange(bars) * 60, unit="s"),
+            "open": open_,
+            "high": np.maximum(open_, close) + spread,
+            "low": np.minimum(open_, close) - spread,
+            "close": close,
+            "volume": rng.uniform(1, 100, bars),
+        }
+    )
+
+
+def strategy_frame(bars: int, symbol: str, seed: int = 0) -> pd.DataFrame:
+    """A frame as ``perform_analysis`` holds it after the strategy and position columns."""
+    df = DefaultStrategy(synthetic_candles(bars, seed)).apply_strategy()
+    df["total_profit"] = 0
+    df["mint"] = symbol
+    df["position"] = True
+    df["entry_price"] = df["close"].iat[0]
+    df["stoploss"] = df["entry_price"] * 0.95
+    df["takeprofit"] = df["entry_price"] * 1.1
+    df["trailing_stoploss"] = np.nan
+    df["trailing_stoploss_target"] = df["entry_price"] * 1.05
+    return df
+
+
+def _apply_strategy(bars: int) -> Callable[[], Any]:
+    candles = synthetic_candles(bars)
+    return lambda: DefaultStrategy(candles.copy()).apply_strategy()
+
+
+def _strategy_cycle(mints: int) -> Callable[[], Any]:
+    """One live pass: every mint's strategy on its next sliding window of stored candles."""
+    series = [
+        frame_records(synthetic_candles(WINDOW_BARS + _SLIDE_BARS, seed)) for seed in range(mints)
+    ]
+    offset = [0]
+
+    def run() -> None:
+        start = offset[0] % _SLIDE_BARS
+        offset[0] += 1
+        for mint, records in enumerate(series):
+            window = records_frame(records[start : start + WINDOW_BARS])
+            strategy_module.strategy(window, f"mint{mint}")
+
+    return run
+
+
+def _trailing_stoploss(bars: int) -> Callable[[], Any]:
+    df = strategy_frame(bars, "SOL")
+    return lambda: calc_trailing_stoploss(df, "SOL")
+
+
+def _panel_cycle(mints: int) -> Callable[[], Any]:
+    """``_strategy_cycle`` with every mint's window evaluated as one panel."""
+    series = [
+        frame_records(synthetic_candles(WINDOW_BARS + _SLIDE_BARS, seed)) for seed in range(mints)
+    ]
+    symbols = [f"MINT{i}" for i in range(mints)]
+    offset = [0]
+
+    def run() -> None:
+        start = offset[0] % _SLIDE_BARS
+        offset[0] += 1
+        panel = records_panel([records[start : start + WINDOW_BARS] for records in series], symbols)
+        panel.last_rows(strategy_module.panel_strategy(panel))
+
+    return run
+
+
+def _dashboard_rows(mints: int) -> List[Dict[str, Any]]:
+    return [strategy_frame(WINDOW_BARS, f"MINT{i}", i).iloc[-1].to_dict() for i in range(mints)]
+
+
+def _dashboard_build(mints: int) -> Callable[[], Any]:
+    """The trading loop's share of the dashboard: capturing a snapshot."""
+    rows = _dashboard_rows(mints)
+
+    def run() -> None:
+        names, market = market_rows(rows)
+        DashboardSnapshot((), names, market, "2024-01-01 00:00:00", "")
+
+    return run
+
+
+def _dashboard_render(mints: int) -> Callable[[], Any]:
+    """The render thread drawing one page after every price moved."""
+    rows = _dashboard_rows(mints)
+    snapshots = []
+    for move in (1.0, 1.001):
+        names, market = market_rows([{**row, "close": row["close"] * move} for row in rows])
+        snapshots.append(DashboardSnapshot((), names, market, "2024-01-01 00:00:00", ""))
+    renderer = DashboardRenderer(Console(quiet=True))
+    console = Console(file=io.StringIO(), width=200)
+    turn = [0]
+
+    def run() -> None:
+        turn[0] += 1
+        console.file = io.StringIO()
+        console.print(renderer.renderable(snapshots[turn[0] % 2]))
+
+    return run
+
+
+def _position_state_roundtrip(mints: int) -> Callable[[], Any]:
+    """Write then read back every mint's position, as entries and the next pass do."""
+    journal = TradeJournal(os.path.join(tempfile.mkdtemp(prefix="soltrade-bench-"), "bench.db"))
+    last_rows = [strategy_frame(WINDOW_BARS, f"MINT{i}", i).iloc[-1] for i in range(mints)]
+    states = [{col: row[col] for col in POSITION_COLUMNS} for row in last_rows]
+
+    def run() -> None:
+        for i, state in enumerate(states):
+            journal.record_entry(f"mint{i}", f"MINT{i}", 1.0, state)
+        for i in range(mints):
+            journal.latest_position(f"mint{i}")
+
+    return run
+
+
+def _parse_prices(mints: int) -> Callable[[], Any]:
+    ids = [str(Keypair().pubkey()) for _ in range(mints)]
+    body = json.dumps(
+        {
+            mint: {
+                "usdPrice": 100 + i,
+                "blockId": 348004023,
+                "decimals": 9,
+                "priceChange24h": 1.5,
+            }
+            for i, mint in enumerate(ids)
+        }
+    )
+    return lambda: parse_prices(json.loads(body), ids)
+
+
+def _unsigned_transaction(keypair: Keypair) -> str:
+    """A base64 transaction shaped like an Ultra order, awaiting the taker's signature."""
+    taker = keypair.pubkey()
+    message = MessageV0.try_compile(
+        taker,
+        [transfer(TransferParams(from_pubkey=taker, to_pubkey=taker, lamports=0))],
+        [],
+        Hash.default(),
+    )
+    transaction = VersionedTransaction.populate(message, [Signature.default()])
+    return base64.b64encode(bytes(transaction)).decode("utf-8")
+
+
+def _sign_transaction() -> Callable[[], Any]:
+    keypair = Keypair()
+    transaction_b64 = _unsigned_transaction(keypair)
+    return lambda: sign_transaction(transaction_b64, keypair)
+
+
+def _sign_with_key_decode() -> Callable[[], Any]:
+    """Decoding the base58 private key for every signature, as before the signer."""
+    keypair = Keypair()
+    secret = str(keypair)
+    transaction_b64 = _unsigned_transaction(keypair)
+    return lambda: sign_transaction(transaction_b64, Keypair.from_base58_string(secret))
+
+
+def _signer_sign_many(transactions: int) -> Callable[[], Any]:
+    signer = Signer(Keypair())
+    batch = [_unsigned_transaction(signer.keypair)] * transactions
+    return lambda: signer.sign_many(batch)
+
+
+def _signer_sign_many_async(transactions: int) -> Callable[[], Any]:
+    """The batch signed on the signer's worker thread, as the execution path does."""
+    signer = Signer(Keypair())
+    batch = [_unsigned_transaction(signer.keypair)] * transactions
+    loop = asyncio.new_event_loop()
+    return lambda: loop.run_until_complete(signer.sign_many_async(batch))
+
+
+def benchmark_cases(quick: bool = False) -> List[Case]:
+    mints = QUICK_MINTS if quick else MINTS
+    bars = QUICK_BARS if quick else BARS
+    cases: List[Case] = []
+    cases += [Case("apply_strategy", lambda b=b: _apply_strategy(b), {"bars": b}) for b in bars]
+    cases += [Case("strategy_cycle", lambda m=m: _strategy_cycle(m), {"mints": m}) for m in mints]
+    cases += [Case("panel_cycle", lambda m=m: _panel_cycle(m), {"mints": m}) for m in mints]
+    cases += [
+        Case("calc_trailing_stoploss", lambda b=b: _trailing_stoploss(b), {"bars": b}) for b in bars
+    ]
+    cases += [Case("dashboard_build", lambda m=m: _dashboard_build(m), {"mints": m}) for m in mints]
+    cases += [
+        Case("dashboard_render", lambda m=m: _dashboard_render(m), {"mints": m}) for m in mints
+    ]
+    cases += [
+        Case("position_state_roundtrip", lambda m=m: _position_state_roundtrip(m), {"mints": m})
+        for m in mints
+    ]
+    cases += [Case("parse_prices", lambda m=m: _parse_prices(m), {"mints": m}) for m in mints]
+    cases.append(Case("sign_transaction", _sign_transaction))
+    cases.append(Case("sign_with_key_decode", _sign_with_key_decode))
+    cases += [
+        Case("signer_sign_many", lambda n=n: _signer_sign_many(n), {"transactions": n}, n)
+        for n in SIGN_BATCHES
+    ]
+    cases += [
+        Case(
+            "signer_sign_many_async",
+            lambda n=n: _signer_sign_many_async(n),
+            {"transactions": n},
+            n,
+        )
+        for n in SIGN_BATCHES
+    ]
+    return cases
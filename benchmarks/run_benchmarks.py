@@ -0,0 +1,120 @@
+"""Time the trading hot paths and compare them against a saved baseline.
+
+Run from the repository root with ``python -m benchmarks.run_benchmarks``.
+Save a baseline with ``--save-baseline main`` and check a change against it
+with ``--compare main``; the command exits non-zero when any case is more
+than ``--threshold`` percent slower.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import timeit
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Tuple
+
+from benchmarks.cases import benchmark_cases
+
+BASELINE_DIR = os.path.join("benchmarks", "baselines")
+
+
+def measure(fn, repeat: int = 5) -> Dict[str, float]:
+    """Seconds per call: calls are batched to at least 0.2s, ``repeat`` batches are timed."""
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    times = [total / number for total in timer.repeat(repeat, number)]
+    return {"median": statistics.median(times), "min": min(times), "calls": number}
+
+
+def run(quick: bool, name_filter: str, repeat: int) -> Dict[str, Any]:
+    results: Dict[str, Dict[str, float]] = {}
+    for case in benchmark_cases(quick):
+        if name_filter and name_filter not in case.key:
+            continue
+        results[case.key] = result = measure(case.setup(), repeat)
+        line = f"{case.key:<45} {result['median'] * 1000:>12.3f} ms"
+        if case.items > 1:
+            result["per_item"] = result["median"] / case.items
+            line += f"  ({result['per_item'] * 1e6:.1f} us each)"
+        print(line, flush=True)
+    return {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": f"{platform.system()} {platform.machine()}, {os.cpu_count()} CPUs",
+        "results": results,
+    }
+
+
+def compare(
+    baseline: Dict[str, Any], current: Dict[str, Any], threshold: float
+) -> Tuple[List[str], List[str]]:
+    """Report lines per case plus the keys more than ``threshold`` percent slower."""
+    lines = [
+        f"{'case':<45} {'baseline ms':>12} {'current ms':>12} {'change':>9}",
+        "-" * 81,
+    ]
+    regressions = []
+    for key, result in current["results"].items():
+        before = baseline["results"].get(key)
+        if before is None:
+            lines.append(f"{key:<45} {'-':>12} {result['median'] * 1000:>12.3f} {'new':>9}")
+            continue
+        change = (result["median"] / before["median"] - 1) * 100
+        flag = ""
+        if change > threshold:
+            flag = "  REGRESSION"
+            regressions.append(key)
+        elif change < -threshold:
+            flag = "  faster"
+        lines.append(
+            f"{key:<45} {before['median'] * 1000:>12.3f} {result['median'] * 1000:>12.3f} "
+            f"{change:>+8.1f}%{flag}"
+        )
+    lines.append("")
+    lines.append(
+        f"{len(regressions)} regression(s) over {threshold:.0f}% "
+        f"(baseline from {baseline['created']} on {baseline['machine']})"
+    )
+    return lines, regressions
+
+
+def baseline_path(name: str) -> str:
+    return os.path.join(BASELINE_DIR, f"{name}.json")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--quick", action="store_true", help="skip the 500-mint and 100k-bar sizes")
+    parser.add_argument("--filter", default="", help="only run cases whose name contains this")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--save-baseline", metavar="NAME", default=None)
+    parser.add_argument("--compare", metavar="NAME", default=None)
+    parser.add_argument("--threshold", type=float, default=20, help="percent slowdown flagged")
+    args = parser.parse_args()
+
+    if args.compare and not os.path.exists(baseline_path(args.compare)):
+        parser.error(f"No baseline saved at {baseline_path(args.compare)}")
+
+    current = run(args.quick, args.filter, args.repeat)
+
+    if args.save_baseline:
+        os.makedirs(BASELINE_DIR, exist_ok=True)
+        with open(baseline_path(args.save_baseline), "w") as file:
+            json.dump(current, file, indent=2)
+        print(f"\nSaved baseline {baseline_path(args.save_baseline)}")
+
+    if args.compare:
+        with open(baseline_path(args.compare)) as file:
+            baseline = json.load(file)
+        lines, regressions = compare(baseline, current, args.threshold)
+        print()
+        print("\n".join(lines))
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
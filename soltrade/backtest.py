@@ -0,0 +1,229 @@
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from soltrade.indicators import BatchIndicatorEngine
+from soltrade.strategy import (
+    strategy_registry,
+    stoploss_level,
+    takeprofit_level,
+    trailing_stoploss_levels,
+)
+
+# Bars examined per step when looking for the exit of an open trade; doubles
+# while no exit is found so long trades stay O(bars held)
+_EXIT_SCAN_BARS = 256
+
+TRADE_COLUMNS = [
+    "entry_time",
+    "exit_time",
+    "entry_price",
+    "exit_price",
+    "bars_held",
+    "reason",
+    "return_pct",
+    "pnl",
+]
+
+
+@dataclass
+class BacktestResult:
+    trades: pd.DataFrame
+    equity: pd.Series
+    initial_balance: float
+    buy_and_hold_pct: float
+
+    @property
+    def final_balance(self) -> float:
+        return float(self.equity.iat[-1]) if len(self.equity) else self.initial_balance
+
+    @property
+    def total_return_pct(self) -> float:
+        return (self.final_balance / self.initial_balance - 1) * 100
+
+    @property
+    def max_drawdown_pct(self) -> float:
+        if self.equity.empty:
+            return 0.0
+        equity = self.equity.to_numpy()
+        return float(np.max(1 - equity / np.maximum.accumulate(equity)) * 100)
+
+    @property
+    def win_rate_pct(self) -> float:
+        if self.trades.empty:
+            return 0.0
+        return float((self.trades["pnl"] > 0).mean() * 100)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "trades": len(self.trades),
+            "win_rate_pct": self.win_rate_pct,
+            "initial_balance": self.initial_balance,
+            "final_balance": self.final_balance,
+            "total_return_pct": self.total_return_pct,
+            "max_drawdown_pct": self.max_drawdown_pct,
+            "buy_and_hold_pct": self.buy_and_hold_pct,
+        }
+
+
+def _signal(df: pd.DataFrame, column: str) -> np.ndarray:
+    if column not in df.columns:
+        return np.zeros(len(df), dtype=bool)
+    return df[column].to_numpy() == 1
+
+
+def generate_signals(
+    df: pd.DataFrame,
+    strategy_name: Optional[str] = None,
+    params: Optional[Dict[str, float]] = None,
+    indicator_cache: Optional[Dict[Any, Dict[str, np.ndarray]]] = None,
+) -> Tuple[pd.DataFrame, Any]:
+    """Run a strategy class over the whole history in one batch pass.
+
+    ``params`` override strategy attributes such as ``stoploss`` before the
+    strategy is applied. Returns the strategy's output frame and the
+    strategy instance, whose stoploss/takeprofit/trailing settings drive the
+    simulated exits.
+    """
+    StrategyClass = strategy_registry(strategy_name).strategy_class
+    instance = StrategyClass(df.copy())
+    for key, value in (params or {}).items():
+        if not hasattr(instance, key):
+            raise ValueError(f"{StrategyClass.__name__} has no parameter {key!r}")
+        setattr(instance, key, value)
+    instance.indicator_engine = BatchIndicatorEngine(instance.indicators(), cache=indicator_cache)
+    return instance.apply_strategy(), instance
+
+
+def _find_exit(
+    entry: int,
+    close: np.ndarray,
+    high: np.ndarray,
+    exit_signal: np.ndarray,
+    stoploss: float,
+    takeprofit: float,
+    trailing_stoploss: float,
+    trailing_stoploss_target: float,
+) -> Tuple[int, str]:
+    """First bar after ``entry`` that closes the trade, and why.
+
+    Exits are evaluated on bar closes like the live loop. When several fire on
+    the same bar the protective stops take precedence over the target and the
+    strategy's own exit signal.
+    """
+    n = len(close)
+    entry_price = close[entry]
+    stop = stoploss_level(entry_price, stoploss)
+    target = takeprofit_level(entry_price, takeprofit)
+    start = entry + 1
+    window = _EXIT_SCAN_BARS
+    while start < n:
+        end = min(n, start + window)
+        # Trailing levels depend on every high since entry, so recompute from there
+        trailing = trailing_stoploss_levels(
+            high[entry + 1 : end], entry_price, trailing_stoploss, trailing_stoploss_target
+        )[start - entry - 1 :]
+        segment = close[start:end]
+        hits = [
+            ("stoploss", segment <= stop),
+            # NaN levels (trailing not yet activated) compare False
+            ("trailing_stoploss", segment <= trailing),
+            ("takeprofit", segment >= target),
+            ("signal", exit_signal[start:end]),
+        ]
+        any_hit = np.logical_or.reduce([hit for _, hit in hits])
+        if any_hit.any():
+            offset = int(np.argmax(any_hit))
+            reason = next(name for name, hit in hits if hit[offset])
+            return start + offset, reason
+        start = end
+        window *= 2
+    return n - 1, "end"
+
+
+def run_backtest(
+    df: pd.DataFrame,
+    strategy_name: Optional[str] = None,
+    initial_balance: float = 1000.0,
+    fee_pct: float = 0.1,
+    slippage_pct: float = 0.05,
+    params: Optional[Dict[str, float]] = None,
+    indicator_cache: Optional[Dict[Any, Dict[str, np.ndarray]]] = None,
+    warmup_bars: int = 0,
+) -> BacktestResult:
+    """Backtest a strategy class on candles with ``time``/``open``/``high``/``low``/``close``.
+
+    Signals come from the same strategy class the bot trades with, and exits
+    use the same stoploss, takeprofit and trailing stoploss levels. Like the
+    live bot, every entry commits the whole balance at the signal bar's close.
+    Fills pay ``slippage_pct`` against the close and ``fee_pct`` of the
+    notional on both sides. ``params`` and ``indicator_cache`` are passed
+    to ``generate_signals``. The first ``warmup_bars`` only prime the
+    indicators: no trade opens there and they are left out of the results.
+    """
+    df = df.sort_values("time").reset_index(drop=True)
+    signals, instance = generate_signals(df, strategy_name, params, indicator_cache)
+    close = df["close"].to_numpy(dtype=float)
+    high = df["high"].to_numpy(dtype=float)
+    times = pd.to_datetime(df["time"], cache=False)
+    time_values = times.to_numpy()
+    entry_signal = _signal(signals, "entry")
+    exit_signal = _signal(signals, "exit")
+    entries = np.flatnonzero(entry_signal)
+    warmup = min(max(int(warmup_bars), 0), len(df))
+
+    fee = fee_pct / 100
+    slippage = slippage_pct / 100
+    n = len(close)
+    equity = np.full(n, float(initial_balance))
+    balance = float(initial_balance)
+    trades: List[Dict[str, Any]] = []
+    cursor = warmup
+    while True:
+        k = int(np.searchsorted(entries, cursor))
+        if k >= len(entries) or entries[k] >= n - 1:
+            break
+        entry = int(entries[k])
+        exit_bar, reason = _find_exit(
+            entry,
+            close,
+            high,
+            exit_signal,
+            float(instance.stoploss),
+            float(instance.takeprofit),
+            float(instance.trailing_stoploss),
+            float(instance.trailing_stoploss_target),
+        )
+        entry_fill = close[entry] * (1 + slippage)
+        exit_fill = close[exit_bar] * (1 - slippage)
+        units = balance * (1 - fee) / entry_fill
+        proceeds = units * exit_fill * (1 - fee)
+
+        equity[cursor:entry] = balance
+        equity[entry:exit_bar] = units * close[entry:exit_bar]
+        trades.append(
+            {
+                "entry_time": time_values[entry],
+                "exit_time": time_values[exit_bar],
+                "entry_price": entry_fill,
+                "exit_price": exit_fill,
+                "bars_held": exit_bar - entry,
+                "reason": reason,
+                "return_pct": (proceeds / balance - 1) * 100,
+                "pnl": proceeds - balance,
+            }
+        )
+        balance = proceeds
+        cursor = exit_bar + 1
+        equity[exit_bar] = balance
+    equity[cursor:] = balance
+
+    buy_and_hold_pct = (close[-1] / close[warmup] - 1) * 100 if warmup < n else 0.0
+    return BacktestResult(
+        trades=pd.DataFrame(trades, columns=TRADE_COLUMNS),
+        equity=pd.Series(equity[warmup:], index=times.iloc[warmup:], name="equity"),
+        initial_balance=float(initial_balance),
+        buy_and_hold_pct=float(buy_and_hold_pct),
+    )
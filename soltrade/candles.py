@@ -0,0 +1,241 @@
+import os
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+from soltrade.log import log_general
+
+# CryptoCompare returns at most 2000 bars per histominute request
+MAX_REQUEST_BARS = 2000
+
+CANDLE_DTYPE = np.dtype(
+    [
+        ("time", "<i8"),
+        ("open", "<f8"),
+        ("high", "<f8"),
+        ("low", "<f8"),
+        ("close", "<f8"),
+        ("volume", "<f8"),
+    ]
+)
+
+
+class CandleStore:
+    """Append-only, memory-mapped candle file for a single trading pair.
+
+    Records are fixed-size rows sorted by ``time``. New bars are appended,
+    the still-forming last bar is overwritten in place and the file is only
+    rewritten when a backfill lands in the middle of the stored history.
+    """
+
+    def __init__(self, path: str, interval_minutes: int, history_bars: int) -> None:
+        self.path = path
+        self.step = int(interval_minutes) * 60
+        self.history_bars = int(history_bars)
+        self._attempted_gaps: Set[Tuple[int, int]] = set()
+        # Gaps asked for by a backfill window, keyed by the window's ``toTs``
+        self._requested_gaps: Dict[int, Tuple[int, int]] = {}
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+    def _load(self) -> np.ndarray:
+        """Map the candle file read-only; returns an empty array if missing."""
+        if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+            return np.empty(0, dtype=CANDLE_DTYPE)
+        return np.memmap(self.path, dtype=CANDLE_DTYPE, mode="r")
+
+    def last_time(self) -> Optional[int]:
+        candles = self._load()
+        if len(candles) == 0:
+            return None
+        return int(candles["time"][-1])
+
+    def pending_windows(self, now: int) -> List[Tuple[Optional[int], int]]:
+        """Return the ``(toTs, limit)`` requests needed to bring the store up to date.
+
+        A ``toTs`` of ``None`` means "up to the latest bar". The newest window
+        always covers the last stored bar so the forming candle gets refreshed.
+        """
+        candles = self._load()
+        if len(candles) == 0:
+            return [(None, min(self.history_bars, MAX_REQUEST_BARS))]
+
+        last = int(candles["time"][-1])
+        missing = max(0, (now - last) // self.step)
+        if missing >= self.history_bars:
+            # Too far behind to be worth stitching; start a fresh window
+            return [(None, min(self.history_bars, MAX_REQUEST_BARS))]
+
+        windows: List[Tuple[Optional[int], int]] = [(None, max(1, missing + 1))]
+        windows.extend(self._gap_windows(candles))
+        return windows
+
+    def _gap_windows(self, candles: np.ndarray) -> List[Tuple[Optional[int], int]]:
+        """Detect holes in the retained history and return backfill requests."""
+        times = np.asarray(candles["time"][-self.history_bars :])
+        if len(times) < 2:
+            return []
+
+        diffs = np.diff(times)
+        windows: List[Tuple[Optional[int], int]] = []
+        for idx in np.flatnonzero(diffs > self.step):
+            gap = (int(times[idx]), int(times[idx + 1]))
+            # Upstream may simply have no bars for this range; only ask once
+            if gap in self._attempted_gaps:
+                continue
+            to_ts = gap[1] - self.step
+            self._requested_gaps[to_ts] = gap
+            bars = int(diffs[idx] // self.step) - 1
+            windows.append((to_ts, min(max(bars, 1), MAX_REQUEST_BARS)))
+        return windows
+
+    def fetched(self, to_ts: Optional[int]) -> None:
+        """Record that the window ending at ``to_ts`` was fetched, with or without bars.
+
+        A gap is only given up on once a request for it succeeded; one that
+        failed is asked for again on the next update.
+        """
+        gap = self._requested_gaps.pop(to_ts, None) if to_ts is not None else None
+        if gap is not None:
+            self._attempted_gaps.add(gap)
+
+    @staticmethod
+    def _to_records(rows: List[Dict[str, Any]]) -> np.ndarray:
+        records = np.array(
+            [
+                (
+                    int(row["time"]),
+                    float(row.get("open", 0) or 0),
+                    float(row.get("high", 0) or 0),
+                    float(row.get("low", 0) or 0),
+                    float(row.get("close", 0) or 0),
+                    float(row.get("volumefrom", row.get("volume", 0)) or 0),
+                )
+                for row in rows
+            ],
+            dtype=CANDLE_DTYPE,
+        )
+        return _dedupe(records)
+
+    def ingest(self, rows: List[Dict[str, Any]]) -> int:
+        """Merge CryptoCompare candle rows into the store; returns rows written."""
+        if not rows:
+            return 0
+
+        incoming = self._to_records(rows)
+        stored = self._load()
+        if len(stored) == 0:
+            self._rewrite(incoming)
+            return len(incoming)
+
+        last = int(stored["time"][-1])
+        stored_count = len(stored)
+        older = incoming[incoming["time"] < last]
+        if len(older) and not np.isin(older["time"], stored["time"]).all():
+            # Backfilled bars belong in the middle of the file
+            merged = _dedupe(np.concatenate([stored, incoming]))
+            del stored  # release the mapping before replacing the file
+            self._rewrite(merged[-self._retained_bars() :])
+            return len(incoming)
+        del stored
+
+        written = 0
+        current = incoming[incoming["time"] == last]
+        if len(current):
+            self._overwrite_last(current[-1:])
+            written += 1
+
+        newer = incoming[incoming["time"] > last]
+        if len(newer):
+            with open(self.path, "ab") as file:
+                file.write(newer.tobytes())
+            written += len(newer)
+
+        if stored_count + len(newer) > self._retained_bars() * 2:
+            self._rewrite(np.array(self._load()[-self._retained_bars() :]))
+        return written
+
+    def _retained_bars(self) -> int:
+        # Keep a margin beyond the strategy window so backfills have room
+        return max(self.history_bars * 2, MAX_REQUEST_BARS)
+
+    def _overwrite_last(self, record: np.ndarray) -> None:
+        with open(self.path, "r+b") as file:
+            file.seek(-CANDLE_DTYPE.itemsize, os.SEEK_END)
+            file.write(record.tobytes())
+
+    def _rewrite(self, records: np.ndarray) -> None:
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "wb") as file:
+            file.write(np.ascontiguousarray(records).tobytes())
+        os.replace(tmp_path, self.path)
+
+    def records(self, bars: Optional[int] = None, closed_by: Optional[int] = None) -> np.ndarray:
+        """Copy of the newest ``bars`` candle records.
+
+        With ``closed_by`` only bars that had closed by that time are
+        included, leaving out the one still forming.
+        """
+        candles = self._load()
+        if closed_by is not None:
+            candles = candles[: np.searchsorted(candles["time"], closed_by - self.step, side="right")]
+        return np.array(candles[-(bars or self.history_bars) :])
+
+    def frame(self, bars: Optional[int] = None, closed_by: Optional[int] = None) -> pd.DataFrame:
+        """Return the newest ``bars`` candles in the column layout strategies expect."""
+        return records_frame(self.records(bars, closed_by))
+
+
+def records_frame(records: np.ndarray) -> pd.DataFrame:
+    """Copy ``CANDLE_DTYPE`` records into the column layout strategies expect."""
+    df = pd.DataFrame(
+        {
+            "close": np.array(records["close"]),
+            "high": np.array(records["high"]),
+            "low": np.array(records["low"]),
+            "open": np.array(records["open"]),
+            "time": pd.to_datetime(np.array(records["time"]), unit="s"),
+        }
+    )
+    return df
+
+
+def frame_records(df: pd.DataFrame) -> np.ndarray:
+    """Inverse of ``records_frame``; ``volume`` is zero when the frame has none."""
+    records = np.zeros(len(df), dtype=CANDLE_DTYPE)
+    times = pd.to_datetime(df["time"], utc=True).dt.tz_convert(None)
+    records["time"] = times.to_numpy(dtype="datetime64[s]").astype(np.int64)
+    for field in ("open", "high", "low", "close", "volume"):
+        if field in df.columns:
+            records[field] = df[field].to_numpy(dtype=float)
+    return records
+
+
+def _dedupe(records: np.ndarray) -> np.ndarray:
+    """Sort records by time, keeping the last occurrence of each timestamp."""
+    if len(records) == 0:
+        return records
+    order = np.argsort(records["time"], kind="stable")
+    records = records[order]
+    keep = np.append(records["time"][1:] != records["time"][:-1], True)
+    return records[keep]
+
+
+_store_instances: Dict[str, CandleStore] = {}
+
+
+def candle_store(
+    symbol: str, quote_symbol: str, interval_minutes: int, history_bars: int
+) -> CandleStore:
+    """Return the shared store for a ``symbol``/``quote_symbol`` pair and interval.
+
+    The store keeps the longest ``history_bars`` any caller asked for.
+    """
+    key = f"{symbol}_{quote_symbol}_{interval_minutes}m"
+    if key not in _store_instances:
+        path = os.path.join("data", "candles", f"{key}.bin")
+        _store_instances[key] = CandleStore(path, interval_minutes, history_bars)
+        log_general.debug(f"Opened candle store {path}")
+    store = _store_instances[key]
+    store.history_bars = max(store.history_bars, int(history_bars))
+    return store
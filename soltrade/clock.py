@@ -0,0 +1,74 @@
+import asyncio
+import math
+import threading
+import time
+
+
+class Clock:
+    """Wall clock used by the trading loop for timestamps, TTLs and waits."""
+
+    def time(self) -> float:
+        return time.time()
+
+    def monotonic(self) -> float:
+        return time.monotonic()
+
+    def sleep(self, seconds: float) -> None:
+        time.sleep(seconds)
+
+    async def sleep_async(self, seconds: float) -> None:
+        """``sleep`` for coroutines on the shared event loop."""
+        await asyncio.sleep(seconds)
+
+
+class VirtualClock(Clock):
+    """Simulated clock for replays that runs ``speed`` times faster than real time.
+
+    ``sleep`` advances simulated time immediately and only waits the scaled
+    real duration, so a 1s countdown tick at 1000x costs 1ms. An infinite
+    ``speed`` never waits at all.
+    """
+
+    def __init__(self, start: float, speed: float = 1000.0) -> None:
+        self.speed = speed
+        self._now = float(start)
+        self._lock = threading.Lock()
+
+    def time(self) -> float:
+        with self._lock:
+            return self._now
+
+    def monotonic(self) -> float:
+        return self.time()
+
+    def advance(self, seconds: float) -> None:
+        with self._lock:
+            self._now += seconds
+
+    def sleep(self, seconds: float) -> None:
+        self.advance(seconds)
+        if self.speed > 0 and not math.isinf(self.speed):
+            time.sleep(seconds / self.speed)
+
+    async def sleep_async(self, seconds: float) -> None:
+        """Wait for the trading loop's sleeps to move simulated time ``seconds`` on.
+
+        Background coroutines never advance the clock themselves, so they
+        cannot race ahead of the loop they run alongside.
+        """
+        deadline = self.time() + seconds
+        while self.time() < deadline:
+            await asyncio.sleep(0.001)
+
+
+_clock_instance: Clock = Clock()
+
+
+def clock() -> Clock:
+    """The process-wide clock; the wall clock unless a replay installed another."""
+    return _clock_instance
+
+
+def set_clock(new_clock: Clock) -> None:
+    global _clock_instance
+    _clock_instance = new_clock
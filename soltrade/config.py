@@ -3,6 +3,7 @@ import os
 from typing import Any, Dict, List
 
 from solana.rpc.api import Client
+from solana.rpc.async_api import AsyncClient
 from solders.keypair import Keypair
 from solders.pubkey import Pubkey
 
@@ -16,6 +17,8 @@ class Config:
         self.private_key: str = ""
         self.rpc_https: str = "https://api.mainnet-beta.solana.com"
         self.jup_api: str = "https://api.jup.ag/ultra/v1"
+        self.candle_api: str = "https://min-api.cryptocompare.com/data/v2/histominute"
+        self.price_api: str = "https://lite-api.jup.ag/price/v3"
         self.primary_mint: str = ""
         self.primary_mint_symbol: str = ""
         self.sol_mint: str = "So11111111111111111111111111111111111111112"
@@ -23,11 +26,49 @@ class Config:
         self.secondary_mint_symbols: List[str] = []
         self.price_update_seconds: int = 60
         self.trading_interval_minutes: int = 1
+        self.mint_interval_minutes: Dict[str, int] = {}
+        self.bar_settle_seconds: float = 2
         self.max_slippage: int = 50
         self.strategy: str = "default"
+        self.candle_history_bars: int = 0
+        self.candle_fetch_concurrency: int = 8
+        self.candle_fetch_timeout_seconds: float = 10
+        self.jupiter_keepalive_seconds: float = 30
+        self.metrics_export_seconds: float = 300
+        self.metrics_port: int = 0
+        self.prefetch_enabled: bool = False
+        self.prefetch_distance: float = 5
+        self.prefetch_ttl_seconds: float = 20
+        self.prefetch_size_tolerance_pct: float = 1
+        self.balance_ttl_seconds: float = 30
+        self.streaming_mode: bool = False
+        self.rpc_wss: str = ""
+        self.panel_mode: bool = False
+        self.dashboard_page_size: int = 10
+        self.dashboard_page_seconds: float = 10
+        self.allocation_policy: str = "equal"
+        self.allocation_fraction: float = 1
+        self.allocation_min_value: float = 0
+        self.retry_attempts: int = 3
+        self.retry_base_delay_seconds: float = 0.5
+        self.retry_max_delay_seconds: float = 10
+        self.retry_budget_ratio: float = 0.2
+        self.circuit_failure_threshold: int = 5
+        self.circuit_reset_seconds: float = 30
+        self.execution_mode: str = "immediate"
+        self.slice_count: int = 4
+        self.slice_interval_seconds: float = 30
+        self.slice_max_price_impact_pct: float = 0
+        self.slice_min_value: float = 0
+        self.confirmation_poll_seconds: float = 0.5
+        self.confirmation_timeout_seconds: float = 90
         self.path = os.path.join(os.path.dirname(__file__), "..", "config.json")
         self._client: Client | None = None
+        self._async_client: AsyncClient | None = None
         self._decimals_cache: Dict[str, int] = {}
+        # Decoded from ``private_key`` on first use and again only if it changes
+        self._keypair: Keypair | None = None
+        self._keypair_source: str | None = None
         self.load_config()
 
     def load_config(self):
@@ -37,21 +78,62 @@ class Config:
             "private_key": "",
             "rpc_https": "https://api.mainnet-beta.solana.com",
             "jup_api": "https://api.jup.ag/ultra/v1",
+            "candle_api": "https://min-api.cryptocompare.com/data/v2/histominute",
+            "price_api": "https://lite-api.jup.ag/price/v3",
             "primary_mint": "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v",
             "primary_mint_symbol": "USDC",
             "secondary_mints": ["So11111111111111111111111111111111111111112"],
             "secondary_mint_symbols": ["SOL"],
             "price_update_seconds": 60,
             "trading_interval_minutes": 1,
+            "mint_interval_minutes": {},
+            "bar_settle_seconds": 2,
             "max_slippage": 50,
             "strategy": "default",
+            "candle_history_bars": 0,
+            "candle_fetch_concurrency": 8,
+            "candle_fetch_timeout_seconds": 10,
+            "jupiter_keepalive_seconds": 30,
+            "metrics_export_seconds": 300,
+            "metrics_port": 0,
+            "prefetch_enabled": False,
+            "prefetch_distance": 5,
+            "prefetch_ttl_seconds": 20,
+            "prefetch_size_tolerance_pct": 1,
+            "balance_ttl_seconds": 30,
+            "streaming_mode": False,
+            "rpc_wss": "",
+            "panel_mode": False,
+            "dashboard_page_size": 10,
+            "dashboard_page_seconds": 10,
+            "allocation_policy": "equal",
+            "allocation_fraction": 1,
+            "allocation_min_value": 0,
+            "retry_attempts": 3,
+            "retry_base_delay_seconds": 0.5,
+            "retry_max_delay_seconds": 10,
+            "retry_budget_ratio": 0.2,
+            "circuit_failure_threshold": 5,
+            "circuit_reset_seconds": 30,
+            "execution_mode": "immediate",
+            "slice_count": 4,
+            "slice_interval_seconds": 30,
+            "slice_max_price_impact_pct": 0,
+            "slice_min_value": 0,
+            "confirmation_poll_seconds": 0.5,
+            "confirmation_timeout_seconds": 90,
         }
 
-        with open(self.path, "r") as file:
-            try:
-                config_data: Dict[str, Any] = json.load(file)
-            except json.JSONDecodeError as e:
-                raise ValueError(f"Error loading config: {e}") from e
+        config_data: Dict[str, Any] = {}
+        if os.path.exists(self.path):
+            with open(self.path, "r") as file:
+                try:
+                    config_data = json.load(file)
+                except json.JSONDecodeError as e:
+                    raise ValueError(f"Error loading config: {e}") from e
+        else:
+            # Backtests need no keys; the checks below warn if the bot lacks them
+            log_general.warning(f"{self.path} not found; using the default settings.")
 
         for key, fallback in default_config.items():
             value = config_data.get(key, fallback)
@@ -78,6 +160,10 @@ class Config:
         if not self.jup_api:
             log_general.error("Jupiter API endpoint is not set in config.json.")
 
+    def interval_minutes(self, symbol: str) -> int:
+        """Bar length used for ``symbol``: its ``mint_interval_minutes`` entry or the default."""
+        return int(self.mint_interval_minutes.get(symbol) or self.trading_interval_minutes)
+
     def decimals(self, mint_address: str) -> int:
         """Get token decimals with caching to avoid repeated RPC calls."""
         if mint_address in self._decimals_cache:
@@ -96,12 +182,13 @@ class Config:
 
     @property
     def keypair(self) -> Keypair:
+        if self._keypair is not None and self._keypair_source == self.private_key:
+            return self._keypair
         try:
             b58_string = self.private_key
-            keypair = Keypair.from_base58_string(b58_string)
-            # print(f"Using Wallet: {keypair.pubkey()}")
-
-            return keypair
+            self._keypair = Keypair.from_base58_string(b58_string)
+            self._keypair_source = b58_string
+            return self._keypair
         except Exception as e:
             log_general.error(f"Error decoding private key: {e}")
             exit(1)
@@ -117,6 +204,18 @@ class Config:
             self._client = Client(self.rpc_https)
         return self._client
 
+    @property
+    def async_client(self) -> AsyncClient:
+        """Cached async RPC client; only use it from the shared event loop."""
+        if self._async_client is None:
+            self._async_client = AsyncClient(self.rpc_https)
+        return self._async_client
+
+    async def close_async_client(self) -> None:
+        if self._async_client is not None:
+            await self._async_client.close()
+            self._async_client = None
+
 
 _config_instance = None
 
@@ -0,0 +1,177 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+from solders.signature import Signature
+from solders.transaction_status import TransactionConfirmationStatus, TransactionStatus
+
+from soltrade.config import config
+from soltrade.log import log_transaction
+from soltrade.metrics import metrics
+from soltrade.resilience import endpoint
+
+# getSignatureStatuses accepts at most this many signatures per call
+MAX_SIGNATURES_PER_CALL = 256
+
+_CONFIRMED = (TransactionConfirmationStatus.Confirmed, TransactionConfirmationStatus.Finalized)
+
+
+@dataclass
+class _Pending:
+    signature: Signature
+    label: str
+    submitted_at: float
+    # True once confirmed, False if it failed on chain, None if unknown
+    confirmed: "asyncio.Future[Optional[bool]]"
+    confirmed_at: Optional[float] = None
+
+
+class ConfirmationTracker:
+    """Confirms executed swaps on chain, polling every pending signature at once.
+
+    One ``getSignatureStatuses`` call per ``poll_seconds`` covers every
+    signature in flight (up to ``MAX_SIGNATURES_PER_CALL`` per call), so the
+    RPC cost does not grow with the number of concurrent swaps. Signatures
+    stay tracked after confirmation until they are finalized, recording
+    ``submit_to_confirmed`` and ``submit_to_finalized`` latencies. One not
+    confirmed within ``timeout_seconds`` is given up on with an unknown
+    outcome, whether the chain did not report it yet or the status calls
+    kept failing; it may still land, so callers must not resend it.
+
+    Must only be used from coroutines running on ``runtime()``.
+    """
+
+    def __init__(self, poll_seconds: float = 0.5, timeout_seconds: float = 90.0) -> None:
+        self.poll_seconds = float(poll_seconds)
+        self.timeout_seconds = float(timeout_seconds)
+        self._pending: Dict[str, _Pending] = {}
+        self._poller: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def _track(self, signature: str, label: str, submitted_at: Optional[float]) -> _Pending:
+        pending = self._pending.get(signature)
+        if pending is None:
+            pending = _Pending(
+                Signature.from_string(signature),
+                label,
+                time.perf_counter() if submitted_at is None else submitted_at,
+                asyncio.get_running_loop().create_future(),
+            )
+            self._pending[signature] = pending
+        if self._poller is None or self._poller.done():
+            self._poller = asyncio.create_task(self._poll())
+        return pending
+
+    async def confirm(
+        self, signature: str, label: str = "", submitted_at: Optional[float] = None
+    ) -> Optional[bool]:
+        """Wait until ``signature`` is confirmed.
+
+        ``True`` once confirmed, ``False`` if the transaction failed on chain
+        and ``None`` if neither was seen within ``timeout_seconds``.
+        ``submitted_at`` is the ``time.perf_counter()`` it was sent at.
+        """
+        pending = self._track(signature, label, submitted_at)
+        # Backstop in case the poller itself stops: never wait past the timeout
+        deadline = pending.submitted_at + self.timeout_seconds + 2 * self.poll_seconds
+        try:
+            return await asyncio.wait_for(
+                asyncio.shield(pending.confirmed), max(0.0, deadline - time.perf_counter())
+            )
+        except asyncio.TimeoutError:
+            self._resolve(pending, None)
+            return pending.confirmed.result()
+
+    async def _poll(self) -> None:
+        while self._pending:
+            await asyncio.sleep(self.poll_seconds)
+            try:
+                await self.poll()
+            except Exception as e:
+                log_transaction.error(f"Polling signature statuses failed: {e}")
+                self._expire()
+
+    async def poll(self) -> None:
+        """Fetch the status of every pending signature and settle those that changed.
+
+        Signatures past ``timeout_seconds`` are given up on even when the
+        status call fails.
+        """
+        pending = list(self._pending.values())
+        for start in range(0, len(pending), MAX_SIGNATURES_PER_CALL):
+            batch = pending[start : start + MAX_SIGNATURES_PER_CALL]
+            signatures = [p.signature for p in batch]
+            client = config().async_client
+            try:
+                with metrics().span("signature_statuses"):
+                    response = await endpoint("rpc").call(
+                        lambda: client.get_signature_statuses(signatures)
+                    )
+            except Exception as e:
+                log_transaction.warning(f"Failed to fetch signature statuses, retrying next poll: {e}")
+                continue
+            self._settle(batch, response.value)
+        self._expire()
+
+    def _settle(
+        self, batch: List[_Pending], statuses: Sequence[Optional[TransactionStatus]]
+    ) -> None:
+        now = time.perf_counter()
+        for pending, status in zip(batch, statuses):
+            elapsed = now - pending.submitted_at
+            if status is None:
+                continue
+            if status.err is not None:
+                log_transaction.error(f"Transaction {pending.signature} failed on chain: {status.err}")
+                self._resolve(pending, False)
+                continue
+            if pending.confirmed_at is None and status.confirmation_status in _CONFIRMED:
+                pending.confirmed_at = now
+                metrics().observe("submit_to_confirmed", elapsed, pending.label)
+                log_transaction.info(f"Transaction {pending.signature} confirmed.")
+                self._set(pending, True)
+            if status.confirmation_status == TransactionConfirmationStatus.Finalized:
+                metrics().observe("submit_to_finalized", elapsed, pending.label)
+                self._resolve(pending, True)
+
+    def _expire(self) -> None:
+        """Stop watching signatures older than ``timeout_seconds``.
+
+        Confirmed ones are not rolled back in practice and stay confirmed;
+        the rest resolve as unknown.
+        """
+        now = time.perf_counter()
+        for pending in list(self._pending.values()):
+            if now - pending.submitted_at < self.timeout_seconds:
+                continue
+            if pending.confirmed_at is None:
+                log_transaction.error(
+                    f"Transaction {pending.signature} was not confirmed within "
+                    f"{self.timeout_seconds:g}s; its outcome is unknown."
+                )
+            self._resolve(pending, True if pending.confirmed_at is not None else None)
+
+    @staticmethod
+    def _set(pending: _Pending, landed: Optional[bool]) -> None:
+        if not pending.confirmed.done():
+            pending.confirmed.set_result(landed)
+
+    def _resolve(self, pending: _Pending, landed: Optional[bool]) -> None:
+        self._pending.pop(str(pending.signature), None)
+        self._set(pending, landed)
+
+
+_tracker_instance: Optional[ConfirmationTracker] = None
+
+
+def confirmation_tracker() -> ConfirmationTracker:
+    global _tracker_instance
+    if _tracker_instance is None:
+        _tracker_instance = ConfirmationTracker(
+            float(config().confirmation_poll_seconds),
+            float(config().confirmation_timeout_seconds),
+        )
+    return _tracker_instance
@@ -0,0 +1,285 @@
+import math
+import threading
+import time
+from dataclasses import dataclass, replace
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from rich import box
+from rich.console import Console, Group, RenderableType
+from rich.live import Live
+from rich.panel import Panel
+from rich.table import Table
+from rich.text import Text
+
+from soltrade.clock import clock
+
+# Strategy columns shown in the market table, with their row headers
+MARKET_ROWS = {
+    "close": "Price",
+    "ema_s": "EMA Short",
+    "ema_m": "EMA Medium",
+    "upper_bband": "Upper Bollinger Band",
+    "lower_bband": "Lower Bollinger Band",
+    "rsi": "RSI",
+    "entry": "Entry Signal",
+    "exit": "Exit Signal",
+    "entry_price": "Entry Price",
+    "stoploss": "Stoploss",
+    "takeprofit": "Take Profit",
+    "trailing_stoploss": "Trailing Stoploss",
+    "trailing_stoploss_target": "Trailing Stoploss Target",
+    "position": "Position",
+}
+
+MarketRows = Tuple[Tuple[str, Tuple[Any, ...]], ...]
+
+
+def format_as_money(value: float) -> str:
+    return "${:,.2f}".format(value)
+
+
+def format_cell(metric: str, value: Any) -> str:
+    if metric == "Entry Signal":
+        return "[bold green]✓ BUY[/bold green]" if value == 1 else "[dim]-[/dim]"
+    if metric == "Exit Signal":
+        return "[bold red]✗ SELL[/bold red]" if value == 1 else "[dim]-[/dim]"
+    if metric == "Price":
+        return format_as_money(value)
+    return str(value)
+
+
+def market_rows(rows: Sequence[Dict[str, Any]]) -> Tuple[Tuple[str, ...], MarketRows]:
+    """Mint names and ``(metric, value per mint)`` rows from each mint's latest strategy row."""
+    mints = tuple(row["mint"] for row in rows)
+    market = tuple(
+        (header, tuple(row.get(col, math.nan) for row in rows))
+        for col, header in MARKET_ROWS.items()
+        if any(col in row for row in rows)
+    )
+    return mints, market
+
+
+@dataclass(frozen=True)
+class DashboardSnapshot:
+    """Everything the dashboard shows, handed from the trading loop to the render thread.
+
+    ``next_update`` is the clock time of the next analysis pass; while it
+    lies ahead the status line counts down to it instead of showing ``status``.
+    """
+
+    wallet: Tuple[Tuple[str, str], ...]
+    mints: Tuple[str, ...]
+    market: MarketRows
+    timestamp: str
+    status: str
+    next_update: Optional[float] = None
+
+
+def _same(a: Any, b: Any) -> bool:
+    return a is b or a == b or (a != a and b != b)
+
+
+class DashboardRenderer:
+    """Draw ``DashboardSnapshot``s on a background thread.
+
+    The trading loop only swaps in a new snapshot and never waits on the
+    terminal. The thread redraws when the snapshot changes, once a second
+    while a countdown runs, and when the page of mint columns turns; the
+    rest of the time it blocks on an event. Cells are only reformatted when
+    their value changed, and the table is reused when no visible cell did.
+    """
+
+    def __init__(self, console: Console, page_size: int = 10, page_seconds: float = 10.0):
+        self._live = Live(console=console, auto_refresh=False, transient=False)
+        self.page_size = max(0, int(page_size))
+        self.page_seconds = max(1.0, float(page_seconds))
+        self._snapshot: Optional[DashboardSnapshot] = None
+        self._message: RenderableType = Text("")
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+        self._page = 0
+        self._page_turned = time.monotonic()
+        self._cells: Dict[Tuple[str, str], Tuple[Any, str]] = {}
+        self._table: Optional[Table] = None
+        self._table_key: Any = None
+        self._wallet_panel: Optional[Panel] = None
+        self._wallet_key: Any = None
+        self._drawn: Any = None
+
+    @property
+    def snapshot(self) -> Optional[DashboardSnapshot]:
+        return self._snapshot
+
+    def publish(self, snapshot: DashboardSnapshot) -> None:
+        with self._lock:
+            self._snapshot = snapshot
+        self._wake.set()
+
+    def set_status(self, status: str, next_update: Optional[float] = None) -> None:
+        """Change the status line of the current snapshot."""
+        with self._lock:
+            if self._snapshot is not None:
+                self._snapshot = replace(self._snapshot, status=status, next_update=next_update)
+        self._wake.set()
+
+    def show_message(self, renderable: RenderableType) -> None:
+        """Shown until the first snapshot is published."""
+        self._message = renderable
+        self._wake.set()
+
+    def start(self) -> None:
+        self._live.start()
+        self._thread = threading.Thread(target=self._run, name="soltrade-dashboard", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Draw the latest snapshot one last time and release the terminal."""
+        self._stopping = True
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._live.stop()
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(self._next_wake())
+            self._wake.clear()
+            self._draw()
+            if self._stopping:
+                return
+
+    def _pages(self, snapshot: DashboardSnapshot) -> int:
+        if not self.page_size:
+            return 1
+        return max(1, math.ceil(len(snapshot.mints) / self.page_size))
+
+    def _next_wake(self) -> Optional[float]:
+        """Seconds until something on screen changes by itself; ``None`` to sleep until woken."""
+        snapshot = self._snapshot
+        if snapshot is None:
+            return None
+        waits = []
+        if snapshot.next_update is not None:
+            remaining = snapshot.next_update - clock().time()
+            if remaining > 0:
+                waits.append(remaining % 1 or 1.0)
+        if self._pages(snapshot) > 1:
+            waits.append(max(0.0, self._page_turned + self.page_seconds - time.monotonic()))
+        return min(waits) if waits else None
+
+    def _status(self, snapshot: DashboardSnapshot) -> str:
+        if snapshot.next_update is None:
+            return snapshot.status
+        remaining = math.ceil(snapshot.next_update - clock().time())
+        if remaining <= 0:
+            return "⏳ Refreshing data..."
+        return f"⏱️  Next update in {remaining} seconds | Press Ctrl+C to stop"
+
+    def _turn_page(self, snapshot: DashboardSnapshot) -> int:
+        pages = self._pages(snapshot)
+        now = time.monotonic()
+        if now - self._page_turned >= self.page_seconds:
+            self._page += 1
+            self._page_turned = now
+        self._page %= pages
+        return pages
+
+    def _draw(self) -> None:
+        snapshot = self._snapshot
+        if snapshot is None:
+            if self._drawn is not self._message:
+                self._live.update(self._message, refresh=True)
+                self._drawn = self._message
+            return
+        pages = self._turn_page(snapshot)
+        status = self._status(snapshot)
+        drawn = (id(snapshot), self._page, status)
+        if drawn == self._drawn:
+            return
+        self._live.update(self.renderable(snapshot, status, pages), refresh=True)
+        self._drawn = drawn
+
+    def renderable(
+        self, snapshot: DashboardSnapshot, status: Optional[str] = None, pages: int = 1
+    ) -> RenderableType:
+        return Group(
+            self._wallet(snapshot),
+            Text(""),
+            self._market_table(snapshot, pages),
+            Text(""),
+            Text(status if status is not None else snapshot.status, style="dim"),
+        )
+
+    def _wallet(self, snapshot: DashboardSnapshot) -> Panel:
+        if self._wallet_panel is None or snapshot.wallet != self._wallet_key:
+            wallet_info = Table.grid(padding=(0, 2))
+            wallet_info.add_column(style="bold cyan", justify="right", no_wrap=True)
+            wallet_info.add_column(style="white", no_wrap=True)
+            for label, value in snapshot.wallet:
+                wallet_info.add_row(label, value)
+            self._wallet_panel = Panel(
+                wallet_info,
+                title="💼 Wallet Overview",
+                border_style="cyan",
+                padding=(1, 2),
+                expand=False,
+            )
+            self._wallet_key = snapshot.wallet
+        return self._wallet_panel
+
+    def _cell(self, metric: str, mint: str, value: Any) -> str:
+        cached = self._cells.get((metric, mint))
+        if cached is not None and _same(cached[0], value):
+            return cached[1]
+        text = format_cell(metric, value)
+        self._cells[(metric, mint)] = (value, text)
+        return text
+
+    def _market_table(self, snapshot: DashboardSnapshot, pages: int) -> Table:
+        start = self._page * self.page_size if self.page_size else 0
+        stop = start + self.page_size if self.page_size else len(snapshot.mints)
+        mints = snapshot.mints[start:stop]
+        cells = tuple(
+            (
+                metric,
+                tuple(
+                    self._cell(metric, mint, value)
+                    for mint, value in zip(mints, values[start:stop])
+                ),
+            )
+            for metric, values in snapshot.market
+        )
+        title = f"📊 [bold cyan]Market Analysis[/bold cyan] [dim]({snapshot.timestamp})[/dim]"
+        if pages > 1:
+            title += f" [dim]page {self._page + 1}/{pages}[/dim]"
+        key = (mints, cells)
+        if self._table is None or key != self._table_key:
+            self._table = build_market_table(mints, cells, title)
+            self._table_key = key
+        else:
+            self._table.title = title
+        return self._table
+
+
+def build_market_table(
+    mints: Sequence[str], cells: Sequence[Tuple[str, Sequence[str]]], title: str
+) -> Table:
+    market_table = Table(
+        title=title,
+        box=box.ROUNDED,
+        show_header=True,
+        header_style="bold magenta",
+        border_style="cyan",
+        row_styles=["", "dim"]
+    )
+
+    market_table.add_column("📈 Metric", style="bold yellow", no_wrap=True, width=25)
+    for mint in mints:
+        market_table.add_column(str(mint), style="cyan", justify="right", width=15)
+
+    for metric, texts in cells:
+        market_table.add_row(metric, *texts)
+    return market_table
@@ -0,0 +1,137 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+import pandas as pd
+
+from soltrade.log import log_general
+from soltrade.metrics import metrics
+from soltrade.signer import signer
+from soltrade.transactions import SwapFill, SwapOutcomeUnknown, create_order, perform_swap
+
+ALLOCATION_POLICIES = ("equal", "fraction", "first")
+
+
+def allocate(
+    budget: float,
+    symbols: Sequence[str],
+    policy: str = "equal",
+    fraction: float = 1.0,
+    min_value: float = 0.0,
+) -> Dict[str, float]:
+    """Split ``budget`` of the primary mint across the buy signals for ``symbols``.
+
+    ``equal`` gives every signal the same share, ``fraction`` gives each one
+    ``fraction`` of the budget in signal order until it runs out, and
+    ``first`` hands the whole budget to the first signal. Shares below
+    ``min_value`` are dropped to 0, as their fees would outweigh them.
+    """
+    if policy not in ALLOCATION_POLICIES:
+        raise ValueError(
+            f"Unknown allocation_policy {policy!r}; expected one of {', '.join(ALLOCATION_POLICIES)}"
+        )
+    amounts = {symbol: 0.0 for symbol in symbols}
+    if budget <= 0 or not symbols:
+        return amounts
+    if policy == "equal":
+        share = budget / len(symbols)
+        amounts = {symbol: share for symbol in symbols}
+    elif policy == "first":
+        amounts[symbols[0]] = budget
+    else:
+        remaining = budget
+        for symbol in symbols:
+            amounts[symbol] = min(remaining, budget * float(fraction))
+            remaining -= amounts[symbol]
+    return {
+        symbol: amount if amount >= min_value else 0.0 for symbol, amount in amounts.items()
+    }
+
+
+@dataclass
+class Order:
+    """One swap of a pass: ``amount`` of ``input_mint`` into ``output_mint``."""
+
+    side: str
+    df: pd.DataFrame
+    mint: str
+    symbol: str
+    amount: float
+    input_mint: str
+    output_mint: str
+    input_symbol: str
+    output_symbol: str
+    # Ultra order to execute first: pre-fetched, or created for the batch
+    ultra_order: Optional[dict] = None
+    signed_transaction: Optional[str] = None
+
+
+async def _submit(order: Order, signalled_at: float) -> Optional[SwapFill]:
+    try:
+        return await perform_swap(
+            order.amount,
+            order.input_mint,
+            order.output_mint,
+            order.input_symbol,
+            order.output_symbol,
+            order.ultra_order,
+            order.signed_transaction,
+        )
+    except SwapOutcomeUnknown as e:
+        log_general.error(f"Swap for {order.symbol} may still land, not retrying: {e}")
+        return None
+    except Exception as e:
+        log_general.error(f"Swap for {order.symbol} failed: {e}")
+        return None
+    finally:
+        metrics().observe("signal_to_fill", time.perf_counter() - signalled_at, order.symbol)
+
+
+async def _prepare(orders: Sequence[Order]) -> None:
+    """Create the orders not pre-fetched concurrently, then sign them all in one batch.
+
+    Orders that could not be created or signed here are retried individually
+    by ``perform_swap``.
+    """
+    missing = [order for order in orders if order.ultra_order is None]
+    created = await asyncio.gather(
+        *(
+            create_order(order.amount, order.input_mint, order.output_mint, order.symbol)
+            for order in missing
+        ),
+        return_exceptions=True,
+    )
+    for order, ultra_order in zip(missing, created):
+        if isinstance(ultra_order, dict) and ultra_order.get("transaction"):
+            order.ultra_order = ultra_order
+        else:
+            log_general.warning(f"Creating the order for {order.symbol} failed: {ultra_order}")
+
+    signable = [order for order in orders if order.ultra_order is not None]
+    if not signable:
+        return
+    transactions = [order.ultra_order["transaction"] for order in signable]
+    try:
+        with metrics().span("sign_batch"):
+            if len(transactions) == 1:
+                signed = signer().sign_many(transactions)
+            else:
+                signed = await signer().sign_many_async(transactions)
+    except Exception as e:
+        log_general.warning(f"Batch signing failed, signing orders one by one: {e}")
+        return
+    for order, signed_transaction in zip(signable, signed):
+        order.signed_transaction = signed_transaction
+
+
+async def submit_orders(orders: Sequence[Order]) -> List[Optional[SwapFill]]:
+    """Run every order's swap concurrently; fills are in ``orders`` order, ``None`` where it failed.
+
+    Orders are created and signed as one batch first. Each
+    ``signal_to_fill`` sample counts from when the batch was submitted, so
+    the batch takes as long as its slowest swap.
+    """
+    signalled_at = time.perf_counter()
+    await _prepare(orders)
+    return list(await asyncio.gather(*(_submit(order, signalled_at) for order in orders)))
@@ -0,0 +1,250 @@
+import asyncio
+import json
+import os
+import time
+from typing import Any, List, Optional, Tuple
+
+import httpx
+import numpy as np
+import pandas as pd
+
+from soltrade.async_runtime import runtime
+from soltrade.candles import CANDLE_DTYPE, _dedupe, records_frame
+from soltrade.config import config
+from soltrade.http_client import shared_client
+from soltrade.log import log_general
+
+KLINES_URL = "https://api.binance.us/api/v3/klines"
+
+# Binance returns at most 1000 klines per request
+MAX_KLINES = 1000
+
+# History is stored at 1-minute resolution and resampled on load
+STEP = 60
+
+
+class HistoryFetchError(Exception):
+    """Raised when the exchange rejects a kline request."""
+
+
+def to_timestamp(value: Any) -> int:
+    """Unix seconds from seconds, a datetime or anything ``pd.Timestamp`` parses."""
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    timestamp = pd.Timestamp(value)
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.tz_localize("UTC")
+    return int(timestamp.timestamp())
+
+
+def klines_to_records(klines: List[List[Any]]) -> np.ndarray:
+    """Parse Binance kline rows (open time in ms, prices as strings) in one pass."""
+    records = np.zeros(len(klines), dtype=CANDLE_DTYPE)
+    if not klines:
+        return records
+    columns = np.array([row[:6] for row in klines], dtype=object).T
+    records["time"] = columns[0].astype(np.int64) // 1000
+    for field, column in zip(("open", "high", "low", "close", "volume"), columns[1:]):
+        records[field] = column.astype(np.float64)
+    return records
+
+
+class HistoryStore:
+    """Memory-mapped 1-minute candle history for one exchange symbol.
+
+    Uses the same fixed-size ``CANDLE_DTYPE`` rows as the live candle store
+    but never trims, and serves time ranges as slices of the mapping.
+    Ranges already downloaded are recorded next to it, so minutes the
+    exchange has no bars for (before listing, outages) are not requested
+    again.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.checked_path = f"{os.path.splitext(path)[0]}.checked.json"
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+    def _load(self) -> np.ndarray:
+        if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+            return np.empty(0, dtype=CANDLE_DTYPE)
+        return np.memmap(self.path, dtype=CANDLE_DTYPE, mode="r")
+
+    def bounds(self) -> Optional[Tuple[int, int]]:
+        candles = self._load()
+        if len(candles) == 0:
+            return None
+        return int(candles["time"][0]), int(candles["time"][-1])
+
+    def checked_ranges(self) -> List[Tuple[int, int]]:
+        """Sorted, non-overlapping inclusive ranges already downloaded."""
+        if not os.path.exists(self.checked_path):
+            return []
+        with open(self.checked_path) as file:
+            return [(int(a), int(b)) for a, b in json.load(file)]
+
+    def mark_checked(self, start: int, end: int) -> None:
+        """Record that ``[start, end]`` was downloaded, whatever bars it held."""
+        if start > end:
+            return
+        merged: List[Tuple[int, int]] = []
+        for a, b in sorted(self.checked_ranges() + [(start, end)]):
+            if merged and a <= merged[-1][1] + STEP:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], b))
+            else:
+                merged.append((a, b))
+        tmp_path = f"{self.checked_path}.tmp"
+        with open(tmp_path, "w") as file:
+            json.dump(merged, file)
+        os.replace(tmp_path, self.checked_path)
+
+    def missing_ranges(self, start: int, end: int) -> List[Tuple[int, int]]:
+        """Inclusive ``(start, end)`` ranges with no stored bars that were never downloaded.
+
+        Gaps are found between the stored timestamps, so holes inside the
+        history are reported as well as the ranges before and after it.
+        """
+        times = self.load(start, end)["time"].astype(np.int64)
+        edges = np.concatenate([[start - STEP], times, [end + STEP]])
+        gaps = np.flatnonzero(np.diff(edges) > STEP)
+        missing = [(int(edges[i]) + STEP, int(edges[i + 1]) - STEP) for i in gaps]
+        for checked_start, checked_end in self.checked_ranges():
+            remaining = []
+            for a, b in missing:
+                if checked_end < a or checked_start > b:
+                    remaining.append((a, b))
+                    continue
+                if a < checked_start:
+                    remaining.append((a, checked_start - STEP))
+                if checked_end < b:
+                    remaining.append((checked_end + STEP, b))
+            missing = remaining
+        return missing
+
+    def merge(self, records: np.ndarray) -> None:
+        if len(records) == 0:
+            return
+        records = _dedupe(records)
+        stored = self._load()
+        if len(stored) and records["time"][0] > stored["time"][-1]:
+            del stored
+            with open(self.path, "ab") as file:
+                file.write(records.tobytes())
+            return
+        merged = _dedupe(np.concatenate([stored, records]))
+        del stored  # release the mapping before replacing the file
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "wb") as file:
+            file.write(merged.tobytes())
+        os.replace(tmp_path, self.path)
+
+    def load(self, start: Optional[int] = None, end: Optional[int] = None) -> np.ndarray:
+        """Stored candles with ``start <= time <= end``, as a view of the file."""
+        candles = self._load()
+        times = candles["time"]
+        lo = 0 if start is None else int(np.searchsorted(times, start, side="left"))
+        hi = len(candles) if end is None else int(np.searchsorted(times, end, side="right"))
+        return candles[lo:hi]
+
+
+def history_store(symbol: str) -> HistoryStore:
+    return HistoryStore(os.path.join("data", "history", f"{symbol.upper()}_1m.bin"))
+
+
+async def fetch_klines(
+    client: httpx.AsyncClient, symbol: str, start: int, end: int, url: str = KLINES_URL
+) -> np.ndarray:
+    """Fetch one page (at most ``MAX_KLINES`` bars) of 1-minute klines."""
+    response = await client.get(
+        url,
+        params={
+            "symbol": symbol.upper(),
+            "interval": "1m",
+            "startTime": start * 1000,
+            "endTime": end * 1000,
+            "limit": MAX_KLINES,
+        },
+    )
+    if response.status_code >= 400:
+        raise HistoryFetchError(f"{symbol} klines {start}-{end}: {response.text}")
+    return klines_to_records(response.json())
+
+
+async def download_range(symbol: str, start: int, end: int, url: str = KLINES_URL) -> np.ndarray:
+    """Page through ``[start, end]`` concurrently, bounded by ``candle_fetch_concurrency``."""
+    semaphore = asyncio.Semaphore(max(1, int(config().candle_fetch_concurrency)))
+    client = shared_client(
+        "history", timeout=httpx.Timeout(float(config().candle_fetch_timeout_seconds))
+    )
+
+    async def page(page_start: int) -> np.ndarray:
+        async with semaphore:
+            page_end = min(page_start + (MAX_KLINES - 1) * STEP, end)
+            return await fetch_klines(client, symbol, page_start, page_end, url)
+
+    pages = await asyncio.gather(*(page(t) for t in range(start, end + 1, MAX_KLINES * STEP)))
+    return np.concatenate([np.empty(0, dtype=CANDLE_DTYPE), *pages])
+
+
+def resample(records: np.ndarray, interval_minutes: int) -> np.ndarray:
+    """Aggregate 1-minute records into ``interval_minutes`` bars aligned to the epoch.
+
+    One-minute input is returned as is, without copying.
+    """
+    step = int(interval_minutes) * STEP
+    if step == STEP or len(records) == 0:
+        return records
+    buckets = records["time"] // step * step
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    ends = np.r_[starts[1:], len(records)] - 1
+    out = np.empty(len(starts), dtype=CANDLE_DTYPE)
+    out["time"] = buckets[starts]
+    out["open"] = records["open"][starts]
+    out["high"] = np.maximum.reduceat(records["high"], starts)
+    out["low"] = np.minimum.reduceat(records["low"], starts)
+    out["close"] = records["close"][ends]
+    out["volume"] = np.add.reduceat(records["volume"], starts)
+    return out
+
+
+def load_candles(
+    symbol: str,
+    start: Any,
+    end: Any = None,
+    interval_minutes: int = 1,
+    download: bool = True,
+) -> np.ndarray:
+    """Candle records for ``symbol`` between ``start`` and ``end`` (default: last closed minute).
+
+    Anything missing from the local store is downloaded first unless
+    ``download`` is false, in which case only stored bars are returned.
+    """
+    start_ts = to_timestamp(start) // STEP * STEP
+    end_ts = (to_timestamp(end) if end is not None else int(time.time()) - STEP) // STEP * STEP
+    store = history_store(symbol)
+    if download:
+        for range_start, range_end in store.missing_ranges(start_ts, end_ts):
+            log_general.info(
+                f"Downloading {symbol} 1m history {pd.Timestamp(range_start, unit='s')}"
+                f" - {pd.Timestamp(range_end, unit='s')}"
+            )
+            store.merge(runtime().run(download_range(symbol, range_start, range_end)))
+            # Minutes past the newest bar may just not be published yet
+            bounds = store.bounds()
+            if bounds is not None:
+                store.mark_checked(range_start, min(range_end, bounds[1]))
+    return resample(store.load(start_ts, end_ts), interval_minutes)
+
+
+def load_frame(
+    symbol: str,
+    start: Any,
+    end: Any = None,
+    interval_minutes: Optional[int] = None,
+    download: bool = True,
+) -> pd.DataFrame:
+    """``load_candles`` as the DataFrame layout backtests and strategies use.
+
+    ``interval_minutes`` defaults to ``trading_interval_minutes``.
+    """
+    interval = interval_minutes or int(config().trading_interval_minutes)
+    return records_frame(load_candles(symbol, start, end, interval, download))
@@ -0,0 +1,81 @@
+import asyncio
+from typing import Any, Dict, Optional
+
+import httpx
+
+from soltrade.config import config
+from soltrade.log import log_general
+
+try:
+    import h2  # noqa: F401
+
+    HTTP2_AVAILABLE = True
+except ImportError:  # pragma: no cover - depends on the httpx[http2] extra
+    HTTP2_AVAILABLE = False
+
+_clients: Dict[str, httpx.AsyncClient] = {}
+_keep_warm_task: Optional[asyncio.Task] = None
+
+
+def shared_client(name: str, **kwargs: Any) -> httpx.AsyncClient:
+    """Return a long-lived AsyncClient, creating it on first use.
+
+    Clients are bound to the event loop they are first used on, so they must
+    only be used from coroutines running on ``runtime()``.
+    """
+    client = _clients.get(name)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(**kwargs)
+        _clients[name] = client
+    return client
+
+
+def jupiter_client() -> httpx.AsyncClient:
+    """Keep-alive connection pool for the Jupiter Ultra API."""
+    headers = {"Content-Type": "application/json"}
+    if config().jupiter_api_key:
+        headers["x-api-key"] = config().jupiter_api_key
+    return shared_client(
+        "jupiter",
+        base_url=config().jup_api,
+        headers=headers,
+        http2=HTTP2_AVAILABLE,
+        timeout=30.0,
+        limits=httpx.Limits(
+            max_connections=20, max_keepalive_connections=10, keepalive_expiry=120
+        ),
+    )
+
+
+async def warm_up_jupiter() -> None:
+    """Open the TLS connection to Jupiter before the first order needs it."""
+    try:
+        await jupiter_client().head("/order")
+    except httpx.HTTPError as e:
+        log_general.warning(f"Failed to pre-warm Jupiter connection: {e}")
+
+
+async def _keep_warm(interval: float) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        await warm_up_jupiter()
+
+
+async def start_keep_warm() -> None:
+    """Warm the Jupiter pool now and keep it open with periodic pings."""
+    global _keep_warm_task
+    await warm_up_jupiter()
+    interval = float(config().jupiter_keepalive_seconds)
+    if interval > 0 and (_keep_warm_task is None or _keep_warm_task.done()):
+        _keep_warm_task = asyncio.create_task(_keep_warm(interval))
+
+
+async def close_clients() -> None:
+    global _keep_warm_task
+    if _keep_warm_task is not None:
+        _keep_warm_task.cancel()
+        _keep_warm_task = None
+    for client in list(_clients.values()):
+        await client.aclose()
+    _clients.clear()
+    await config().close_async_client()
@@ -0,0 +1,387 @@
+import copy
+import math
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+class StreamingIndicator:
+    """Base class for indicators that advance one bar at a time.
+
+    ``update`` costs O(1) per bar and ``state``/``load_state`` round-trip the
+    full internal state so an indicator can be checkpointed and restored.
+    """
+
+    def update(self, value: float) -> None:
+        raise NotImplementedError("Indicator must implement the update method")
+
+    def outputs(self) -> Dict[str, float]:
+        raise NotImplementedError("Indicator must implement the outputs method")
+
+    @property
+    def warmup(self) -> int:
+        """Bars fed before the outputs stop being ``NaN``."""
+        return 1
+
+    def batch(self, values: np.ndarray) -> Dict[str, np.ndarray]:
+        """Feed every bar of ``values`` and return the outputs for each bar.
+
+        Subclasses override this with a vectorized version when the
+        indicator is fresh. Either way the instance is spent afterwards and
+        must not be updated further.
+        """
+        columns: Dict[str, List[float]] = {}
+        for value in values:
+            self.update(float(value))
+            for key, output in self.outputs().items():
+                columns.setdefault(key, []).append(output)
+        return {key: np.asarray(column, dtype=float) for key, column in columns.items()}
+
+    def state(self) -> Dict[str, Any]:
+        return dict(self.__dict__)
+
+    def load_state(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+
+
+class EMA(StreamingIndicator):
+    """Exponential moving average seeded with an SMA, matching ``talib.EMA``."""
+
+    def __init__(self, period: int):
+        self.period = period
+        self.alpha = 2.0 / (period + 1)
+        self.count = 0
+        self.seed_sum = 0.0
+        self.value = math.nan
+
+    @property
+    def warmup(self) -> int:
+        return self.period
+
+    def update(self, value: float) -> None:
+        self.count += 1
+        if self.count < self.period:
+            self.seed_sum += value
+        elif self.count == self.period:
+            self.value = (self.seed_sum + value) / self.period
+        else:
+            self.value += self.alpha * (value - self.value)
+
+    def outputs(self) -> Dict[str, float]:
+        return {"value": self.value}
+
+    def batch(self, values: np.ndarray) -> Dict[str, np.ndarray]:
+        if self.count:
+            return super().batch(values)
+        values = np.asarray(values, dtype=float)
+        out = np.full(len(values), np.nan)
+        if len(values) >= self.period:
+            seeded = values[self.period - 1 :].copy()
+            seeded[0] = values[: self.period].mean()
+            out[self.period - 1 :] = (
+                pd.Series(seeded).ewm(alpha=self.alpha, adjust=False).mean().to_numpy()
+            )
+        return {"value": out}
+
+
+class RSI(StreamingIndicator):
+    """Wilder-smoothed relative strength index, matching ``talib.RSI``."""
+
+    def __init__(self, period: int):
+        self.period = period
+        self.count = 0
+        self.previous = math.nan
+        self.avg_gain = 0.0
+        self.avg_loss = 0.0
+        self.value = math.nan
+
+    @property
+    def warmup(self) -> int:
+        # The first bar only provides the reference for the first change
+        return self.period + 1
+
+    def update(self, value: float) -> None:
+        self.count += 1
+        if self.count == 1:
+            self.previous = value
+            return
+
+        change = value - self.previous
+        self.previous = value
+        gain = change if change > 0 else 0.0
+        loss = -change if change < 0 else 0.0
+
+        if self.count <= self.period:
+            # Warm-up: accumulate simple sums of the first ``period`` changes
+            self.avg_gain += gain
+            self.avg_loss += loss
+            return
+        if self.count == self.period + 1:
+            self.avg_gain = (self.avg_gain + gain) / self.period
+            self.avg_loss = (self.avg_loss + loss) / self.period
+        else:
+            self.avg_gain = (self.avg_gain * (self.period - 1) + gain) / self.period
+            self.avg_loss = (self.avg_loss * (self.period - 1) + loss) / self.period
+
+        total = self.avg_gain + self.avg_loss
+        self.value = 100.0 * self.avg_gain / total if total != 0 else 0.0
+
+    def outputs(self) -> Dict[str, float]:
+        return {"value": self.value}
+
+    def batch(self, values: np.ndarray) -> Dict[str, np.ndarray]:
+        if self.count:
+            return super().batch(values)
+        values = np.asarray(values, dtype=float)
+        out = np.full(len(values), np.nan)
+        if len(values) > self.period:
+            changes = np.diff(values)
+
+            def wilder(series: np.ndarray) -> np.ndarray:
+                seeded = series[self.period - 1 :].copy()
+                seeded[0] = series[: self.period].mean()
+                return pd.Series(seeded).ewm(alpha=1.0 / self.period, adjust=False).mean().to_numpy()
+
+            avg_gain = wilder(np.clip(changes, 0.0, None))
+            avg_loss = wilder(np.clip(-changes, 0.0, None))
+            total = avg_gain + avg_loss
+            with np.errstate(invalid="ignore", divide="ignore"):
+                out[self.period :] = np.where(total != 0, 100.0 * avg_gain / total, 0.0)
+        return {"value": out}
+
+
+class RollingStats(StreamingIndicator):
+    """Rolling mean and sample standard deviation using a windowed Welford update.
+
+    Matches ``talib.SMA`` and ``Series.rolling(period).std()``.
+    """
+
+    def __init__(self, period: int):
+        self.period = period
+        self.window: deque = deque()
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    @property
+    def warmup(self) -> int:
+        return self.period
+
+    def update(self, value: float) -> None:
+        if len(self.window) < self.period:
+            self.window.append(value)
+            delta = value - self.mean
+            self.mean += delta / len(self.window)
+            self.m2 += delta * (value - self.mean)
+            return
+
+        oldest = self.window.popleft()
+        self.window.append(value)
+        previous_mean = self.mean
+        self.mean += (value - oldest) / self.period
+        self.m2 += (value - oldest) * (value - self.mean + oldest - previous_mean)
+        self.m2 = max(self.m2, 0.0)
+
+    def outputs(self) -> Dict[str, float]:
+        if len(self.window) < self.period:
+            return {"mean": math.nan, "std": math.nan}
+        std = math.sqrt(self.m2 / (self.period - 1)) if self.period > 1 else 0.0
+        return {"mean": self.mean, "std": std}
+
+    def batch(self, values: np.ndarray) -> Dict[str, np.ndarray]:
+        if self.window:
+            return super().batch(values)
+        rolling = pd.Series(np.asarray(values, dtype=float)).rolling(self.period)
+        std = rolling.std().to_numpy() if self.period > 1 else np.zeros(len(values))
+        mean = rolling.mean().to_numpy()
+        std[np.isnan(mean)] = np.nan
+        return {"mean": mean, "std": std}
+
+    def state(self) -> Dict[str, Any]:
+        state = dict(self.__dict__)
+        state["window"] = list(self.window)
+        return state
+
+    def load_state(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self.window = deque(state["window"])
+
+
+class IndicatorEngine:
+    """Advance a named set of streaming indicators over only the bars not yet seen.
+
+    Outputs are recorded per bar time so they can be realigned with whatever
+    candle window the strategy is handed. The still-forming last bar is
+    handled by rolling back to a checkpoint taken just before it.
+    """
+
+    def __init__(
+        self,
+        indicators: Dict[str, StreamingIndicator],
+        source: str = "close",
+        max_history: int = 5000,
+    ):
+        self.indicators = indicators
+        self.source = source
+        self.max_history = max_history
+        self._initial = self._indicator_states()
+        self._times: List[int] = []
+        self._outputs: Dict[str, List[float]] = {}
+        self._last_input = math.nan
+        self._checkpoint: Optional[Dict[str, Any]] = None
+
+    def _indicator_states(self) -> Dict[str, Dict[str, Any]]:
+        return {name: ind.state() for name, ind in self.indicators.items()}
+
+    def _load_indicator_states(self, states: Dict[str, Dict[str, Any]]) -> None:
+        for name, ind in self.indicators.items():
+            ind.load_state(states[name])
+
+    def reset(self) -> None:
+        self._load_indicator_states(self._initial)
+        self._times = []
+        self._outputs = {}
+        self._last_input = math.nan
+        self._checkpoint = None
+
+    def state(self) -> Dict[str, Any]:
+        """Checkpoint the indicator state together with the last processed bar."""
+        return {
+            "indicators": self._indicator_states(),
+            "last_time": self._times[-1] if self._times else None,
+            "last_input": self._last_input,
+        }
+
+    def load_state(self, state: Dict[str, Any]) -> None:
+        self.reset()
+        self._load_indicator_states(state["indicators"])
+        if state["last_time"] is not None:
+            self._times = [int(state["last_time"])]
+            self._last_input = float(state["last_input"])
+            self._record(self._outputs_now())
+
+    def _outputs_now(self) -> Dict[str, float]:
+        row: Dict[str, float] = {}
+        for name, ind in self.indicators.items():
+            for key, value in ind.outputs().items():
+                row[name if key == "value" else f"{name}_{key}"] = value
+        return row
+
+    def _record(self, row: Dict[str, float]) -> None:
+        for column, value in row.items():
+            self._outputs.setdefault(column, []).append(value)
+
+    def _drop_last(self) -> None:
+        self._times.pop()
+        for values in self._outputs.values():
+            values.pop()
+
+    def advance(self, df: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """Feed bars newer than the last one seen and return outputs aligned to ``df``."""
+        times = pd.to_datetime(df["time"]).to_numpy(dtype="datetime64[ns]").view("int64")
+        values = df[self.source].to_numpy(dtype=float)
+        if len(times) == 0:
+            return {}
+
+        if self._times:
+            history = np.asarray(self._times, dtype=np.int64)
+            overlap = times[(times >= history[0]) & (times <= history[-1])]
+            if len(overlap) == 0 or not np.array_equal(
+                overlap, history[len(history) - len(overlap) :]
+            ):
+                # The window no longer lines up with what we have seen
+                self.reset()
+
+        start = 0
+        if self._times:
+            last = self._times[-1]
+            start = int(np.searchsorted(times, last))
+            if start < len(times) and times[start] == last:
+                if values[start] != self._last_input and self._checkpoint is not None:
+                    self._load_indicator_states(self._checkpoint)
+                    self._drop_last()
+                else:
+                    start += 1
+
+        for i in range(start, len(times)):
+            if i == len(times) - 1:
+                self._checkpoint = self._indicator_states()
+            value = float(values[i])
+            for ind in self.indicators.values():
+                ind.update(value)
+            self._times.append(int(times[i]))
+            self._last_input = value
+            self._record(self._outputs_now())
+
+        if len(self._times) > self.max_history * 2:
+            excess = len(self._times) - self.max_history
+            self._times = self._times[excess:]
+            for column in self._outputs:
+                self._outputs[column] = self._outputs[column][excess:]
+
+        history = np.asarray(self._times, dtype=np.int64)
+        positions = np.searchsorted(history, times)
+        found = (positions < len(history)) & (
+            history[np.minimum(positions, len(history) - 1)] == times
+        )
+        aligned: Dict[str, np.ndarray] = {}
+        for column, column_values in self._outputs.items():
+            series = np.asarray(column_values, dtype=float)
+            out = np.full(len(times), np.nan)
+            out[found] = series[positions[found]]
+            aligned[column] = out
+        return aligned
+
+    def batch(self, df: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """Compute every output over all of ``df`` at once, leaving the streaming state alone."""
+        values = df[self.source].to_numpy(dtype=float)
+        columns: Dict[str, np.ndarray] = {}
+        for name, ind in self.indicators.items():
+            fresh = copy.deepcopy(ind)
+            fresh.load_state(copy.deepcopy(self._initial[name]))
+            for key, output in fresh.batch(values).items():
+                columns[name if key == "value" else f"{name}_{key}"] = output
+        return columns
+
+
+class BatchIndicatorEngine(IndicatorEngine):
+    """Engine for whole-history runs such as backtests: every ``advance`` is one batch pass.
+
+    ``cache`` may be shared by engines that all run over the same candles
+    (e.g. every configuration of a parameter sweep); outputs are then
+    computed once per indicator type and parameters.
+    """
+
+    def __init__(
+        self,
+        indicators: Dict[str, StreamingIndicator],
+        source: str = "close",
+        cache: Optional[Dict[Any, Dict[str, np.ndarray]]] = None,
+    ):
+        super().__init__(indicators, source)
+        self.cache = cache
+
+    def _cache_key(self, name: str) -> Any:
+        ind = self.indicators[name]
+        params = tuple(sorted((key, repr(value)) for key, value in self._initial[name].items()))
+        return (type(ind).__name__, self.source, params)
+
+    def batch(self, df: pd.DataFrame) -> Dict[str, np.ndarray]:
+        if self.cache is None:
+            return super().batch(df)
+        values = df[self.source].to_numpy(dtype=float)
+        columns: Dict[str, np.ndarray] = {}
+        for name, ind in self.indicators.items():
+            key = self._cache_key(name)
+            outputs = self.cache.get(key)
+            if outputs is None:
+                fresh = copy.deepcopy(ind)
+                fresh.load_state(copy.deepcopy(self._initial[name]))
+                outputs = self.cache[key] = fresh.batch(values)
+            for output_key, output in outputs.items():
+                columns[name if output_key == "value" else f"{name}_{output_key}"] = output.copy()
+        return columns
+
+    def advance(self, df: pd.DataFrame) -> Dict[str, np.ndarray]:
+        return self.batch(df)
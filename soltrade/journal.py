@@ -0,0 +1,197 @@
+import math
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, Optional
+
+import pandas as pd
+
+from soltrade.clock import clock
+from soltrade.log import log_general
+
+POSITION_COLUMNS = [
+    "position",
+    "entry_price",
+    "takeprofit",
+    "stoploss",
+    "trailing_stoploss",
+    "trailing_stoploss_target",
+]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS positions (
+    mint TEXT PRIMARY KEY,
+    symbol TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    entry_price REAL,
+    takeprofit REAL,
+    stoploss REAL,
+    trailing_stoploss REAL,
+    trailing_stoploss_target REAL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS fills (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    mint TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    side TEXT NOT NULL,
+    price REAL,
+    amount REAL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS fills_mint_id ON fills (mint, id);
+"""
+
+
+def _nullable(value: Any) -> Optional[float]:
+    if value is None:
+        return None
+    value = float(value)
+    return None if math.isnan(value) else value
+
+
+class TradeJournal:
+    """SQLite (WAL mode) journal of the current position per mint and every fill.
+
+    Position state is one row per mint, so reading it is a primary key
+    lookup. Each trade writes its position update and fill in a single
+    transaction, so a crash never leaves a half-written position behind.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def latest_position(self, mint: str) -> Optional[Dict[str, Any]]:
+        """Return the stored position for ``mint``, or ``None`` if it never traded."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM positions WHERE mint = ?", (mint,)
+            ).fetchone()
+        if row is None:
+            return None
+        state = {col: row[col] for col in POSITION_COLUMNS}
+        state["position"] = bool(state["position"])
+        for col in POSITION_COLUMNS[1:]:
+            if state[col] is None:
+                state[col] = math.nan
+        return state
+
+    def entry_time(self, mint: str) -> Optional[float]:
+        """When the last buy of ``mint`` filled, or ``None`` without one, e.g. after a CSV import."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT created_at FROM fills WHERE mint = ? AND side = 'buy' ORDER BY id DESC LIMIT 1",
+                (mint,),
+            ).fetchone()
+        return None if row is None else float(row["created_at"])
+
+    def _write(
+        self,
+        mint: str,
+        symbol: str,
+        side: Optional[str],
+        price: float,
+        amount: float,
+        state: Dict[str, Any],
+    ) -> None:
+        now = clock().time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    """
+                    INSERT INTO positions (mint, symbol, position, entry_price, takeprofit,
+                        stoploss, trailing_stoploss, trailing_stoploss_target, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(mint) DO UPDATE SET
+                        symbol = excluded.symbol,
+                        position = excluded.position,
+                        entry_price = excluded.entry_price,
+                        takeprofit = excluded.takeprofit,
+                        stoploss = excluded.stoploss,
+                        trailing_stoploss = excluded.trailing_stoploss,
+                        trailing_stoploss_target = excluded.trailing_stoploss_target,
+                        updated_at = excluded.updated_at
+                    """,
+                    (
+                        mint,
+                        symbol,
+                        int(bool(state.get("position"))),
+                        *(_nullable(state.get(col)) for col in POSITION_COLUMNS[1:]),
+                        now,
+                    ),
+                )
+                if side is not None:
+                    self._conn.execute(
+                        "INSERT INTO fills (mint, symbol, side, price, amount, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                        (mint, symbol, side, _nullable(price), _nullable(amount), now),
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def record_entry(self, mint: str, symbol: str, amount: float, state: Dict[str, Any]) -> None:
+        """Open a position from the entry/stop/target levels in ``state``."""
+        self._write(mint, symbol, "buy", state["entry_price"], amount, {**state, "position": True})
+
+    def record_exit(self, mint: str, symbol: str, price: float, amount: float) -> None:
+        """Close the position for ``mint`` and record the sell fill."""
+        self._write(mint, symbol, "sell", price, amount, {"position": False})
+
+    def record_partial_exit(
+        self, mint: str, symbol: str, price: float, amount: float, state: Dict[str, Any]
+    ) -> None:
+        """Record a sell fill that leaves the position for ``mint`` open at ``state``."""
+        self._write(mint, symbol, "sell", price, amount, {**state, "position": True})
+
+    def close_position(self, mint: str, symbol: str) -> None:
+        """Close the position for ``mint`` without a fill, e.g. when it was sold outside SolTrade."""
+        self._write(mint, symbol, None, math.nan, math.nan, {"position": False})
+
+    def fills(self, mint: Optional[str] = None) -> pd.DataFrame:
+        """Return the trade history, optionally for a single mint."""
+        query = "SELECT * FROM fills"
+        params: tuple = ()
+        if mint is not None:
+            query += " WHERE mint = ?"
+            params = (mint,)
+        with self._lock:
+            return pd.read_sql_query(query + " ORDER BY id", self._conn, params=params)
+
+    def import_csv_position(self, mint: str, symbol: str, csv_path: str) -> None:
+        """One-off migration of the last row of a legacy ``data/{symbol}_data.csv``."""
+        if self.latest_position(mint) is not None or not os.path.exists(csv_path):
+            return
+        try:
+            last_row = pd.read_csv(csv_path).iloc[-1]
+        except Exception as e:
+            log_general.warning(f"Could not migrate {csv_path}: {e}")
+            return
+        if not bool(last_row.get("position", False)):
+            return
+        state = {col: last_row.get(col) for col in POSITION_COLUMNS}
+        self._write(mint, symbol, None, math.nan, math.nan, state)
+        log_general.info(f"Migrated open {symbol} position from {csv_path}")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_journal_instance = None
+
+
+def journal(path: str = os.path.join("data", "soltrade.db")) -> TradeJournal:
+    """Singleton pattern to ensure only one TradeJournal connection exists."""
+    global _journal_instance
+    if _journal_instance is None:
+        _journal_instance = TradeJournal(path)
+    return _journal_instance
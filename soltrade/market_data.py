@@ -0,0 +1,129 @@
+import asyncio
+from typing import Any, Dict, List, Optional, Union
+
+import httpx
+import numpy as np
+import pandas as pd
+
+from soltrade.candles import candle_store
+from soltrade.clock import clock
+from soltrade.config import config
+from soltrade.http_client import shared_client
+from soltrade.log import log_general
+from soltrade.metrics import metrics
+from soltrade.resilience import endpoint
+from soltrade.strategy import history_bars
+
+
+class CandleFetchError(Exception):
+    """Raised when CryptoCompare returns an error payload for a candle request."""
+
+
+async def fetch_candlestick(
+    client: httpx.AsyncClient,
+    primary_mint_symbol: str,
+    secondary_mint_symbol: str,
+    limit: int = 50,
+    to_ts: Optional[int] = None,
+    interval_minutes: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """Fetch candlestick rows from CryptoCompare API."""
+    params: Dict[str, str | int] = {
+        "tsym": primary_mint_symbol,
+        "fsym": secondary_mint_symbol,
+        "limit": limit,
+        "aggregate": interval_minutes or config().interval_minutes(secondary_mint_symbol),
+    }
+    if to_ts is not None:
+        params["toTs"] = to_ts
+
+    async def request() -> httpx.Response:
+        response = await client.get(
+            config().candle_api, params=params, headers={"authorization": config().api_key}
+        )
+        response.raise_for_status()
+        return response
+
+    response_json = (await endpoint("cryptocompare").call(request)).json()
+    if response_json.get("Response") == "Error":
+        raise CandleFetchError(response_json.get("Message"))
+    return response_json["Data"]["Data"]
+
+
+def parse_prices(response_json: Dict[str, Any], mints: List[str]) -> Dict[str, float]:
+    """``usdPrice`` per mint from a Jupiter Price v3 response; missing mints are 0."""
+    prices: Dict[str, float] = {}
+    for mint in mints:
+        mint_data = response_json.get(mint) or {}
+        price = float(mint_data.get("usdPrice") or 0)
+        if price == 0:
+            log_general.debug(f"Price for {mint} missing from response; defaulting to 0")
+        prices[mint] = price
+    return prices
+
+
+async def _load_candles(
+    client: httpx.AsyncClient,
+    semaphore: asyncio.Semaphore,
+    primary_mint_symbol: str,
+    secondary_mint_symbol: str,
+    records: bool = False,
+    closed_by: Optional[int] = None,
+) -> Optional[Union[pd.DataFrame, np.ndarray]]:
+    """Update one pair's candle store; returns ``None`` if the fetch failed."""
+    bars = history_bars()
+    interval_minutes = config().interval_minutes(secondary_mint_symbol)
+    store = candle_store(secondary_mint_symbol, primary_mint_symbol, interval_minutes, bars)
+    try:
+        for to_ts, limit in store.pending_windows(int(clock().time())):
+            async with semaphore:
+                with metrics().span("fetch_candlestick", secondary_mint_symbol):
+                    rows = await fetch_candlestick(
+                        client,
+                        primary_mint_symbol,
+                        secondary_mint_symbol,
+                        limit,
+                        to_ts,
+                        interval_minutes,
+                    )
+            store.ingest(rows)
+            store.fetched(to_ts)
+    except Exception as e:
+        log_general.error(
+            f"Failed to fetch candlestick data for {secondary_mint_symbol}, skipping: {e}"
+        )
+        return None
+    if records:
+        return store.records(bars, closed_by)
+    return store.frame(bars, closed_by)
+
+
+async def load_all_candles(
+    primary_mint_symbol: str,
+    secondary_mint_symbols: List[str],
+    records: bool = False,
+    closed_by: Optional[Dict[str, int]] = None,
+) -> Dict[str, Optional[Union[pd.DataFrame, np.ndarray]]]:
+    """Refresh every pair's candles concurrently, bounded by ``candle_fetch_concurrency``.
+
+    Returns frames, or the raw ``CANDLE_DTYPE`` records with ``records``.
+    ``closed_by`` maps symbols to a bar close time; their candles stop at
+    the last bar closed by then.
+    """
+    semaphore = asyncio.Semaphore(max(1, int(config().candle_fetch_concurrency)))
+    timeout = httpx.Timeout(float(config().candle_fetch_timeout_seconds))
+    client = shared_client("cryptocompare", timeout=timeout)
+    frames = await asyncio.gather(
+        *(
+            _load_candles(
+                client,
+                semaphore,
+                primary_mint_symbol,
+                symbol,
+                records,
+                (closed_by or {}).get(symbol),
+            )
+            for symbol in secondary_mint_symbols
+        )
+    )
+    return dict(zip(secondary_mint_symbols, frames))
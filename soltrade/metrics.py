@@ -0,0 +1,177 @@
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Deque, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from soltrade.log import log_metrics
+
+# Histogram bucket upper bounds in seconds
+LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+QUANTILES: Tuple[float, ...] = (0.5, 0.95, 0.99)
+
+
+class LatencyHistogram:
+    """Cumulative bucket counts plus a bounded sample window for percentiles."""
+
+    def __init__(self, sample_size: int = 2048) -> None:
+        self.bucket_counts: List[int] = [0] * len(LATENCY_BUCKETS)
+        self.count = 0
+        self.total = 0.0
+        self.samples: Deque[float] = deque(maxlen=sample_size)
+
+    def observe(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.samples.append(seconds)
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                self.bucket_counts[i] += 1
+                break
+
+    def quantiles(self) -> Dict[float, float]:
+        if not self.samples:
+            return {q: float("nan") for q in QUANTILES}
+        values = np.quantile(np.fromiter(self.samples, dtype=float), QUANTILES)
+        return dict(zip(QUANTILES, values.tolist()))
+
+
+class LatencyMetrics:
+    """Per-stage, per-mint latency histograms shared by the whole bot."""
+
+    def __init__(self) -> None:
+        self._histograms: Dict[Tuple[str, str], LatencyHistogram] = {}
+        self._lock = threading.Lock()
+        self._last_export = time.monotonic()
+
+    def observe(self, stage: str, seconds: float, mint: str = "") -> None:
+        with self._lock:
+            histogram = self._histograms.get((stage, mint))
+            if histogram is None:
+                histogram = self._histograms[(stage, mint)] = LatencyHistogram()
+            histogram.observe(seconds)
+
+    @contextmanager
+    def span(self, stage: str, mint: str = "") -> Iterator[None]:
+        """Time the enclosed block and record it under ``stage``/``mint``."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start, mint)
+
+    def quantiles(self, stage: str) -> Dict[float, float]:
+        """Recent latency percentiles of ``stage`` across every mint."""
+        with self._lock:
+            samples = [
+                sample
+                for (name, _), histogram in self._histograms.items()
+                if name == stage
+                for sample in histogram.samples
+            ]
+        if not samples:
+            return {q: float("nan") for q in QUANTILES}
+        return dict(zip(QUANTILES, np.quantile(samples, QUANTILES).tolist()))
+
+    def prometheus_text(self) -> str:
+        lines = [
+            "# HELP soltrade_stage_latency_seconds Latency of trading loop stages.",
+            "# TYPE soltrade_stage_latency_seconds histogram",
+        ]
+        quantile_lines = [
+            "# HELP soltrade_stage_latency_quantile_seconds Recent latency percentiles.",
+            "# TYPE soltrade_stage_latency_quantile_seconds gauge",
+        ]
+        with self._lock:
+            for (stage, mint), histogram in sorted(self._histograms.items()):
+                labels = f'stage="{stage}",mint="{mint}"'
+                cumulative = 0
+                for bound, bucket_count in zip(LATENCY_BUCKETS, histogram.bucket_counts):
+                    cumulative += bucket_count
+                    lines.append(
+                        f'soltrade_stage_latency_seconds_bucket{{{labels},le="{bound}"}} {cumulative}'
+                    )
+                lines.append(
+                    f'soltrade_stage_latency_seconds_bucket{{{labels},le="+Inf"}} {histogram.count}'
+                )
+                lines.append(f"soltrade_stage_latency_seconds_sum{{{labels}}} {histogram.total}")
+                lines.append(f"soltrade_stage_latency_seconds_count{{{labels}}} {histogram.count}")
+                for q, value in histogram.quantiles().items():
+                    quantile_lines.append(
+                        f'soltrade_stage_latency_quantile_seconds{{{labels},quantile="{q}"}} {value}'
+                    )
+        return "\n".join(lines + quantile_lines) + "\n"
+
+    def summary_lines(self) -> List[str]:
+        lines = []
+        with self._lock:
+            for (stage, mint), histogram in sorted(self._histograms.items()):
+                q = histogram.quantiles()
+                name = f"{stage}[{mint}]" if mint else stage
+                lines.append(
+                    f"{name}: n={histogram.count} "
+                    f"p50={q[0.5] * 1000:.1f}ms p95={q[0.95] * 1000:.1f}ms p99={q[0.99] * 1000:.1f}ms"
+                )
+        return lines
+
+    def export(self, path: str = "logs/metrics.prom") -> None:
+        """Write the Prometheus text exposition atomically and log a summary."""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as file:
+            file.write(self.prometheus_text())
+        os.replace(tmp_path, path)
+        for line in self.summary_lines():
+            log_metrics.info(line)
+
+    def maybe_export(self, interval_seconds: float) -> None:
+        """Export once ``interval_seconds`` have passed since the last export."""
+        now = time.monotonic()
+        if interval_seconds > 0 and now - self._last_export >= interval_seconds:
+            self._last_export = now
+            self.export()
+
+
+_metrics_instance = None
+_metrics_server: Optional[ThreadingHTTPServer] = None
+
+
+def metrics() -> LatencyMetrics:
+    """Singleton pattern to ensure only one metrics registry exists."""
+    global _metrics_instance
+    if _metrics_instance is None:
+        _metrics_instance = LatencyMetrics()
+    return _metrics_instance
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:
+        if self.path.rstrip("/") != "/metrics":
+            self.send_error(404)
+            return
+        body = metrics().prometheus_text().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+def serve_metrics(port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """Expose ``/metrics`` on a local port from a daemon thread."""
+    global _metrics_server
+    if _metrics_server is None:
+        _metrics_server = ThreadingHTTPServer((host, port), _MetricsHandler)
+        threading.Thread(
+            target=_metrics_server.serve_forever, name="soltrade-metrics", daemon=True
+        ).start()
+    return _metrics_server
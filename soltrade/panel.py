@@ -0,0 +1,156 @@
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+CANDLE_COLUMNS = ("open", "high", "low", "close", "volume")
+
+
+@dataclass
+class CandlePanel:
+    """Candles for many mints aligned into ``(mints, bars)`` arrays.
+
+    Each row holds one mint's most recent bars, right-aligned so column
+    ``-1`` is every mint's latest bar; mints with a shorter history are
+    NaN-padded on the left. ``columns`` carries any extra per-bar inputs a
+    strategy may check for, the way it would check a DataFrame's columns.
+    """
+
+    symbols: List[str]
+    time: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+    lengths: np.ndarray
+    columns: Dict[str, np.ndarray] = field(default_factory=dict)
+
+    def frame(self, row: int, outputs: Optional[Dict[str, np.ndarray]] = None) -> pd.DataFrame:
+        """One mint's bars plus strategy ``outputs`` as the DataFrame the per-mint path uses."""
+        start = self.time.shape[1] - int(self.lengths[row])
+        data: Dict[str, Any] = {"time": self.time[row, start:]}
+        for name in CANDLE_COLUMNS:
+            data[name] = getattr(self, name)[row, start:]
+        for name, values in {**self.columns, **(outputs or {})}.items():
+            data[name] = values[row, start:]
+        return pd.DataFrame(data)
+
+    def last_rows(self, outputs: Optional[Dict[str, np.ndarray]] = None) -> List[Dict[str, Any]]:
+        """Every mint's latest bar and strategy outputs, one dict per mint."""
+        last = {"time": self.time[:, -1]}
+        for name in CANDLE_COLUMNS:
+            last[name] = getattr(self, name)[:, -1]
+        for name, values in {**self.columns, **(outputs or {})}.items():
+            last[name] = values[:, -1]
+        names = list(last)
+        return [dict(zip(names, values)) for values in zip(*(last[name].tolist() for name in names))]
+
+
+def build_panel(
+    frames: Sequence[pd.DataFrame], symbols: Sequence[str], bars: Optional[int] = None
+) -> CandlePanel:
+    """Align the last ``bars`` rows of each candle frame (default: the longest frame)."""
+    bars = bars or max((len(df) for df in frames), default=0)
+    shape = (len(frames), bars)
+    time = np.full(shape, np.datetime64("NaT"), dtype="datetime64[ns]")
+    arrays = {name: np.full(shape, np.nan) for name in CANDLE_COLUMNS}
+    lengths = np.zeros(len(frames), dtype=np.int64)
+    for row, df in enumerate(frames):
+        tail = df.iloc[-bars:] if bars else df.iloc[:0]
+        lengths[row] = length = len(tail)
+        if length == 0:
+            continue
+        time[row, bars - length :] = pd.to_datetime(tail["time"]).to_numpy(dtype="datetime64[ns]")
+        for name in CANDLE_COLUMNS:
+            if name in tail.columns:
+                arrays[name][row, bars - length :] = tail[name].to_numpy(dtype=float)
+    return CandlePanel(list(symbols), time, lengths=lengths, **arrays)
+
+
+def records_panel(
+    records: Sequence[np.ndarray], symbols: Sequence[str], bars: Optional[int] = None
+) -> CandlePanel:
+    """``build_panel`` from ``CANDLE_DTYPE`` records, skipping DataFrames altogether."""
+    bars = bars or max((len(candles) for candles in records), default=0)
+    shape = (len(records), bars)
+    time = np.full(shape, np.datetime64("NaT"), dtype="datetime64[ns]")
+    arrays = {name: np.full(shape, np.nan) for name in CANDLE_COLUMNS}
+    lengths = np.zeros(len(records), dtype=np.int64)
+    for row, candles in enumerate(records):
+        tail = candles[max(0, len(candles) - bars) :]
+        lengths[row] = length = len(tail)
+        if length == 0:
+            continue
+        time[row, bars - length :] = tail["time"].astype("datetime64[s]")
+        for name in CANDLE_COLUMNS:
+            arrays[name][row, bars - length :] = tail[name]
+    return CandlePanel(list(symbols), time, lengths=lengths, **arrays)
+
+
+# Indicators over the last axis of 1-D or (mints, bars) arrays. Leading NaNs
+# (panel padding) are skipped; outputs are NaN until each row has warmed up
+# and match the streaming indicators in ``soltrade.indicators``.
+
+
+def _windows(values: np.ndarray, period: int) -> np.ndarray:
+    """``(..., bars, period)`` trailing windows, NaN where fewer than ``period`` bars exist."""
+    padded = np.concatenate(
+        [np.full(values.shape[:-1] + (period - 1,), np.nan), values], axis=-1
+    )
+    return np.lib.stride_tricks.sliding_window_view(padded, period, axis=-1)
+
+
+def sma(values: np.ndarray, period: int) -> np.ndarray:
+    values = np.asarray(values, dtype=float)
+    return _windows(values, period).mean(axis=-1)
+
+
+def rolling_std(values: np.ndarray, period: int) -> np.ndarray:
+    """Rolling sample standard deviation, like ``Series.rolling(period).std()``."""
+    values = np.asarray(values, dtype=float)
+    if period == 1:
+        return np.where(np.isnan(values), np.nan, 0.0)
+    return _windows(values, period).std(axis=-1, ddof=1)
+
+
+def _smoothed(
+    values: np.ndarray, period: int, step: Callable[[np.ndarray, np.ndarray], np.ndarray]
+) -> np.ndarray:
+    """SMA-seeded recursive smoothing: ``step(previous, value)`` advances every row one bar.
+
+    The loop runs over bars only, so its cost does not grow with the number
+    of rows.
+    """
+    seed = sma(values, period)
+    out = np.full(values.shape, np.nan)
+    state = np.full(values.shape[:-1], np.nan)
+    for t in range(values.shape[-1]):
+        state = np.where(np.isnan(state), seed[..., t], step(state, values[..., t]))
+        out[..., t] = state
+    return out
+
+
+def ema(values: np.ndarray, period: int) -> np.ndarray:
+    """Exponential moving average seeded with an SMA, matching ``indicators.EMA``."""
+    values = np.asarray(values, dtype=float)
+    alpha = 2.0 / (period + 1)
+    return _smoothed(values, period, lambda previous, value: previous + alpha * (value - previous))
+
+
+def rsi(values: np.ndarray, period: int) -> np.ndarray:
+    """Wilder-smoothed relative strength index, matching ``indicators.RSI``."""
+    values = np.asarray(values, dtype=float)
+    changes = np.diff(values, axis=-1)
+
+    def wilder(previous: np.ndarray, value: np.ndarray) -> np.ndarray:
+        return (previous * (period - 1) + value) / period
+
+    avg_gain = _smoothed(np.clip(changes, 0.0, None), period, wilder)
+    avg_loss = _smoothed(np.clip(-changes, 0.0, None), period, wilder)
+    total = avg_gain + avg_loss
+    with np.errstate(invalid="ignore", divide="ignore"):
+        out = np.where(total != 0, 100.0 * avg_gain / total, 0.0)
+    out[np.isnan(total)] = np.nan
+    return np.concatenate([np.full(values.shape[:-1] + (1,), np.nan), out], axis=-1)
@@ -0,0 +1,103 @@
+import threading
+from dataclasses import dataclass
+from typing import Dict, Optional, Set, Tuple
+
+from soltrade.async_runtime import runtime
+from soltrade.clock import clock
+from soltrade.config import config
+from soltrade.log import log_transaction
+from soltrade.transactions import create_order
+
+
+@dataclass
+class PrefetchedOrder:
+    order: dict
+    amount: float
+    expires_at: float
+
+
+class OrderPrefetcher:
+    """Speculatively requests Jupiter Ultra orders for signals that are about to fire.
+
+    Orders are fetched in the background on the shared event loop and kept
+    until ``prefetch_ttl_seconds`` elapse. A cached order is only handed out
+    if it trades no more than the amount the signal actually wants, and at
+    most ``prefetch_size_tolerance_pct`` less; each order is used at most once.
+    """
+
+    def __init__(self) -> None:
+        self._orders: Dict[Tuple[str, str], PrefetchedOrder] = {}
+        self._pending: Set[Tuple[str, str]] = set()
+        self._lock = threading.Lock()
+
+    def request(
+        self, amount: float, input_mint: str, output_mint: str, label: str = ""
+    ) -> None:
+        """Start fetching an order unless a fresh one is cached or in flight."""
+        if amount <= 0:
+            return
+        key = (input_mint, output_mint)
+        with self._lock:
+            cached = self._orders.get(key)
+            if key in self._pending or (
+                cached is not None
+                and cached.expires_at > clock().monotonic()
+                and self._size_matches(cached.amount, amount)
+            ):
+                return
+            self._pending.add(key)
+        runtime().submit(self._fetch(key, amount, label))
+
+    async def _fetch(self, key: Tuple[str, str], amount: float, label: str) -> None:
+        try:
+            order = await create_order(amount, key[0], key[1], label)
+            if "errorCode" in order or not order.get("transaction"):
+                return
+            with self._lock:
+                self._orders[key] = PrefetchedOrder(
+                    order=order,
+                    amount=amount,
+                    expires_at=clock().monotonic() + float(config().prefetch_ttl_seconds),
+                )
+            log_transaction.info(f"SolTrade has pre-fetched an order for {amount} {label}")
+        except Exception as e:
+            log_transaction.warning(f"Failed to pre-fetch order for {label}: {e}")
+        finally:
+            with self._lock:
+                self._pending.discard(key)
+
+    @staticmethod
+    def _size_matches(cached_amount: float, amount: float) -> bool:
+        # Never spend more than the signal asked for, e.g. a balance that has since shrunk
+        tolerance = float(config().prefetch_size_tolerance_pct) / 100
+        return amount * (1 - tolerance) <= cached_amount <= amount
+
+    def take(self, amount: float, input_mint: str, output_mint: str) -> Optional[dict]:
+        """Pop a still-valid cached order for this trade, if one matches."""
+        with self._lock:
+            cached = self._orders.pop((input_mint, output_mint), None)
+        if cached is None:
+            return None
+        if cached.expires_at <= clock().monotonic():
+            return None
+        if not self._size_matches(cached.amount, amount):
+            log_transaction.info(
+                f"Discarding pre-fetched order sized {cached.amount}; signal wants {amount}"
+            )
+            return None
+        return cached.order
+
+    def discard(self, input_mint: str, output_mint: str) -> None:
+        with self._lock:
+            self._orders.pop((input_mint, output_mint), None)
+
+
+_prefetcher_instance = None
+
+
+def order_prefetcher() -> OrderPrefetcher:
+    """Singleton pattern to ensure only one OrderPrefetcher instance exists."""
+    global _prefetcher_instance
+    if _prefetcher_instance is None:
+        _prefetcher_instance = OrderPrefetcher()
+    return _prefetcher_instance
@@ -0,0 +1,155 @@
+import importlib
+import os
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import numpy as np
+from rich.console import Console
+from solders.keypair import Keypair
+
+from soltrade.async_runtime import runtime
+from soltrade.clock import Clock, VirtualClock, set_clock
+from soltrade.config import config
+from soltrade.http_client import close_clients
+from soltrade.log import silence_console_logging
+from soltrade.metrics import metrics
+from soltrade.standins import StandInApiServer, StandInWallet
+from soltrade.strategy import history_bars
+
+
+@dataclass
+class ReplayReport:
+    cycles: int
+    wall_seconds: float
+    virtual_seconds: float
+    fills: int
+    final_balances: Dict[str, float]
+    signal_to_fill: Dict[float, float] = field(default_factory=dict)
+    analysis_cycle: Dict[float, float] = field(default_factory=dict)
+    bar_close_lag: Dict[float, float] = field(default_factory=dict)
+    submit_to_confirmed: Dict[float, float] = field(default_factory=dict)
+    signature_status_calls: int = 0
+
+    @property
+    def cycles_per_second(self) -> float:
+        return self.cycles / self.wall_seconds if self.wall_seconds > 0 else 0.0
+
+    @property
+    def speedup(self) -> float:
+        return self.virtual_seconds / self.wall_seconds if self.wall_seconds > 0 else 0.0
+
+    def summary_lines(self) -> List[str]:
+        lines = [
+            f"cycles: {self.cycles} in {self.wall_seconds:.2f}s "
+            f"({self.cycles_per_second:.1f}/s, {self.speedup:.0f}x real time)",
+            f"fills: {self.fills}, confirmed with {self.signature_status_calls} status calls",
+        ]
+        for name, quantiles in (
+            ("analysis_cycle", self.analysis_cycle),
+            ("signal_to_fill", self.signal_to_fill),
+            ("bar_close_lag", self.bar_close_lag),
+            ("submit_to_confirmed", self.submit_to_confirmed),
+        ):
+            lines.append(
+                f"{name}: "
+                + " ".join(f"p{round(q * 100)}={value * 1000:.1f}ms" for q, value in quantiles.items())
+            )
+        return lines
+
+
+def run_replay(
+    candles: Dict[str, np.ndarray],
+    start: Optional[int] = None,
+    end: Optional[int] = None,
+    speed: float = 1000.0,
+    initial_balance: float = 1000.0,
+    sol_balance: float = 0.1,
+    max_cycles: Optional[int] = None,
+    fee_bps: float = 0.0,
+    fill_latency: float = 0.0,
+    workdir: Optional[str] = None,
+) -> ReplayReport:
+    """Drive the real ``analyse_closed_bars`` loop over recorded 1-minute ``candles``.
+
+    ``candles`` maps each configured secondary symbol to its records.
+    Every endpoint the bot calls is pointed at a local ``StandInApiServer``
+    and a ``VirtualClock`` starting at ``start`` (default: once
+    the strategy's history is available) runs at ``speed`` times real time,
+    so the countdown between updates costs milliseconds. Orders are signed
+    with a throwaway keypair and filled against a stand-in wallet holding
+    ``initial_balance`` of the primary mint. Journal and candle files go to
+    ``workdir`` (a fresh temporary directory by default).
+
+    ``soltrade.trading`` reads its settings when imported, so each process
+    can run one replay.
+    """
+    if "soltrade.trading" in sys.modules:
+        raise RuntimeError("soltrade.trading is already imported; run the replay in a fresh process")
+    cfg = config()
+    mint_symbols = dict(zip(cfg.secondary_mints, cfg.secondary_mint_symbols))
+    missing = [symbol for symbol in mint_symbols.values() if symbol not in candles]
+    if missing:
+        raise ValueError(f"No recorded candles for {', '.join(missing)}")
+
+    bar_seconds = max(cfg.interval_minutes(symbol) for symbol in mint_symbols.values()) * 60
+    if start is None:
+        start = max(int(candles[s]["time"][0]) for s in mint_symbols.values()) + (
+            history_bars() * bar_seconds
+        )
+    if end is None:
+        end = min(int(candles[s]["time"][-1]) for s in mint_symbols.values())
+
+    keypair = Keypair()
+    balances = {cfg.primary_mint: initial_balance, cfg.sol_mint: sol_balance}
+    wallet = StandInWallet(str(keypair.pubkey()), balances, {}, cfg.sol_mint)
+    server = StandInApiServer(candles, mint_symbols, wallet, fee_bps, fill_latency)
+    server.start()
+
+    # Never sign with, or fetch balances for, the configured wallet
+    cfg.private_key = str(keypair)
+    cfg.api_key = "replay"
+    cfg.jupiter_api_key = ""
+    cfg.rpc_https = server.rpc_https
+    cfg.jup_api = server.jup_api
+    cfg.candle_api = server.candle_api
+    cfg.price_api = server.price_api
+    cfg.streaming_mode = False
+    cfg.jupiter_keepalive_seconds = 0
+    cfg.metrics_port = 0
+
+    virtual_clock = VirtualClock(start, speed)
+    set_clock(virtual_clock)
+    cwd = os.getcwd()
+    os.chdir(workdir or tempfile.mkdtemp(prefix="soltrade-replay-"))
+    try:
+        silence_console_logging()
+        trading = importlib.import_module("soltrade.trading")
+        trading.console = Console(quiet=True)
+
+        cycles = 0
+        started = time.perf_counter()
+        while virtual_clock.time() < end and (max_cycles is None or cycles < max_cycles):
+            trading.analyse_closed_bars()
+            cycles += 1
+        wall_seconds = time.perf_counter() - started
+    finally:
+        runtime().run(close_clients())
+        server.stop()
+        os.chdir(cwd)
+        set_clock(Clock())
+
+    return ReplayReport(
+        cycles=cycles,
+        wall_seconds=wall_seconds,
+        virtual_seconds=virtual_clock.time() - start,
+        fills=len(server.fills),
+        final_balances=wallet.balances(),
+        signal_to_fill=metrics().quantiles("signal_to_fill"),
+        analysis_cycle=metrics().quantiles("analysis_cycle"),
+        bar_close_lag=metrics().quantiles("bar_close_lag"),
+        submit_to_confirmed=metrics().quantiles("submit_to_confirmed"),
+        signature_status_calls=server.rpc_calls["getSignatureStatuses"],
+    )
@@ -0,0 +1,299 @@
+import asyncio
+import random
+import threading
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, Dict, Optional, Tuple, TypeVar
+
+import httpx
+import requests
+
+from soltrade.clock import clock
+from soltrade.config import config
+from soltrade.log import log_general
+from soltrade.metrics import metrics
+
+T = TypeVar("T")
+
+# Statuses worth retrying: throttling, timeouts and upstream outages
+RETRY_STATUSES = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream whose circuit breaker is open."""
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a ``Retry-After`` header, given in seconds or as an HTTP date."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - clock().time())
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+def classify(error: BaseException) -> Tuple[bool, Optional[float]]:
+    """Whether ``error`` is worth retrying, and the wait the upstream asked for.
+
+    Follows the ``__cause__`` chain so wrapped client errors, such as the
+    ``SolanaRpcException`` raised around httpx errors, are classified by the
+    error underneath.
+    """
+    seen = set()
+    current: Optional[BaseException] = error
+    while current is not None and id(current) not in seen:
+        seen.add(id(current))
+        response = None
+        if isinstance(current, httpx.HTTPStatusError):
+            response = current.response
+        elif isinstance(current, requests.HTTPError):
+            response = current.response
+        elif isinstance(
+            current,
+            (httpx.TransportError, requests.ConnectionError, requests.Timeout, asyncio.TimeoutError),
+        ):
+            return True, None
+        if response is not None:
+            if response.status_code not in RETRY_STATUSES:
+                return False, None
+            return True, parse_retry_after(response.headers.get("Retry-After"))
+        current = current.__cause__
+    return False, None
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter.
+
+    Retry ``n`` (from 0) waits a random time up to ``base_delay * 2**n``,
+    capped at ``max_delay``, so clients that failed together do not retry
+    together. A ``Retry-After`` from the upstream replaces the backoff.
+    """
+
+    def __init__(self, attempts: int = 3, base_delay: float = 0.5, max_delay: float = 10.0):
+        self.attempts = max(1, int(attempts))
+        self.base_delay = float(base_delay)
+        self.max_delay = float(max_delay)
+
+    def backoff(self, retry: int, retry_after: Optional[float] = None) -> float:
+        if retry_after is not None:
+            return min(retry_after, self.max_delay)
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**retry))
+
+
+class RetryBudget:
+    """Caps retries at ``ratio`` of an endpoint's calls.
+
+    Every call deposits ``ratio`` of a token and every retry spends a whole
+    one, so a failing upstream sees at most ``1 + ratio`` times its normal
+    load once the ``reserve`` a quiet endpoint starts with is spent.
+    """
+
+    def __init__(self, ratio: float = 0.2, reserve: float = 10.0):
+        self.ratio = float(ratio)
+        self.reserve = float(reserve)
+        self._tokens = self.reserve
+        self._lock = threading.Lock()
+
+    def deposit(self) -> None:
+        with self._lock:
+            self._tokens = min(self.reserve, self._tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        with self._lock:
+            # Allow for float rounding, e.g. five deposits of 0.2 summing to 0.999...
+            if self._tokens < 1 - 1e-9:
+                return False
+            self._tokens -= 1
+            return True
+
+
+class CircuitBreaker:
+    """Fails calls fast while an upstream keeps failing.
+
+    ``failure_threshold`` consecutive failures open the circuit for
+    ``reset_seconds``. After that a single trial call is let through
+    (half-open): success closes the circuit, failure opens it again.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_seconds: float = 30.0):
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.reset_seconds = float(reset_seconds)
+        self.state = "closed"
+        self._failures = 0
+        self._open_until = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def remaining(self) -> float:
+        """Seconds until an open circuit lets a trial call through."""
+        return max(0.0, self._open_until - clock().monotonic())
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == "open":
+                if clock().monotonic() < self._open_until:
+                    return False
+                self.state = "half_open"
+                self._trial_in_flight = False
+            if self.state == "half_open":
+                if self._trial_in_flight:
+                    return False
+                self._trial_in_flight = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = "closed"
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self, hold: Optional[float] = None) -> bool:
+        """Count a failure; ``hold`` keeps the circuit open at least that long.
+
+        Returns whether this failure opened the circuit.
+        """
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if (
+                self.state != "half_open"
+                and self._failures < self.failure_threshold
+                and hold is None
+            ):
+                return False
+            was_open = self.state == "open"
+            self.state = "open"
+            self._open_until = max(
+                self._open_until,
+                clock().monotonic() + max(self.reset_seconds, hold or 0.0),
+            )
+            return not was_open
+
+    def abandon(self) -> None:
+        """A call was cancelled before it finished; free the half-open trial slot."""
+        with self._lock:
+            self._trial_in_flight = False
+
+
+class Endpoint:
+    """Retry policy, retry budget and circuit breaker shared by every call to one upstream."""
+
+    def __init__(
+        self,
+        name: str,
+        policy: RetryPolicy,
+        budget: RetryBudget,
+        breaker: CircuitBreaker,
+    ) -> None:
+        self.name = name
+        self.policy = policy
+        self.budget = budget
+        self.breaker = breaker
+
+    def _admit(self) -> None:
+        if not self.breaker.allow():
+            raise CircuitOpenError(
+                f"{self.name} circuit is open; failing fast for {self.breaker.remaining():.0f}s"
+            )
+
+    def _retry_delay(self, error: Exception, retry: int) -> Optional[float]:
+        """Record a failed attempt; the wait before retrying, or ``None`` to give up."""
+        retryable, retry_after = classify(error)
+        if not retryable:
+            # The upstream answered, the request itself was refused
+            self.breaker.record_success()
+            return None
+        # A Retry-After longer than we would ever wait holds the circuit open instead
+        hold = retry_after if retry_after is not None and retry_after > self.policy.max_delay else None
+        if self.breaker.record_failure(hold):
+            log_general.warning(
+                f"{self.name} circuit opened after repeated failures; "
+                f"failing fast for {self.breaker.remaining():.0f}s"
+            )
+        if hold is not None or retry + 1 >= self.policy.attempts:
+            return None
+        if not self.budget.withdraw():
+            log_general.warning(f"{self.name} retry budget exhausted, not retrying: {error}")
+            return None
+        delay = self.policy.backoff(retry, retry_after)
+        log_general.warning(
+            f"{self.name} request failed ({error}); retry {retry + 1}/{self.policy.attempts - 1} "
+            f"in {delay:.2f}s"
+        )
+        metrics().observe("retry_wait", delay, self.name)
+        return delay
+
+    async def call(self, request: Callable[[], Awaitable[T]]) -> T:
+        """Await ``request()``, retrying retryable failures with backoff.
+
+        ``request`` is called again for every attempt. Raises
+        ``CircuitOpenError`` without calling it while the circuit is open,
+        and the last error once retries are exhausted.
+        """
+        self.budget.deposit()
+        retry = 0
+        while True:
+            self._admit()
+            try:
+                result = await request()
+            except Exception as e:
+                delay = self._retry_delay(e, retry)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                retry += 1
+                continue
+            except BaseException:
+                self.breaker.abandon()
+                raise
+            self.breaker.record_success()
+            return result
+
+    def call_sync(self, request: Callable[[], T]) -> T:
+        """``call`` for blocking clients; waits between attempts on the trading clock."""
+        self.budget.deposit()
+        retry = 0
+        while True:
+            self._admit()
+            try:
+                result = request()
+            except Exception as e:
+                delay = self._retry_delay(e, retry)
+                if delay is None:
+                    raise
+                clock().sleep(delay)
+                retry += 1
+                continue
+            except BaseException:
+                self.breaker.abandon()
+                raise
+            self.breaker.record_success()
+            return result
+
+
+_endpoints: Dict[str, Endpoint] = {}
+_endpoints_lock = threading.Lock()
+
+
+def endpoint(name: str) -> Endpoint:
+    """The shared resilience state for upstream ``name``, e.g. ``rpc`` or ``jupiter``."""
+    with _endpoints_lock:
+        instance = _endpoints.get(name)
+        if instance is None:
+            instance = Endpoint(
+                name,
+                RetryPolicy(
+                    config().retry_attempts,
+                    config().retry_base_delay_seconds,
+                    config().retry_max_delay_seconds,
+                ),
+                RetryBudget(config().retry_budget_ratio),
+                CircuitBreaker(config().circuit_failure_threshold, config().circuit_reset_seconds),
+            )
+            _endpoints[name] = instance
+        return instance
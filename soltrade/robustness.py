@@ -0,0 +1,197 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from soltrade.candles import frame_records
+from soltrade.config import config
+from soltrade.sweep import _evaluate, backtest_settings, candle_pool, chunksize, pool_size
+
+# Per-fold metrics aggregated in the walk-forward report
+FOLD_METRICS = ["total_return_pct", "max_drawdown_pct", "win_rate_pct", "trades"]
+
+MONTE_CARLO_METHODS = ("shuffle", "bootstrap")
+
+# Upper bound on simulations x trades per Monte Carlo task, which caps the
+# size of each worker's path matrix
+_PATH_CELLS_PER_TASK = 2_000_000
+
+PERCENTILES = (5, 25, 50, 75, 95)
+
+
+def walk_forward_folds(
+    bars: int, in_sample_bars: int, out_of_sample_bars: int, warmup_bars: int
+) -> List[Tuple[int, int, int, int]]:
+    """Rolling ``(is_start, is_end, oos_start, oos_end)`` bar ranges.
+
+    Each out-of-sample window directly follows its in-sample window and
+    the next fold starts one out-of-sample length later.
+    """
+    if warmup_bars > in_sample_bars:
+        raise ValueError("warmup_bars must not exceed in_sample_bars")
+    folds = []
+    start = 0
+    while start + in_sample_bars + out_of_sample_bars <= bars:
+        is_end = start + in_sample_bars
+        folds.append((start, is_end, is_end, is_end + out_of_sample_bars))
+        start += out_of_sample_bars
+    return folds
+
+
+def walk_forward(
+    df: pd.DataFrame,
+    parameter_sets: Sequence[Dict[str, float]],
+    in_sample_bars: int,
+    out_of_sample_bars: int,
+    strategy_name: Optional[str] = None,
+    metric: str = "total_return_pct",
+    warmup_bars: int = 100,
+    workers: Optional[int] = None,
+    initial_balance: float = 1000.0,
+    fee_pct: float = 0.1,
+    slippage_pct: float = 0.05,
+) -> pd.DataFrame:
+    """Walk-forward optimisation: pick the best ``metric`` in-sample, score it out-of-sample.
+
+    Every in-sample run of every fold goes to one process pool and only
+    the best configuration per fold is kept as results stream back, so
+    memory does not grow with the size of the grid. Out-of-sample runs
+    start ``warmup_bars`` early so indicators are primed at the boundary.
+    Returns one row per fold; ``trade_returns_pct`` holds the
+    out-of-sample trades for ``monte_carlo``.
+    """
+    df = df.sort_values("time").reset_index(drop=True)
+    folds = walk_forward_folds(len(df), in_sample_bars, out_of_sample_bars, warmup_bars)
+    if not folds:
+        raise ValueError("Not enough candles for a single in-sample/out-of-sample fold")
+
+    records = frame_records(df)
+    settings = backtest_settings(strategy_name, initial_balance, fee_pct, slippage_pct)
+    workers = pool_size(workers)
+    best: List[Tuple[float, Optional[Dict[str, float]]]] = [(-np.inf, None)] * len(folds)
+    with candle_pool(records, settings, workers) as pool:
+        tasks = [(fold, params) for fold in range(len(folds)) for params in parameter_sets]
+        in_sample = pool.map(
+            _evaluate,
+            [params for _, params in tasks],
+            [(folds[fold][0], folds[fold][1], 0) for fold, _ in tasks],
+            chunksize=chunksize(len(tasks), workers),
+        )
+        for (fold, params), summary in zip(tasks, in_sample):
+            if summary[metric] > best[fold][0]:
+                best[fold] = (summary[metric], params)
+
+        out_of_sample = pool.map(
+            _evaluate,
+            [params or {} for _, params in best],
+            [(oos_start - warmup_bars, oos_end, warmup_bars) for *_, oos_start, oos_end in folds],
+            [True] * len(folds),
+        )
+        rows = []
+        for fold, ((is_start, _, oos_start, oos_end), (score, params), summary) in enumerate(
+            zip(folds, best, out_of_sample)
+        ):
+            rows.append(
+                {
+                    "fold": fold,
+                    "in_sample_start": df["time"].iat[is_start],
+                    "out_of_sample_start": df["time"].iat[oos_start],
+                    "out_of_sample_end": df["time"].iat[oos_end - 1],
+                    "params": params,
+                    f"in_sample_{metric}": score,
+                    **summary,
+                }
+            )
+    return pd.DataFrame(rows)
+
+
+def _simulate(
+    returns_pct: np.ndarray, method: str, simulations: int, seed: np.random.SeedSequence
+) -> np.ndarray:
+    """``(simulations, 2)`` array of final return % and max drawdown % per path."""
+    rng = np.random.default_rng(seed)
+    growth = 1 + returns_pct / 100
+    if method == "shuffle":
+        # Same trades in a random order: only the path (and so drawdown) changes
+        paths = rng.permuted(np.broadcast_to(growth, (simulations, len(growth))), axis=1)
+    else:
+        paths = growth[rng.integers(0, len(growth), size=(simulations, len(growth)))]
+    equity = np.cumprod(paths, axis=1)
+    peaks = np.maximum.accumulate(np.maximum(equity, 1.0), axis=1)
+    drawdown = np.max(1 - equity / peaks, axis=1)
+    return np.column_stack([(equity[:, -1] - 1) * 100, drawdown * 100])
+
+
+def monte_carlo(
+    trade_returns_pct: Sequence[float],
+    simulations: int = 10000,
+    method: str = "shuffle",
+    seed: Optional[int] = None,
+    workers: Optional[int] = None,
+) -> pd.DataFrame:
+    """Resample a trade sequence into ``simulations`` equity paths across a process pool.
+
+    ``shuffle`` reorders the trades (final return is unchanged, drawdown
+    is not); ``bootstrap`` draws trades with replacement. Paths are built
+    in chunks, and only each path's final return and max drawdown are sent
+    back. Returns one row per simulated path.
+    """
+    if method not in MONTE_CARLO_METHODS:
+        raise ValueError(f"Unknown Monte Carlo method {method!r}")
+    returns = np.asarray(trade_returns_pct, dtype=float)
+    if len(returns) == 0 or simulations <= 0:
+        return pd.DataFrame(columns=["total_return_pct", "max_drawdown_pct"])
+
+    per_task = max(1, _PATH_CELLS_PER_TASK // len(returns))
+    sizes = [per_task] * (simulations // per_task)
+    if simulations % per_task:
+        sizes.append(simulations % per_task)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    with ProcessPoolExecutor(max_workers=min(pool_size(workers), len(sizes))) as pool:
+        chunks = list(
+            pool.map(_simulate, [returns] * len(sizes), [method] * len(sizes), sizes, seeds)
+        )
+    return pd.DataFrame(np.vstack(chunks), columns=["total_return_pct", "max_drawdown_pct"])
+
+
+def distribution_report(samples: pd.DataFrame) -> pd.DataFrame:
+    """Mean, standard deviation and percentiles of every column in ``samples``."""
+    values = samples.astype(float)
+    report = pd.DataFrame({"mean": values.mean(), "std": values.std()})
+    for percentile in PERCENTILES:
+        report[f"p{percentile}"] = values.quantile(percentile / 100)
+    report.index.name = "metric"
+    return report
+
+
+def robustness_report(
+    df: pd.DataFrame,
+    parameter_sets: Sequence[Dict[str, float]],
+    in_sample_bars: int,
+    out_of_sample_bars: int,
+    strategies: Sequence[Optional[str]] = (None,),
+    simulations: int = 10000,
+    seed: Optional[int] = None,
+    **kwargs: Any,
+) -> pd.DataFrame:
+    """Walk-forward plus Monte Carlo distributions for each strategy.
+
+    Rows are indexed by ``(strategy, analysis, metric)``: the walk-forward
+    out-of-sample metrics across folds, then ``shuffle`` and ``bootstrap``
+    resamples of the combined out-of-sample trades. Extra keyword arguments
+    go to ``walk_forward``.
+    """
+    reports = {}
+    for strategy_name in strategies:
+        folds = walk_forward(
+            df, parameter_sets, in_sample_bars, out_of_sample_bars, strategy_name, **kwargs
+        )
+        name = strategy_name or config().strategy or "default"
+        reports[(name, "walk_forward")] = distribution_report(folds[FOLD_METRICS])
+        trades = [r for fold_returns in folds["trade_returns_pct"] for r in fold_returns]
+        for method in MONTE_CARLO_METHODS:
+            paths = monte_carlo(trades, simulations, method, seed, kwargs.get("workers"))
+            if not paths.empty:
+                reports[(name, method)] = distribution_report(paths)
+    return pd.concat(reports, names=["strategy", "analysis"])
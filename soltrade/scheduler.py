@@ -0,0 +1,67 @@
+from typing import Dict, Iterable, Optional
+
+from soltrade.clock import clock
+
+
+class BarScheduler:
+    """Wake the trading loop just after bars close, once per closed bar and mint.
+
+    ``intervals`` maps each mint to its bar length in seconds. A bar closing
+    at ``t`` becomes due at ``t + settle_seconds``, giving the candle source
+    time to publish it. Due bars stay due until ``complete`` records them,
+    so a pass that overruns the next close catches up on the following
+    wake instead of skipping a bar; only the latest closed bar is reported.
+    """
+
+    def __init__(self, intervals: Dict[str, int], settle_seconds: float = 0.0):
+        self.intervals = {mint: int(seconds) for mint, seconds in intervals.items()}
+        self.settle_seconds = float(settle_seconds)
+        self._evaluated: Dict[str, int] = {}
+        self._retry_at: Dict[str, float] = {}
+
+    def last_close(self, mint: str, now: Optional[float] = None) -> int:
+        """Close time of ``mint``'s latest bar that has closed and settled."""
+        now = clock().time() if now is None else now
+        step = self.intervals[mint]
+        return int((now - self.settle_seconds) // step * step)
+
+    def latest_closes(self, mints: Iterable[str], now: Optional[float] = None) -> Dict[str, int]:
+        return {mint: self.last_close(mint, now) for mint in mints}
+
+    def due(self, now: Optional[float] = None) -> Dict[str, int]:
+        """Mints with a settled bar not yet evaluated, mapped to that bar's close time."""
+        now = clock().time() if now is None else now
+        due = {}
+        for mint in self.intervals:
+            close = self.last_close(mint, now)
+            if close > self._evaluated.get(mint, -1) and now >= self._retry_at.get(mint, 0.0):
+                due[mint] = close
+        return due
+
+    def next_wake(self, now: Optional[float] = None) -> float:
+        """Clock time at which the next mint becomes due (``now`` if one already is)."""
+        now = clock().time() if now is None else now
+        wakes = []
+        for mint, step in self.intervals.items():
+            close = self.last_close(mint, now)
+            if close > self._evaluated.get(mint, -1):
+                wakes.append(max(now, self._retry_at.get(mint, now)))
+            else:
+                wakes.append(close + step + self.settle_seconds)
+        return min(wakes, default=now)
+
+    def wait(self) -> Dict[str, int]:
+        """Sleep until at least one mint is due and return the due mints."""
+        while True:
+            due = self.due()
+            if due:
+                return due
+            clock().sleep(max(0.0, self.next_wake() - clock().time()))
+
+    def complete(self, mint: str, close: int) -> None:
+        self._evaluated[mint] = max(close, self._evaluated.get(mint, -1))
+        self._retry_at.pop(mint, None)
+
+    def retry(self, mint: str, delay: float) -> None:
+        """Try ``mint``'s pending bar again after ``delay`` seconds rather than right away."""
+        self._retry_at[mint] = clock().time() + delay
@@ -0,0 +1,67 @@
+import asyncio
+import base64
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Sequence
+
+from solders.keypair import Keypair
+from solders.message import to_bytes_versioned
+from solders.pubkey import Pubkey
+from solders.transaction import VersionedTransaction
+
+from soltrade.config import config
+
+
+def sign_with(keypair: Keypair, transaction_b64: str) -> str:
+    """Sign a base64 Ultra order transaction and return it base64 encoded."""
+    raw_txn = VersionedTransaction.from_bytes(base64.b64decode(transaction_b64))
+    signature = keypair.sign_message(to_bytes_versioned(raw_txn.message))
+    signed_txn = VersionedTransaction.populate(raw_txn.message, [signature])
+    return base64.b64encode(bytes(signed_txn)).decode("utf-8")
+
+
+class Signer:
+    """Holds the wallet keypair in memory and signs Ultra order transactions.
+
+    A single signature takes tens of microseconds, less than a hop to
+    another thread, so ``sign`` runs inline. Batches go through
+    ``sign_many_async``, which signs on a worker thread so the shared event
+    loop keeps serving in-flight requests meanwhile.
+    """
+
+    def __init__(self, keypair: Keypair) -> None:
+        self.keypair = keypair
+        self.public_key: Pubkey = keypair.pubkey()
+        self.address = str(self.public_key)
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def sign(self, transaction_b64: str) -> str:
+        return sign_with(self.keypair, transaction_b64)
+
+    def sign_many(self, transactions_b64: Sequence[str]) -> List[str]:
+        return [sign_with(self.keypair, transaction_b64) for transaction_b64 in transactions_b64]
+
+    async def sign_many_async(self, transactions_b64: Sequence[str]) -> List[str]:
+        """``sign_many`` on the signer's worker thread."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="soltrade-signer")
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self.sign_many, list(transactions_b64))
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+_signer_instance: Optional[Signer] = None
+
+
+def signer() -> Signer:
+    """The wallet's signer, rebuilt only when the configured private key changes."""
+    global _signer_instance
+    keypair = config().keypair
+    if _signer_instance is None or _signer_instance.keypair is not keypair:
+        if _signer_instance is not None:
+            _signer_instance.close()
+        _signer_instance = Signer(keypair)
+    return _signer_instance
@@ -0,0 +1,212 @@
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from soltrade.async_runtime import runtime
+from soltrade.clock import clock
+from soltrade.execution import Order
+from soltrade.log import log_general, log_transaction
+from soltrade.metrics import metrics
+from soltrade.transactions import SwapOutcomeUnknown, create_order, perform_swap
+
+EXECUTION_MODES = ("immediate", "sliced")
+
+# Times a child is halved to bring its quoted price impact under the limit
+MAX_IMPACT_HALVINGS = 3
+
+
+def price_impact_pct(ultra_order: dict) -> float:
+    """Quoted price impact of an Ultra order in percent; 0 when not quoted."""
+    try:
+        return abs(float(ultra_order.get("priceImpactPct") or 0))
+    except (TypeError, ValueError):
+        return 0.0
+
+
+@dataclass
+class SlicePlan:
+    """A parent order worked as ``slices`` child swaps, one every ``interval`` seconds.
+
+    Each child trades an even share of what is left. With
+    ``max_impact_pct`` set, a child whose quote moves the price more than
+    that is halved before it is sent, leaving the rest to later children.
+    The last child is held to the same limit, so what it does not send is
+    left unfilled and settled as a partial fill. ``cancel`` stops the plan
+    before its next child, e.g. when the opposite signal fires. A child
+    whose outcome is unknown stops the plan too, as it may still land.
+    """
+
+    order: Order
+    slices: int
+    interval: float
+    max_impact_pct: float = 0.0
+    filled_input: float = 0.0
+    filled_output: float = 0.0
+    children: int = 0
+    outcome_unknown: bool = False
+    started_at: float = field(default_factory=time.perf_counter)
+    _cancelled: threading.Event = field(default_factory=threading.Event, repr=False)
+    _future: Optional["Future[None]"] = field(default=None, repr=False)
+
+    @property
+    def remaining(self) -> float:
+        return max(0.0, self.order.amount - self.filled_input)
+
+    @property
+    def flip_signal(self) -> str:
+        """The strategy column that cancels the plan: the exit for a buy, the entry for a sell."""
+        return "exit" if self.order.side == "buy" else "entry"
+
+    @property
+    def average_price(self) -> float:
+        """Primary mint paid or received per secondary token across every fill."""
+        if self.filled_input <= 0 or self.filled_output <= 0:
+            return 0.0
+        if self.order.side == "buy":
+            return self.filled_input / self.filled_output
+        return self.filled_output / self.filled_input
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    @property
+    def done(self) -> bool:
+        return self._future is not None and self._future.done()
+
+    def cancel(self) -> None:
+        self._cancelled.set()
+
+    async def _quote(self, amount: float) -> Tuple[float, Optional[dict]]:
+        """The child size to send and an order for it, when impact sizing quoted one."""
+        if self.max_impact_pct <= 0:
+            return amount, None
+        ultra_order: Optional[dict] = None
+        for halvings in range(MAX_IMPACT_HALVINGS + 1):
+            try:
+                ultra_order = await create_order(
+                    amount, self.order.input_mint, self.order.output_mint, self.order.symbol
+                )
+            except Exception as e:
+                log_general.warning(f"Quoting a slice of {self.order.symbol} failed: {e}")
+                return amount, None
+            if "errorCode" in ultra_order or price_impact_pct(ultra_order) <= self.max_impact_pct:
+                break
+            if halvings == MAX_IMPACT_HALVINGS:
+                # Send the smallest size quoted rather than one without a quote
+                break
+            amount /= 2
+        return amount, ultra_order
+
+    async def run(self) -> None:
+        order = self.order
+        try:
+            for child in range(self.slices):
+                if self.cancelled or self.remaining <= 1e-12:
+                    break
+                if child:
+                    await clock().sleep_async(self.interval)
+                    if self.cancelled:
+                        break
+                amount, ultra_order = await self._quote(self.remaining / (self.slices - child))
+                log_transaction.info(
+                    f"SolTrade is sending slice {child + 1}/{self.slices} of the {order.side} "
+                    f"for {order.symbol}: {amount} of {self.remaining}."
+                )
+                try:
+                    fill = await perform_swap(
+                        amount,
+                        order.input_mint,
+                        order.output_mint,
+                        order.input_symbol,
+                        order.output_symbol,
+                        ultra_order,
+                    )
+                except SwapOutcomeUnknown as e:
+                    # Re-sending its amount could fill it twice; balances tell later
+                    log_general.error(f"Stopping the sliced {order.side} for {order.symbol}: {e}")
+                    self.children += 1
+                    self.outcome_unknown = True
+                    self.cancel()
+                    break
+                except Exception as e:
+                    log_general.error(f"Slice of {order.symbol} failed: {e}")
+                    fill = None
+                self.children += 1
+                if fill is not None:
+                    if self.filled_input <= 0:
+                        metrics().observe(
+                            "signal_to_fill", time.perf_counter() - self.started_at, order.symbol
+                        )
+                    # Children are quoted at ``amount``; the executed input only differs by unit rounding
+                    self.filled_input += amount
+                    self.filled_output += fill.output_amount
+        finally:
+            metrics().observe("sliced_order", time.perf_counter() - self.started_at, order.symbol)
+
+    def start(self) -> None:
+        self._future = runtime().submit(self.run())
+
+    def wait(self, timeout: Optional[float] = None) -> None:
+        if self._future is not None:
+            self._future.result(timeout)
+
+
+class OrderSlicer:
+    """The sliced orders being worked in the background, at most one per mint.
+
+    Plans run on the shared event loop so the analysis loop never waits
+    for them; finished plans are handed back by ``finished`` for the
+    trading loop to record.
+    """
+
+    def __init__(self) -> None:
+        self._plans: Dict[str, SlicePlan] = {}
+        self._lock = threading.Lock()
+
+    def active(self, mint: str) -> Optional[SlicePlan]:
+        with self._lock:
+            return self._plans.get(mint)
+
+    def start(self, order: Order, slices: int, interval: float, max_impact_pct: float) -> SlicePlan:
+        plan = SlicePlan(order, max(1, int(slices)), float(interval), float(max_impact_pct))
+        with self._lock:
+            if order.mint in self._plans:
+                raise ValueError(f"A sliced order for {order.symbol} is already running")
+            self._plans[order.mint] = plan
+        plan.start()
+        return plan
+
+    def cancel_all(self, timeout: Optional[float] = None) -> None:
+        """Cancel every plan and wait up to ``timeout`` seconds for in-flight children."""
+        with self._lock:
+            plans = list(self._plans.values())
+        for plan in plans:
+            plan.cancel()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for plan in plans:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                plan.wait(remaining)
+            except Exception as e:
+                log_general.warning(f"Sliced order for {plan.order.symbol} did not stop cleanly: {e}")
+
+    def finished(self) -> List[SlicePlan]:
+        """Remove and return the plans that have sent their last child or were cancelled."""
+        with self._lock:
+            done = [plan for plan in self._plans.values() if plan.done]
+            for plan in done:
+                del self._plans[plan.order.mint]
+        return done
+
+
+_slicer_instance: Optional[OrderSlicer] = None
+
+
+def order_slicer() -> OrderSlicer:
+    global _slicer_instance
+    if _slicer_instance is None:
+        _slicer_instance = OrderSlicer()
+    return _slicer_instance
@@ -0,0 +1,567 @@
+import asyncio
+import base64
+import itertools
+import json
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Set, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+from solders.hash import Hash
+from solders.message import MessageV0, to_bytes_versioned
+from solders.pubkey import Pubkey
+from solders.signature import Signature
+from solders.system_program import TransferParams, transfer
+from solders.transaction import VersionedTransaction
+from websockets.asyncio.server import Server, ServerConnection, serve
+
+from soltrade.clock import clock
+from soltrade.history import resample
+from soltrade.wallet import TOKEN_PROGRAM_ID
+
+
+class StandInRpcWebsocket:
+    """Local stand-in for the Solana RPC websocket, for running streaming mode offline.
+
+    It answers ``accountSubscribe``/``programSubscribe`` with subscription ids
+    and lets the caller push ``accountNotification``/``programNotification``
+    messages to every matching subscriber.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0) -> None:
+        self.host = host
+        self.port = port
+        self._server: Optional[Server] = None
+        # subscription -> (connection, method, program for ``programSubscribe``)
+        self._subscriptions: Dict[int, Tuple[ServerConnection, str, Optional[str]]] = {}
+        self._ids = itertools.count(1)
+        self._slots = itertools.count(1)
+        self._subscribed = asyncio.Condition()
+
+    @property
+    def url(self) -> str:
+        return f"ws://{self.host}:{self.port}"
+
+    async def start(self) -> None:
+        self._server = await serve(self._handler, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        self._subscriptions.clear()
+
+    async def _handler(self, websocket: ServerConnection) -> None:
+        try:
+            async for raw in websocket:
+                request = json.loads(raw)
+                subscription = next(self._ids)
+                program = request["params"][0] if request["method"] == "programSubscribe" else None
+                self._subscriptions[subscription] = (websocket, request["method"], program)
+                await websocket.send(
+                    json.dumps({"jsonrpc": "2.0", "id": request["id"], "result": subscription})
+                )
+                async with self._subscribed:
+                    self._subscribed.notify_all()
+        finally:
+            for subscription, (connection, _, _) in list(self._subscriptions.items()):
+                if connection is websocket:
+                    del self._subscriptions[subscription]
+
+    async def wait_for_subscriptions(self, methods: Set[str], timeout: float = 5.0) -> None:
+        """Wait until a client has subscribed with every method in ``methods``."""
+
+        def subscribed() -> bool:
+            return methods <= {method for _, method, _ in self._subscriptions.values()}
+
+        async with self._subscribed:
+            await asyncio.wait_for(self._subscribed.wait_for(subscribed), timeout)
+
+    async def _notify(
+        self, method: str, value: Dict[str, Any], program: Optional[str] = None
+    ) -> None:
+        context = {"slot": next(self._slots)}
+        notification_method = method.replace("Subscribe", "Notification")
+        for subscription, (connection, subscribed_method, subscribed_program) in list(
+            self._subscriptions.items()
+        ):
+            if subscribed_method != method or subscribed_program != program:
+                continue
+            await connection.send(
+                json.dumps(
+                    {
+                        "jsonrpc": "2.0",
+                        "method": notification_method,
+                        "params": {
+                            "result": {"context": context, "value": value},
+                            "subscription": subscription,
+                        },
+                    }
+                )
+            )
+
+    async def push_lamports(self, lamports: int) -> None:
+        """Notify subscribers that the wallet's SOL balance changed."""
+        await self._notify(
+            "accountSubscribe",
+            {
+                "lamports": lamports,
+                "data": ["", "base64"],
+                "owner": "11111111111111111111111111111111",
+                "executable": False,
+                "rentEpoch": 0,
+                "space": 0,
+            },
+        )
+
+    async def push_token_account(
+        self,
+        pubkey: str,
+        mint: str,
+        ui_amount: float,
+        decimals: int = 6,
+        program_id: str = str(TOKEN_PROGRAM_ID),
+    ) -> None:
+        """Notify subscribers of ``program_id`` that a wallet token account's balance changed."""
+        await self._notify(
+            "programSubscribe",
+            {
+                "pubkey": pubkey,
+                "account": {
+                    "lamports": 2039280,
+                    "owner": program_id,
+                    "executable": False,
+                    "rentEpoch": 0,
+                    "space": 165,
+                    "data": {
+                        "program": "spl-token",
+                        "space": 165,
+                        "parsed": {
+                            "type": "account",
+                            "info": {
+                                "mint": mint,
+                                "tokenAmount": {
+                                    "amount": str(int(ui_amount * 10**decimals)),
+                                    "decimals": decimals,
+                                    "uiAmount": ui_amount,
+                                    "uiAmountString": str(ui_amount),
+                                },
+                            },
+                        },
+                    },
+                },
+            },
+            program_id,
+        )
+
+
+class StandInWallet:
+    """In-memory wallet whose balances the stand-in RPC reports and fills update."""
+
+    def __init__(
+        self,
+        owner: str,
+        balances: Dict[str, float],
+        decimals: Dict[str, int],
+        sol_mint: str,
+        token_programs: Optional[Dict[str, str]] = None,
+    ) -> None:
+        self.owner = owner
+        self.sol_mint = sol_mint
+        self.decimals = {sol_mint: 9, **decimals}
+        # Mints whose accounts are not owned by the classic token program, e.g. Token-2022
+        self.token_programs = dict(token_programs or {})
+        self._balances = dict(balances)
+        self._accounts: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def balance(self, mint: str) -> float:
+        with self._lock:
+            return self._balances.get(mint, 0.0)
+
+    def balances(self) -> Dict[str, float]:
+        with self._lock:
+            return dict(self._balances)
+
+    def token_program(self, mint: str) -> str:
+        return self.token_programs.get(mint, str(TOKEN_PROGRAM_ID))
+
+    def token_account(self, mint: str) -> str:
+        """Stable made-up address of the wallet's token account for ``mint``."""
+        with self._lock:
+            if mint not in self._accounts:
+                self._accounts[mint] = str(Pubkey.new_unique())
+            return self._accounts[mint]
+
+    def swap(self, input_mint: str, input_amount: float, output_mint: str, output_amount: float) -> bool:
+        """Move balances for a fill; ``False`` if the input balance is short."""
+        with self._lock:
+            available = self._balances.get(input_mint, 0.0)
+            # Allow for float rounding of amounts converted to smallest units
+            if input_amount > available * (1 + 1e-9):
+                return False
+            self._balances[input_mint] = max(0.0, available - input_amount)
+            self._balances[output_mint] = self._balances.get(output_mint, 0.0) + output_amount
+            return True
+
+
+# Slots a stand-in swap stays confirmed before it is reported finalized
+FINALIZED_AFTER_SLOTS = 2
+
+
+class StandInApiServer:
+    """Local stand-in for CryptoCompare, Jupiter Price v3, Jupiter Ultra and the Solana RPC.
+
+    Recorded 1-minute ``candles`` (keyed by symbol) are served as of
+    ``clock().time()``, so a virtual clock replays them at any speed. Prices
+    are the latest recorded close for each mint in ``mint_symbols``;
+    any other mint (the primary stablecoin) is priced at 1.0. Ultra orders fill
+    at that price less ``fee_bps`` against ``wallet``, after an optional
+    ``fill_latency`` in real seconds. ``rpc_calls`` counts RPC requests by
+    method.
+    """
+
+    def __init__(
+        self,
+        candles: Dict[str, np.ndarray],
+        mint_symbols: Dict[str, str],
+        wallet: StandInWallet,
+        fee_bps: float = 0.0,
+        fill_latency: float = 0.0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        self.candles = candles
+        self.mint_symbols = mint_symbols
+        self.wallet = wallet
+        self.fee_bps = fee_bps
+        self.fill_latency = fill_latency
+        self.host = host
+        self.port = port
+        self.fills: List[Dict[str, Any]] = []
+        self.rpc_calls: Counter = Counter()
+        self._landed: Dict[str, int] = {}
+        self._orders: Dict[str, Dict[str, Any]] = {}
+        self._order_ids = itertools.count(1)
+        self._slots = itertools.count(1)
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def candle_api(self) -> str:
+        return f"{self.base_url}/data/v2/histominute"
+
+    @property
+    def price_api(self) -> str:
+        return f"{self.base_url}/price/v3"
+
+    @property
+    def jup_api(self) -> str:
+        return f"{self.base_url}/ultra/v1"
+
+    @property
+    def rpc_https(self) -> str:
+        return f"{self.base_url}/rpc"
+
+    def start(self) -> None:
+        self._server = ThreadingHTTPServer((self.host, self.port), _StandInApiHandler)
+        self._server.daemon_threads = True
+        self._server.api = self  # type: ignore[attr-defined]
+        self.port = self._server.server_address[1]
+        threading.Thread(
+            target=self._server.serve_forever, name="soltrade-standin-api", daemon=True
+        ).start()
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def _recorded(self, symbol: str, to_ts: Optional[int] = None) -> np.ndarray:
+        """Recorded 1-minute bars of ``symbol`` that have opened by ``to_ts`` and the clock."""
+        records = self.candles[symbol]
+        now = int(clock().time())
+        end = now if to_ts is None else min(to_ts, now)
+        return records[: np.searchsorted(records["time"], end, side="right")]
+
+    def histominute(self, params: Dict[str, str]) -> Dict[str, Any]:
+        symbol = params.get("fsym", "")
+        if symbol not in self.candles:
+            return {"Response": "Error", "Message": f"No recorded candles for {symbol}"}
+        limit = int(params.get("limit", 1440))
+        aggregate = max(1, int(params.get("aggregate", 1)))
+        to_ts = int(params["toTs"]) if "toTs" in params else None
+        recorded = self._recorded(symbol, to_ts)
+        # One spare aggregate covers a partial bucket at the start of the slice
+        bars = resample(recorded[-(limit + 2) * aggregate :], aggregate)[-(limit + 1) :]
+        rows = [
+            {
+                "time": int(bar["time"]),
+                "open": float(bar["open"]),
+                "high": float(bar["high"]),
+                "low": float(bar["low"]),
+                "close": float(bar["close"]),
+                "volumefrom": float(bar["volume"]),
+            }
+            for bar in bars
+        ]
+        return {"Response": "Success", "Data": {"Data": rows}}
+
+    def price(self, mint: str) -> Optional[float]:
+        symbol = self.mint_symbols.get(mint)
+        if symbol is None:
+            return 1.0
+        recorded = self._recorded(symbol)
+        if len(recorded) == 0:
+            return None
+        return float(recorded["close"][-1])
+
+    def prices(self, params: Dict[str, str]) -> Dict[str, Any]:
+        response = {}
+        for mint in params.get("ids", "").split(","):
+            price = self.price(mint)
+            if mint and price is not None:
+                response[mint] = {"usdPrice": price}
+        return response
+
+    def order(self, params: Dict[str, str]) -> Dict[str, Any]:
+        input_mint, output_mint = params["inputMint"], params["outputMint"]
+        input_price, output_price = self.price(input_mint), self.price(output_mint)
+        if not input_price or not output_price:
+            return {"errorCode": 1, "errorMessage": "No price for this pair yet"}
+        in_units = int(params["amount"])
+        input_amount = in_units / 10 ** self.wallet.decimals.get(input_mint, 6)
+        output_amount = input_amount * input_price / output_price * (1 - self.fee_bps / 10000)
+        out_units = int(output_amount * 10 ** self.wallet.decimals.get(output_mint, 6))
+
+        # Zero-lamport self transfer: only the taker's signature matters here
+        taker = Pubkey.from_string(params["taker"])
+        message = MessageV0.try_compile(
+            taker,
+            [transfer(TransferParams(from_pubkey=taker, to_pubkey=taker, lamports=0))],
+            [],
+            Hash.default(),
+        )
+        transaction = VersionedTransaction.populate(message, [Signature.default()])
+        request_id = f"standin-{next(self._order_ids)}"
+        with self._lock:
+            self._orders[request_id] = {
+                "inputMint": input_mint,
+                "outputMint": output_mint,
+                "inUnits": in_units,
+                "outUnits": out_units,
+            }
+        return {
+            "requestId": request_id,
+            "inputMint": input_mint,
+            "outputMint": output_mint,
+            "inAmount": str(in_units),
+            "outAmount": str(out_units),
+            "slippageBps": int(params.get("slippageBps", 50)),
+            "swapType": "aggregator",
+            "transaction": base64.b64encode(bytes(transaction)).decode("utf-8"),
+        }
+
+    def execute(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        with self._lock:
+            order = self._orders.pop(body.get("requestId", ""), None)
+        if order is None:
+            return {"status": "Failed", "code": -1, "error": "Unknown or already executed requestId"}
+        transaction = VersionedTransaction.from_bytes(base64.b64decode(body["signedTransaction"]))
+        signature = transaction.signatures[0]
+        payer = transaction.message.account_keys[0]
+        if not signature.verify(payer, to_bytes_versioned(transaction.message)):
+            return {"status": "Failed", "code": -2, "error": "Invalid signature"}
+
+        if self.fill_latency > 0:
+            time.sleep(self.fill_latency)
+        decimals = self.wallet.decimals
+        filled = self.wallet.swap(
+            order["inputMint"],
+            order["inUnits"] / 10 ** decimals.get(order["inputMint"], 6),
+            order["outputMint"],
+            order["outUnits"] / 10 ** decimals.get(order["outputMint"], 6),
+        )
+        if not filled:
+            return {"status": "Failed", "code": -3, "error": "Insufficient funds"}
+        slot = next(self._slots)
+        with self._lock:
+            self.fills.append({"time": clock().time(), **order})
+            self._landed[str(signature)] = slot
+        return {
+            "status": "Success",
+            "code": 0,
+            "signature": str(signature),
+            "slot": str(slot),
+            "totalInputAmount": str(order["inUnits"]),
+            "totalOutputAmount": str(order["outUnits"]),
+            "inputAmountResult": str(order["inUnits"]),
+            "outputAmountResult": str(order["outUnits"]),
+        }
+
+    def rpc(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        method, params = request.get("method"), request.get("params", [])
+        slot = next(self._slots)
+        context = {"slot": slot}
+        with self._lock:
+            self.rpc_calls[method] += 1
+        if method == "getBalance":
+            result: Any = {
+                "context": context,
+                "value": int(self.wallet.balance(self.wallet.sol_mint) * 10**9),
+            }
+        elif method == "getTokenAccountsByOwner":
+            mint_filter = params[1].get("mint")
+            program_filter = params[1].get("programId")
+            mints = [
+                mint
+                for mint in self.wallet.balances()
+                if mint != self.wallet.sol_mint
+                and mint_filter in (None, mint)
+                and program_filter in (None, self.wallet.token_program(mint))
+            ]
+            result = {"context": context, "value": [self._token_account(mint) for mint in mints]}
+        elif method == "getAccountInfo":
+            result = {"context": context, "value": self._mint_account(params[0])}
+        elif method == "getSignatureStatuses":
+            result = {
+                "context": context,
+                "value": [self._signature_status(signature, slot) for signature in params[0]],
+            }
+        else:
+            return {
+                "jsonrpc": "2.0",
+                "id": request.get("id"),
+                "error": {"code": -32601, "message": f"Method not found: {method}"},
+            }
+        return {"jsonrpc": "2.0", "id": request.get("id"), "result": result}
+
+    def _signature_status(self, signature: str, slot: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            landed = self._landed.get(signature)
+        if landed is None:
+            return None
+        finalized = slot - landed >= FINALIZED_AFTER_SLOTS
+        return {
+            "slot": landed,
+            "confirmations": None if finalized else slot - landed,
+            "status": {"Ok": None},
+            "err": None,
+            "confirmationStatus": "finalized" if finalized else "confirmed",
+        }
+
+    def _token_account(self, mint: str) -> Dict[str, Any]:
+        decimals = self.wallet.decimals.get(mint, 6)
+        ui_amount = self.wallet.balance(mint)
+        return {
+            "pubkey": self.wallet.token_account(mint),
+            "account": {
+                "lamports": 2039280,
+                "owner": self.wallet.token_program(mint),
+                "executable": False,
+                "rentEpoch": 0,
+                "space": 165,
+                "data": {
+                    "program": "spl-token",
+                    "space": 165,
+                    "parsed": {
+                        "type": "account",
+                        "info": {
+                            "isNative": False,
+                            "mint": mint,
+                            "owner": self.wallet.owner,
+                            "state": "initialized",
+                            "tokenAmount": {
+                                "amount": str(int(ui_amount * 10**decimals)),
+                                "decimals": decimals,
+                                "uiAmount": ui_amount,
+                                "uiAmountString": str(ui_amount),
+                            },
+                        },
+                    },
+                },
+            },
+        }
+
+    def _mint_account(self, mint: str) -> Dict[str, Any]:
+        return {
+            "lamports": 1461600,
+            "owner": self.wallet.token_program(mint),
+            "executable": False,
+            "rentEpoch": 0,
+            "space": 82,
+            "data": {
+                "program": "spl-token",
+                "space": 82,
+                "parsed": {
+                    "type": "mint",
+                    "info": {
+                        "decimals": self.wallet.decimals.get(mint, 6),
+                        "freezeAuthority": None,
+                        "isInitialized": True,
+                        "mintAuthority": None,
+                        "supply": "0",
+                    },
+                },
+            },
+        }
+
+
+class _StandInApiHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    @property
+    def api(self) -> StandInApiServer:
+        return self.server.api  # type: ignore[attr-defined]
+
+    def _send_json(self, payload: Any, status: int = 200) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_HEAD(self) -> None:
+        # Connection warm-up pings
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        if url.path == "/data/v2/histominute":
+            self._send_json(self.api.histominute(params))
+        elif url.path == "/price/v3":
+            self._send_json(self.api.prices(params))
+        elif url.path == "/ultra/v1/order":
+            self._send_json(self.api.order(params))
+        else:
+            self._send_json({"error": "Not found"}, 404)
+
+    def do_POST(self) -> None:
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        path = urlsplit(self.path).path
+        if path == "/ultra/v1/execute":
+            self._send_json(self.api.execute(body))
+        elif path == "/rpc":
+            if isinstance(body, list):
+                self._send_json([self.api.rpc(request) for request in body])
+            else:
+                self._send_json(self.api.rpc(body))
+        else:
+            self._send_json({"error": "Not found"}, 404)
+
+    def log_message(self, format: str, *args) -> None:
+        pass
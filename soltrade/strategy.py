@@ -1,9 +1,17 @@
 import importlib
+import numbers
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
 import pandas as pd
 from soltrade.config import config
+from soltrade.indicators import StreamingIndicator
 from soltrade.log import log_general
+from soltrade.panel import CandlePanel
+from strategies.base_strategy import BaseStrategy
 
-strategy_instance = None
+# Attributes every strategy sets and the position helpers below read
+RISK_SETTINGS = ("stoploss", "takeprofit", "trailing_stoploss", "trailing_stoploss_target")
 
 
 def load_strategy_class(strategy_name):
@@ -12,18 +20,124 @@ def load_strategy_class(strategy_name):
     return strategy_class
 
 
-def strategy(df: pd.DataFrame):
-    global strategy_instance
-    strategy_name = config().strategy or "default"
+def validate_strategy(instance: BaseStrategy) -> None:
+    """Raise ``ValueError`` when ``instance`` cannot be traded with."""
+    name = type(instance).__name__
+    if not isinstance(instance, BaseStrategy):
+        raise ValueError(f"{name} must inherit from BaseStrategy")
+    if type(instance).apply_strategy is BaseStrategy.apply_strategy:
+        raise ValueError(f"{name} does not implement apply_strategy")
+    for setting in RISK_SETTINGS:
+        value = getattr(instance, setting, None)
+        if not isinstance(value, numbers.Real) or value < 0:
+            raise ValueError(f"{name}.{setting} must be a non-negative number, got {value!r}")
+    for key, indicator in instance.indicators().items():
+        if not isinstance(indicator, StreamingIndicator):
+            raise ValueError(f"{name} indicator {key!r} is not a StreamingIndicator")
+    if instance.lookback is not None and int(instance.lookback) < 1:
+        raise ValueError(f"{name}.lookback must be at least 1, got {instance.lookback!r}")
+
+
+class StrategyRegistry:
+    """A strategy class loaded and validated once, with one instance per mint.
+
+    Each mint's instance keeps its own streaming indicator state between
+    updates; ``template`` serves panel evaluation and mint-independent
+    settings.
+    """
+
+    def __init__(self, strategy_name: str):
+        self.name = strategy_name
+        try:
+            self.strategy_class = load_strategy_class(strategy_name)
+        except (ModuleNotFoundError, AttributeError) as e:
+            log_general.error(f"Strategy {strategy_name} not found: {e}")
+            raise
+        self.template = self.strategy_class(pd.DataFrame())
+        validate_strategy(self.template)
+        self.lookback = self.template.required_bars()
+        self._instances: Dict[str, BaseStrategy] = {}
+
+    def instance(self, mint: Optional[str] = None) -> BaseStrategy:
+        """The strategy instance for ``mint``, or the template without one."""
+        if mint is None:
+            return self.template
+        instance = self._instances.get(mint)
+        if instance is None:
+            instance = self._instances[mint] = self.strategy_class(pd.DataFrame())
+        return instance
+
+    def history_bars(self) -> int:
+        """Candles to fetch and hand the strategy each update.
+
+        ``candle_history_bars`` overrides the strategy's lookback but may not
+        cut into its indicators' warm-up.
+        """
+        configured = int(config().candle_history_bars or 0)
+        if not configured:
+            return self.lookback
+        warmup = self.template.warmup_bars()
+        if configured < warmup:
+            raise ValueError(
+                f"candle_history_bars is {configured}, but {self.strategy_class.__name__} "
+                f"needs at least {warmup} bars to warm up its indicators"
+            )
+        return configured
+
+
+_registries: Dict[str, StrategyRegistry] = {}
+
+
+def strategy_registry(strategy_name: Optional[str] = None) -> StrategyRegistry:
+    """Return the shared registry for ``strategy_name`` (default: the configured strategy)."""
+    strategy_name = strategy_name or config().strategy or "default"
+    if strategy_name not in _registries:
+        _registries[strategy_name] = StrategyRegistry(strategy_name)
+    return _registries[strategy_name]
+
+
+def history_bars() -> int:
+    return strategy_registry().history_bars()
+
+
+def strategy(df: pd.DataFrame, mint: Optional[str] = None):
+    """Apply the configured strategy to ``mint``'s candles.
+
+    Without a ``mint`` a fresh instance is used, so no indicator state is
+    carried over.
+    """
+    registry = strategy_registry()
+    if mint is None:
+        instance = registry.strategy_class(df)
+    else:
+        instance = registry.instance(mint)
+        instance.df = df
+    return instance.apply_strategy()
+
+
+def panel_strategy(panel: CandlePanel) -> Optional[Dict[str, np.ndarray]]:
+    """Evaluate the configured strategy on every mint of ``panel`` in one pass.
+
+    Returns ``None`` when the strategy has no panel form, in which case
+    callers fall back to ``strategy`` per mint.
+    """
     try:
-        StrategyClass = load_strategy_class(strategy_name)
-        strategy_instance = StrategyClass(df)
-        df = strategy_instance.apply_strategy()
-    except (ModuleNotFoundError, AttributeError) as e:
-        log_general.error(f"Strategy {strategy_name} not found: {e}")
-        raise
+        return strategy_registry().template.apply_panel(panel)
+    except NotImplementedError:
+        return None
 
-    return df
+
+def signal_proximity(
+    distance: float, mint: str, df: Optional[pd.DataFrame] = None
+) -> Tuple[bool, bool]:
+    """Ask ``mint``'s strategy whether an entry or exit is about to fire.
+
+    ``df`` points it at the mint's frame first, for strategies applied to a panel.
+    """
+    instance = strategy_registry().instance(mint)
+    if df is not None:
+        instance.df = df
+    return instance.near_signal(distance)
 
 
 def set_position(df, position):
@@ -37,45 +151,116 @@ def calc_entry_price(df):
     return df
 
 
-def calc_stoploss(df):
-    global strategy_instance
-    sl = float(strategy_instance.stoploss)
-    df["stoploss"] = df["close"].iat[-1] * (1 - (sl / 100))
+def stoploss_level(entry_price, stoploss):
+    return entry_price * (1 - (float(stoploss) / 100))
+
+
+def takeprofit_level(entry_price, takeprofit):
+    return entry_price * (1 + (float(takeprofit) / 100))
+
+
+def calc_stoploss(df, mint=None):
+    settings = strategy_registry().instance(mint)
+    df["stoploss"] = stoploss_level(df["close"].iat[-1], settings.stoploss)
     return df
 
 
-def calc_takeprofit(df):
-    global strategy_instance
-    tp = float(strategy_instance.takeprofit)
-    df["takeprofit"] = df["close"].iat[-1] * (1 + (tp / 100))
+def calc_takeprofit(df, mint=None):
+    settings = strategy_registry().instance(mint)
+    df["takeprofit"] = takeprofit_level(df["close"].iat[-1], settings.takeprofit)
     return df
 
 
-def calc_trailing_stoploss(df):
-    global strategy_instance
-    tsl = float(strategy_instance.trailing_stoploss)
-    tslt = float(strategy_instance.trailing_stoploss_target)
-
-    high_prices = df["high"]
-    trailing_stop = []
-    tracking_started = False
-    highest_price = df["high"].iat[0]
-
-    for price in high_prices:
-        if not tracking_started and price >= df["entry_price"].iat[0] * (
-            1 + tslt / 100
-        ):
-            tracking_started = True
-            highest_price = price
-        if tracking_started:
-            if price > highest_price:
-                highest_price = price
-            stop_price = highest_price * (1 - tsl / 100)
-            trailing_stop.append(stop_price)
-        else:
-            trailing_stop.append(None)
-
-    df["trailing_stoploss"] = trailing_stop
+def trailing_stoploss_levels(high, entry_price, trailing_stoploss, trailing_stoploss_target):
+    """Vectorized trailing stop levels for one or many price paths.
+
+    ``high`` is a 1-D array of highs or a 2-D array with one path per row.
+    ``entry_price``, ``trailing_stoploss`` and ``trailing_stoploss_target``
+    are scalars or per-row arrays. Tracking starts at the first high at or
+    above the activation price; after that the stop follows the running
+    maximum. Bars before activation are ``NaN``.
+    """
+    high = np.asarray(high, dtype=float)
+    is_1d = high.ndim == 1
+    paths = np.atleast_2d(high)
+
+    def per_row(value):
+        return np.reshape(np.asarray(value, dtype=float), (-1, 1))
+
+    activation = per_row(entry_price) * (1 + per_row(trailing_stoploss_target) / 100)
+    started = np.logical_or.accumulate(paths >= activation, axis=1)
+    highest = np.maximum.accumulate(np.where(started, paths, -np.inf), axis=1)
+    stops = np.where(started, highest * (1 - per_row(trailing_stoploss) / 100), np.nan)
+
+    return stops[0] if is_1d else stops
+
+
+def _highs_since(high, time, since):
+    """``high`` with the bars opening at or before unix time ``since`` masked out as NaN."""
+    if since is None:
+        return high
+    opened = np.asarray(time, dtype="datetime64[s]").astype(np.int64)
+    return np.where(opened > since, high, np.nan)
+
+
+def calc_trailing_stoploss(df, mint=None, since=None):
+    """Trailing stop levels of the position on ``df``.
+
+    Only bars opening after unix time ``since`` move the stop, so highs
+    from before the entry cannot trigger it; without ``since`` every bar does.
+    """
+    settings = strategy_registry().instance(mint)
+    tsl = float(settings.trailing_stoploss)
+    tslt = float(settings.trailing_stoploss_target)
+
+    high = _highs_since(df["high"].to_numpy(dtype=float), df["time"].to_numpy(), since)
+    df["trailing_stoploss"] = trailing_stoploss_levels(
+        high, df["entry_price"].iat[0], tsl, tslt
+    )
     df["trailing_stoploss_target"] = df["entry_price"] * (1 + tslt / 100)
 
     return df
+
+
+def position_panel_columns(
+    panel: CandlePanel,
+    mints: Sequence[str],
+    states: Sequence[Optional[Dict[str, Any]]],
+    since: Optional[Sequence[Optional[float]]] = None,
+) -> Dict[str, np.ndarray]:
+    """The open positions' levels as ``panel`` columns, like ``calc_trailing_stoploss`` per mint.
+
+    ``states`` are the journal's positions for ``mints``, one per panel row,
+    and ``since`` each row's ``calc_trailing_stoploss`` cut-off. Rows
+    without an open position are NaN so their exits never fire; with none
+    open at all the columns are left out, as on the per-mint frames.
+    """
+    held = [state is not None and bool(state["position"]) for state in states]
+    if not any(held):
+        return {}
+
+    def per_row(values):
+        return np.broadcast_to(np.reshape(values, (-1, 1)), panel.close.shape)
+
+    def level(column):
+        return np.array(
+            [float(state[column]) if open_ else np.nan for state, open_ in zip(states, held)]
+        )
+
+    settings = [strategy_registry().instance(mint) for mint in mints]
+    tsl = np.array([float(instance.trailing_stoploss) for instance in settings])
+    tslt = np.array([float(instance.trailing_stoploss_target) for instance in settings])
+    entry_price = level("entry_price")
+    high = panel.high
+    if since is not None:
+        cut_off = np.array([np.nan if value is None else value for value in since], dtype=float)
+        opened = panel.time.astype("datetime64[s]").astype(np.int64)
+        # Rows without a cut-off keep every bar; NaT padding is already NaN
+        high = np.where(np.isnan(cut_off)[:, None] | (opened > cut_off[:, None]), high, np.nan)
+    return {
+        "entry_price": per_row(entry_price),
+        "stoploss": per_row(level("stoploss")),
+        "takeprofit": per_row(level("takeprofit")),
+        "trailing_stoploss": trailing_stoploss_levels(high, entry_price, tsl, tslt),
+        "trailing_stoploss_target": per_row(entry_price * (1 + tslt / 100)),
+    }
@@ -0,0 +1,180 @@
+import asyncio
+import itertools
+import json
+import random
+import threading
+from typing import Any, Dict, Optional, Set, Tuple
+
+from websockets.asyncio.client import connect
+
+from soltrade.config import config
+from soltrade.log import log_general
+from soltrade.signer import signer
+from soltrade.wallet import TOKEN_2022_PROGRAM_ID, TOKEN_PROGRAM_ID, balance_cache, spendable_sol
+
+# SPL token account layout: mint (32 bytes) then owner (32 bytes), 165 bytes total
+TOKEN_ACCOUNT_SIZE = 165
+TOKEN_ACCOUNT_OWNER_OFFSET = 32
+
+
+def _token_account(value: Dict[str, Any]) -> Optional[Tuple[str, str, float]]:
+    """``(pubkey, mint, balance)`` from a token account notification; ``None`` if malformed."""
+    try:
+        info = value["account"]["data"]["parsed"]["info"]
+        return value["pubkey"], info["mint"], float(info["tokenAmount"]["uiAmount"] or 0)
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def websocket_url() -> str:
+    """Configured RPC websocket endpoint, derived from ``rpc_https`` when unset."""
+    if config().rpc_wss:
+        return config().rpc_wss
+    return config().rpc_https.replace("https://", "wss://", 1).replace("http://", "ws://", 1)
+
+
+class WalletStream:
+    """Keeps wallet balances current from RPC websocket subscriptions.
+
+    The wallet's own account (SOL lamports) is watched with
+    ``accountSubscribe`` and every SPL and Token-2022 account it owns with a
+    filtered ``programSubscribe`` per token program. Each notification
+    updates the shared balance cache and marks the affected mint as changed,
+    so the trading loop can wake up and re-evaluate only those mints;
+    ``held`` tells it how much of a mint the accounts seen so far hold.
+    Malformed notifications are logged and skipped.
+    """
+
+    def __init__(self, url: Optional[str] = None) -> None:
+        self.url = url or websocket_url()
+        self._changed: Set[str] = set()
+        self._changed_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._token_accounts: Dict[str, Tuple[str, float]] = {}
+        self._accounts_lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._ids = itertools.count(1)
+
+    def _subscribe_requests(self) -> Dict[int, Dict[str, Any]]:
+        owner = signer().address
+        requests = {
+            next(self._ids): {
+                "method": "accountSubscribe",
+                "params": [owner, {"encoding": "jsonParsed", "commitment": "confirmed"}],
+            },
+        }
+        for program_id, size_filters in (
+            (TOKEN_PROGRAM_ID, [{"dataSize": TOKEN_ACCOUNT_SIZE}]),
+            # Token-2022 accounts grow with their extensions, so only the owner is matched
+            (TOKEN_2022_PROGRAM_ID, []),
+        ):
+            requests[next(self._ids)] = {
+                "method": "programSubscribe",
+                "params": [
+                    str(program_id),
+                    {
+                        "encoding": "jsonParsed",
+                        "commitment": "confirmed",
+                        "filters": [
+                            *size_filters,
+                            {"memcmp": {"offset": TOKEN_ACCOUNT_OWNER_OFFSET, "bytes": owner}},
+                        ],
+                    },
+                ],
+            }
+        return requests
+
+    async def run(self) -> None:
+        """Connect, subscribe and process notifications, reconnecting with backoff."""
+        delay = 1.0
+        while True:
+            try:
+                async with connect(self.url) as websocket:
+                    for request_id, request in self._subscribe_requests().items():
+                        await websocket.send(
+                            json.dumps({"jsonrpc": "2.0", "id": request_id, **request})
+                        )
+                    delay = 1.0
+                    async for raw in websocket:
+                        try:
+                            message = json.loads(raw)
+                        except ValueError:
+                            log_general.warning(
+                                f"Skipping malformed wallet stream message: {raw!r:.200}"
+                            )
+                            continue
+                        self._handle_message(message)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                log_general.warning(f"Wallet stream disconnected: {e}; reconnecting in {delay:.0f}s")
+            # Anything may have changed while we were not listening
+            with self._accounts_lock:
+                self._token_accounts.clear()
+            balance_cache().invalidate()
+            self._mark_changed(config().primary_mint)
+            await asyncio.sleep(delay * random.uniform(0.5, 1.5))
+            delay = min(delay * 2, 60.0)
+
+    def _handle_message(self, message: Dict[str, Any]) -> None:
+        if not isinstance(message, dict):
+            return
+        if "error" in message:
+            log_general.error(f"Wallet stream subscription failed: {message['error']}")
+            return
+
+        method = message.get("method")
+        result = (message.get("params") or {}).get("result") or {}
+        value = result.get("value") or {}
+        if method == "accountNotification":
+            lamports = value.get("lamports")
+            if lamports is None:
+                log_general.warning(f"Skipping wallet notification without lamports: {message}")
+                return
+            balance_cache().set(config().sol_mint, spendable_sol(int(lamports)))
+            self._mark_changed(config().sol_mint)
+        elif method == "programNotification":
+            account = _token_account(value)
+            if account is None:
+                log_general.warning(f"Skipping unparsed token account notification: {message}")
+                return
+            pubkey, mint, amount = account
+            with self._accounts_lock:
+                previous = self._token_accounts.get(pubkey)
+                self._token_accounts[pubkey] = (mint, amount)
+            if previous is None:
+                # First sighting of this account; its old balance is unknown
+                balance_cache().invalidate(mint)
+            else:
+                balance_cache().adjust(mint, amount - previous[1])
+            self._mark_changed(mint)
+
+    def held(self, mint: str) -> Optional[float]:
+        """Amount of ``mint`` in the token accounts notified since connecting, ``None`` if none."""
+        with self._accounts_lock:
+            amounts = [
+                amount for held_mint, amount in self._token_accounts.values() if held_mint == mint
+            ]
+        return sum(amounts) if amounts else None
+
+    def _mark_changed(self, mint: str) -> None:
+        with self._changed_lock:
+            self._changed.add(mint)
+        self._wake.set()
+
+    def wait_for_changes(self, timeout: Optional[float]) -> Set[str]:
+        """Block until a balance changes or ``timeout`` passes; returns changed mints."""
+        self._wake.wait(timeout)
+        with self._changed_lock:
+            changed, self._changed = self._changed, set()
+            self._wake.clear()
+        return changed
+
+    async def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
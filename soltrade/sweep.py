@@ -0,0 +1,242 @@
+import hashlib
+import itertools
+import json
+import os
+import sqlite3
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from soltrade.backtest import run_backtest
+from soltrade.candles import CANDLE_DTYPE, frame_records, records_frame
+from soltrade.config import config
+
+# Strategy attributes the default sweep space covers
+SWEEP_PARAMETERS = ("stoploss", "takeprofit", "trailing_stoploss", "trailing_stoploss_target")
+
+# Results are written to the cache in batches of this many configurations
+_CACHE_BATCH = 500
+
+# ``(start, end, warmup_bars)``: run on bars ``start:end``, the first
+# ``warmup_bars`` of which only prime the indicators
+Window = Tuple[int, int, int]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sweep_results (
+    data_hash TEXT NOT NULL,
+    run_key TEXT NOT NULL,
+    summary TEXT NOT NULL,
+    PRIMARY KEY (data_hash, run_key)
+);
+"""
+
+
+def parameter_grid(space: Dict[str, Sequence[float]]) -> List[Dict[str, float]]:
+    """Every combination of the values listed per parameter."""
+    names = list(space)
+    return [dict(zip(names, values)) for values in itertools.product(*space.values())]
+
+
+def random_parameters(
+    space: Dict[str, Tuple[float, float]], samples: int, seed: Optional[int] = None
+) -> List[Dict[str, float]]:
+    """``samples`` configurations drawn uniformly from each parameter's ``(low, high)`` range."""
+    rng = np.random.default_rng(seed)
+    draws = {name: rng.uniform(low, high, samples).round(2) for name, (low, high) in space.items()}
+    return [{name: float(draws[name][i]) for name in space} for i in range(samples)]
+
+
+def pool_size(workers: Optional[int] = None) -> int:
+    return workers or os.cpu_count() or 1
+
+
+def chunksize(tasks: int, workers: int) -> int:
+    """Tasks per pickled batch: a few batches per worker keeps the load balanced."""
+    return max(1, tasks // (workers * 8))
+
+
+def data_hash(records: np.ndarray) -> str:
+    return hashlib.blake2b(np.ascontiguousarray(records).tobytes(), digest_size=16).hexdigest()
+
+
+class SweepCache:
+    """SQLite store of sweep results keyed by (data hash, strategy, settings and params)."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def get_many(self, data_hash: str, run_keys: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        found: Dict[str, Dict[str, Any]] = {}
+        keys = list(run_keys)
+        with self._lock:
+            # Stay under SQLite's bound-parameter limit
+            for start in range(0, len(keys), 500):
+                chunk = keys[start : start + 500]
+                rows = self._conn.execute(
+                    f"SELECT run_key, summary FROM sweep_results WHERE data_hash = ? "
+                    f"AND run_key IN ({','.join('?' * len(chunk))})",
+                    (data_hash, *chunk),
+                ).fetchall()
+                found.update({run_key: json.loads(summary) for run_key, summary in rows})
+        return found
+
+    def put_many(self, data_hash: str, results: Dict[str, Dict[str, Any]]) -> None:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO sweep_results (data_hash, run_key, summary) VALUES (?, ?, ?)",
+                    [(data_hash, key, json.dumps(summary)) for key, summary in results.items()],
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+# Per-worker state, set up once by ``_init_worker``
+_worker_frame: Optional[pd.DataFrame] = None
+_worker_settings: Dict[str, Any] = {}
+_worker_window: Optional[Window] = None
+_worker_indicator_cache: Dict[Any, Dict[str, np.ndarray]] = {}
+
+
+def _init_worker(shm_name: str, length: int, settings: Dict[str, Any]) -> None:
+    global _worker_frame, _worker_settings
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        records = np.ndarray((length,), dtype=CANDLE_DTYPE, buffer=shm.buf)
+        _worker_frame = records_frame(records)
+        del records
+    finally:
+        shm.close()
+    _worker_settings = settings
+
+
+def _evaluate(
+    params: Dict[str, float], window: Optional[Window] = None, trade_returns: bool = False
+) -> Dict[str, Any]:
+    global _worker_window
+    if window != _worker_window:
+        # Indicator outputs are only valid for the bars they were computed on
+        _worker_indicator_cache.clear()
+        _worker_window = window
+    frame = _worker_frame
+    warmup_bars = 0
+    if window is not None:
+        frame = frame.iloc[window[0] : window[1]]
+        warmup_bars = window[2]
+    result = run_backtest(
+        frame,
+        params=params,
+        indicator_cache=_worker_indicator_cache,
+        warmup_bars=warmup_bars,
+        **_worker_settings,
+    )
+    summary = result.summary()
+    if trade_returns:
+        summary["trade_returns_pct"] = result.trades["return_pct"].tolist()
+    return summary
+
+
+@contextmanager
+def candle_pool(
+    records: np.ndarray, settings: Dict[str, Any], workers: Optional[int] = None
+) -> Iterator[ProcessPoolExecutor]:
+    """Process pool whose workers read ``records`` from shared memory.
+
+    ``settings`` are the ``run_backtest`` keyword arguments every task
+    shares. Submit ``_evaluate`` with a parameter set, optionally a
+    ``(start, end, warmup_bars)`` bar window and whether to also return
+    each trade's return.
+    """
+    shm = shared_memory.SharedMemory(create=True, size=max(records.nbytes, 1))
+    try:
+        np.ndarray(records.shape, dtype=CANDLE_DTYPE, buffer=shm.buf)[:] = records
+        with ProcessPoolExecutor(
+            max_workers=pool_size(workers),
+            initializer=_init_worker,
+            initargs=(shm.name, len(records), settings),
+        ) as pool:
+            yield pool
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def backtest_settings(
+    strategy_name: Optional[str], initial_balance: float, fee_pct: float, slippage_pct: float
+) -> Dict[str, Any]:
+    return {
+        "strategy_name": strategy_name or config().strategy or "default",
+        "initial_balance": initial_balance,
+        "fee_pct": fee_pct,
+        "slippage_pct": slippage_pct,
+    }
+
+
+def run_sweep(
+    df: pd.DataFrame,
+    parameter_sets: Sequence[Dict[str, float]],
+    strategy_name: Optional[str] = None,
+    workers: Optional[int] = None,
+    initial_balance: float = 1000.0,
+    fee_pct: float = 0.1,
+    slippage_pct: float = 0.05,
+    cache_path: Optional[str] = os.path.join("data", "sweeps.db"),
+) -> pd.DataFrame:
+    """Backtest every parameter set on a process pool; best total return first.
+
+    The candles are copied into shared memory once and every worker maps
+    them from there, so tasks only carry their parameters. Workers reuse
+    indicator outputs across configurations, and finished configurations
+    are cached on disk under the candles' hash so repeated sweeps only run
+    what is new. Pass ``cache_path=None`` to disable the result cache.
+    """
+    records = frame_records(df.sort_values("time"))
+    settings = backtest_settings(strategy_name, initial_balance, fee_pct, slippage_pct)
+    digest = data_hash(records)
+    run_keys = [json.dumps({**settings, "params": params}, sort_keys=True) for params in parameter_sets]
+
+    cache = SweepCache(cache_path) if cache_path else None
+    results = cache.get_many(digest, run_keys) if cache is not None else {}
+    pending = [(key, params) for key, params in zip(run_keys, parameter_sets) if key not in results]
+
+    if pending:
+        with candle_pool(records, settings, workers) as pool:
+            summaries = pool.map(
+                _evaluate,
+                [params for _, params in pending],
+                chunksize=chunksize(len(pending), pool_size(workers)),
+            )
+            batch: Dict[str, Dict[str, Any]] = {}
+            for (key, _), summary in zip(pending, summaries):
+                results[key] = batch[key] = summary
+                if cache is not None and len(batch) >= _CACHE_BATCH:
+                    cache.put_many(digest, batch)
+                    batch = {}
+            if cache is not None and batch:
+                cache.put_many(digest, batch)
+
+    if cache is not None:
+        cache.close()
+
+    rows = [{**params, **results[key]} for key, params in zip(run_keys, parameter_sets)]
+    report = pd.DataFrame(rows)
+    if report.empty:
+        return report
+    return report.sort_values("total_return_pct", ascending=False, ignore_index=True)
@@ -1,63 +1,86 @@
-import asyncio
-import os
+import numpy as np
 import pandas as pd
 import requests
 import time
 from datetime import datetime
-from typing import Any, Dict, List, Optional, cast
-from rich.console import Console, Group, RenderableType
-from rich.table import Table
+from typing import Any, Dict, List, Optional, Set, Tuple, cast
+from rich.console import Console
 from rich.panel import Panel
-from rich.live import Live
-from rich.text import Text
-from rich import box
 
+from soltrade.async_runtime import runtime
+from soltrade.clock import clock
+from soltrade.candles import records_frame
 from soltrade.config import config
+from soltrade.dashboard import DashboardRenderer, DashboardSnapshot, format_as_money, market_rows
+from soltrade.execution import ALLOCATION_POLICIES, Order, allocate, submit_orders
+from soltrade.http_client import close_clients, start_keep_warm
+from soltrade.journal import POSITION_COLUMNS, journal
 from soltrade.log import log_general, log_transaction, silence_console_logging
+from soltrade.market_data import load_all_candles, parse_prices
+from soltrade.metrics import metrics, serve_metrics
+from soltrade.panel import records_panel
+from soltrade.prefetch import order_prefetcher
+from soltrade.resilience import endpoint
+from soltrade.scheduler import BarScheduler
+from soltrade.slicing import EXECUTION_MODES, order_slicer
+from soltrade.streaming import WalletStream
 from soltrade.strategy import (
     strategy,
     calc_stoploss,
     calc_trailing_stoploss,
     calc_entry_price,
     calc_takeprofit,
+    panel_strategy,
+    position_panel_columns,
     set_position,
+    signal_proximity,
+    stoploss_level,
+    strategy_registry,
+    takeprofit_level,
 )
-from soltrade.transactions import perform_swap
-from soltrade.wallet import find_balance
+from soltrade.wallet import balance_cache
 
 config_instance = config()
 primary_mint: str = config_instance.primary_mint
 primary_mint_symbol: str = config_instance.primary_mint_symbol
 secondary_mints: List[str] = config_instance.secondary_mints
 secondary_mint_symbols: List[str] = config_instance.secondary_mint_symbols
-api_key: str = config_instance.api_key
-trading_interval_minutes: int = config_instance.trading_interval_minutes
 price_update_seconds: int = config_instance.price_update_seconds
 
 if not primary_mint or not primary_mint_symbol:
     raise ValueError("Primary mint configuration is missing.")
 if not secondary_mints or not secondary_mint_symbols:
     raise ValueError("At least one secondary mint must be configured.")
+if config_instance.allocation_policy not in ALLOCATION_POLICIES:
+    raise ValueError(
+        f"allocation_policy must be one of {', '.join(ALLOCATION_POLICIES)}, "
+        f"got {config_instance.allocation_policy!r}."
+    )
+if config_instance.execution_mode not in EXECUTION_MODES:
+    raise ValueError(
+        f"execution_mode must be one of {', '.join(EXECUTION_MODES)}, "
+        f"got {config_instance.execution_mode!r}."
+    )
 
-_http_session = requests.Session()
-
-
-class BalanceCache:
-    """Lazy balance fetcher that caches until explicitly invalidated."""
-
-    def __init__(self) -> None:
-        self._cache: Dict[str, float] = {}
+# Load and validate the strategy up front rather than on the first update
+_strategy_registry = strategy_registry()
+log_general.info(
+    f"Trading with {_strategy_registry.strategy_class.__name__} on "
+    f"{_strategy_registry.history_bars()} bars of history."
+)
 
-    def get(self, mint: str) -> float:
-        if mint not in self._cache:
-            self._cache[mint] = find_balance(mint)
-        return self._cache[mint]
+bar_scheduler = BarScheduler(
+    {
+        mint: config_instance.interval_minutes(symbol) * 60
+        for mint, symbol in zip(secondary_mints, secondary_mint_symbols)
+    },
+    float(config_instance.bar_settle_seconds),
+)
 
-    def invalidate(self, mint: str) -> None:
-        self._cache.pop(mint, None)
+_http_session = requests.Session()
 
 
-_balance_cache = BalanceCache()
+_balance_cache = balance_cache()
 
 
 def fetch_prices(mints: List[str]) -> Dict[str, float]:
@@ -67,12 +90,13 @@ def fetch_prices(mints: List[str]) -> Dict[str, float]:
 
     unique_mints = list(dict.fromkeys(mints))  # preserve order
     params = {"ids": ",".join(unique_mints)}
-    url = "https://lite-api.jup.ag/price/v3"
-
     try:
-        response = _http_session.get(url, params=params, timeout=10)
-        response.raise_for_status()
-        response_json = cast(Dict[str, Any], response.json())
+        def request() -> requests.Response:
+            response = _http_session.get(config().price_api, params=params, timeout=10)
+            response.raise_for_status()
+            return response
+
+        response_json = cast(Dict[str, Any], endpoint("price").call_sync(request).json())
     except requests.exceptions.HTTPError as e:
         if e.response is not None and e.response.status_code == 401:
             log_general.error(
@@ -85,108 +109,208 @@ def fetch_prices(mints: List[str]) -> Dict[str, float]:
         log_general.error(f"Failed to fetch prices for {unique_mints}: {e}")
         return {mint: 0.0 for mint in unique_mints}
 
-    prices: dict[str, float] = {}
-    for mint in unique_mints:
-        mint_data = cast(Dict[str, Any], response_json.get(mint, {}) or {})
-        price = float(mint_data.get("usdPrice") or 0)
-        if price == 0:
-            log_general.debug(f"Price for {mint} missing from response; defaulting to 0")
-        prices[mint] = price
-    return prices
+    return parse_prices(response_json, unique_mints)
 
 
-initial_primary_balance = find_balance(primary_mint)
-initial_secondary_balances = [find_balance(mint) for mint in secondary_mints]
+for secondary_mint, secondary_mint_symbol in zip(secondary_mints, secondary_mint_symbols):
+    journal().import_csv_position(
+        secondary_mint, secondary_mint_symbol, f"data/{secondary_mint_symbol}_data.csv"
+    )
+
+initial_balances = _balance_cache.snapshot()
+initial_primary_balance = initial_balances.get(primary_mint, 0.0)
+initial_secondary_balances = [initial_balances.get(mint, 0.0) for mint in secondary_mints]
 initial_price_map = fetch_prices([primary_mint, *secondary_mints])
 initial_primary_price = initial_price_map.get(primary_mint, 0.0)
 initial_secondary_prices = [initial_price_map.get(mint, 0.0) for mint in secondary_mints]
 
 console = Console()
-live_display: Optional[Live] = None
-
-
-def fetch_candlestick(primary_mint_symbol: str, secondary_mint_symbol: str) -> Dict[str, Any]:
-    """Fetch candlestick data from CryptoCompare API."""
-    url = "https://min-api.cryptocompare.com/data/v2/histominute"
-    headers = {"authorization": api_key}
-    params: Dict[str, str | int] = {
-        "tsym": primary_mint_symbol,
-        "fsym": secondary_mint_symbol,
-        "limit": 50,
-        "aggregate": trading_interval_minutes,
-    }
-    try:
-        response = _http_session.get(url, headers=headers, params=params, timeout=10)
-        response.raise_for_status()
-        response_json = cast(Dict[str, Any], response.json())
-        if response_json.get("Response") == "Error":
-            log_general.error(response_json.get("Message"))
-            exit()
-        return response_json
-    except Exception as e:
-        log_general.error(f"Failed to fetch candlestick data: {e}")
-        exit()
-
-
-def format_as_money(value: float) -> str:
-    return "${:,.2f}".format(value)
-
+dashboard: Optional[DashboardRenderer] = None
+_latest_rows: Dict[str, Dict[str, Any]] = {}
+
+
+def _publish(snapshot: DashboardSnapshot) -> None:
+    if dashboard is not None:
+        dashboard.publish(snapshot)
+
+
+def _with_position(
+    df: pd.DataFrame, secondary_mint_symbol: str, position_state: Optional[Dict[str, Any]]
+) -> pd.DataFrame:
+    df["total_profit"] = 0
+    df["mint"] = secondary_mint_symbol
+    df["position"] = False
+    if position_state is not None and position_state["position"]:
+        for col in POSITION_COLUMNS:
+            df[col] = position_state[col]
+    return df
+
+
+def _held_since(mint: str, symbol: str) -> Optional[float]:
+    """``calc_trailing_stoploss`` cut-off for ``mint``: only bars closing after its buy filled count."""
+    filled_at = journal().entry_time(mint)
+    if filled_at is None:
+        return None
+    return filled_at - config().interval_minutes(symbol) * 60
+
+
+def _analyse_each(
+    selected: List[Tuple[str, str]], candle_frames: Dict[str, Optional[pd.DataFrame]]
+) -> List[Tuple[pd.DataFrame, str, str]]:
+    """Run the strategy on each mint's frame in turn.
+
+    An open position's levels are on the frame before the strategy runs,
+    so its stoploss, takeprofit and trailing stop exits fire as in the
+    backtest.
+    """
+    analysed = []
+    for secondary_mint, secondary_mint_symbol in selected:
+        new_df = candle_frames.get(secondary_mint_symbol)
+        if new_df is None or new_df.empty:
+            continue
+        position_state = journal().latest_position(secondary_mint)
+        df = _with_position(new_df, secondary_mint_symbol, position_state)
+        if df["position"].iat[-1]:
+            df = calc_trailing_stoploss(
+                df, secondary_mint, _held_since(secondary_mint, secondary_mint_symbol)
+            )
+        with metrics().span("strategy", secondary_mint_symbol):
+            df = strategy(df, secondary_mint)
+        near_entry, near_exit = signal_proximity(
+            float(config().prefetch_distance), secondary_mint
+        )
 
-def _render_dashboard(wallet_panel: Panel, market_table: Table, countdown_text: str) -> Group:
-    """Combine dashboard sections into a single Live-friendly renderable."""
-    countdown = Text(countdown_text, style="dim")
-    return Group(wallet_panel, Text(""), market_table, Text(""), countdown)
+        analysed.append((df, secondary_mint, secondary_mint_symbol))
+        _latest_rows[secondary_mint] = df.iloc[-1].to_dict()
+        if config().prefetch_enabled:
+            prefetch_order(df, secondary_mint, secondary_mint_symbol, near_entry, near_exit)
+    return analysed
+
+
+def _analyse_panel(
+    selected: List[Tuple[str, str]], candle_records: Dict[str, Optional[np.ndarray]]
+) -> List[Tuple[pd.DataFrame, str, str]]:
+    """Run the strategy once over a (mints x bars) panel of every mint's candle records.
+
+    Per-mint DataFrames are only built for mints whose entry or exit fired
+    (or for the prefetcher). Strategies without a panel form run per mint.
+    """
+    available = [
+        (mint, symbol)
+        for mint, symbol in selected
+        if candle_records.get(symbol) is not None and len(candle_records[symbol])
+    ]
+    if not available:
+        return []
+    panel = records_panel(
+        [candle_records[symbol] for _, symbol in available], [symbol for _, symbol in available]
+    )
+    position_states = [journal().latest_position(mint) for mint, _ in available]
+    panel.columns = position_panel_columns(
+        panel,
+        [mint for mint, _ in available],
+        position_states,
+        [
+            _held_since(mint, symbol) if state is not None and state["position"] else None
+            for (mint, symbol), state in zip(available, position_states)
+        ],
+    )
+    with metrics().span("strategy", "panel"):
+        outputs = panel_strategy(panel)
+    if outputs is None:
+        return _analyse_each(
+            available,
+            {symbol: records_frame(candle_records[symbol]) for _, symbol in available},
+        )
 
+    analysed = []
+    for row, ((secondary_mint, secondary_mint_symbol), position_state, last) in enumerate(
+        zip(available, position_states, panel.last_rows(outputs))
+    ):
+        in_position = position_state is not None and position_state["position"]
+        last.update(total_profit=0, mint=secondary_mint_symbol, position=False)
+        if in_position:
+            last.update(position_state)
+        _latest_rows[secondary_mint] = last
+
+        fired = last.get(_watched_signal(secondary_mint, in_position)) == 1
+        if fired or config().prefetch_enabled:
+            df = _with_position(panel.frame(row, outputs), secondary_mint_symbol, position_state)
+            if fired:
+                analysed.append((df, secondary_mint, secondary_mint_symbol))
+            if config().prefetch_enabled:
+                near_entry, near_exit = signal_proximity(
+                    float(config().prefetch_distance), secondary_mint, df
+                )
+                prefetch_order(df, secondary_mint, secondary_mint_symbol, near_entry, near_exit)
+    return analysed
+
+
+def _watched_signal(mint: str, in_position: bool) -> str:
+    """The signal column that acts on ``mint``: the one cancelling its sliced order, if any."""
+    plan = order_slicer().active(mint)
+    if plan is not None:
+        return plan.flip_signal
+    return "exit" if in_position else "entry"
+
+
+def perform_analysis(
+    closes: Optional[Dict[str, int]] = None, new_bars: bool = True
+) -> Set[str]:
+    """Run one analysis pass over the mints in ``closes`` and return those evaluated.
+
+    ``closes`` maps mints to the close time of the bar to evaluate them on;
+    the bar still forming is left out. By default every secondary mint is
+    evaluated on its latest closed bar. ``new_bars`` records the lag between
+    each bar's close and its evaluation; passes triggered by something
+    other than a bar close turn it off.
+    """
+    cycle_started = time.perf_counter()
+    settle_sliced_orders()
+    if closes is None:
+        closes = bar_scheduler.latest_closes(secondary_mints)
+    selected = [
+        (mint, symbol)
+        for mint, symbol in zip(secondary_mints, secondary_mint_symbols)
+        if mint in closes
+    ]
+    with metrics().span("fetch_prices"):
+        price_map = fetch_prices([primary_mint, *secondary_mints])
+    panel_mode = bool(config().panel_mode)
+    candles = runtime().run(
+        load_all_candles(
+            primary_mint_symbol,
+            [symbol for _, symbol in selected],
+            panel_mode,
+            {symbol: closes[mint] for mint, symbol in selected},
+        )
+    )
 
-def _update_live(renderable: RenderableType) -> None:
-    """Safely update the Live display or fall back to standard printing."""
-    if live_display and live_display.is_started:
-        live_display.update(renderable)
+    if panel_mode:
+        analysed = _analyse_panel(selected, candles)
     else:
-        console.print(renderable)
-
+        analysed = _analyse_each(selected, candles)
 
-def perform_analysis() -> None:
-    data_frames: List[pd.DataFrame] = []
-    price_map = fetch_prices([primary_mint, *secondary_mints])
-
-    for secondary_mint, secondary_mint_symbol in zip(
-        secondary_mints, secondary_mint_symbols
-    ):
-        candle_json = fetch_candlestick(primary_mint_symbol, secondary_mint_symbol)
-        candle_dict = candle_json["Data"]["Data"]
-        columns = ["close", "high", "low", "open", "time"]
-        new_df = pd.DataFrame(candle_dict, columns=columns)
-        new_df["time"] = pd.to_datetime(new_df["time"], unit="s")
-        new_df = strategy(new_df)
-        new_df["total_profit"] = 0
-        new_df["mint"] = secondary_mint_symbol
-        new_df["position"] = False
-        data_file_path = f"data/{secondary_mint_symbol}_data.csv"
-
-        try:
-            existing_df = read_dataframe_from_csv(data_file_path)
-            if existing_df["position"].iat[-1]:
-                columns_to_merge = [
-                    "position",
-                    "entry_price",
-                    "takeprofit",
-                    "stoploss",
-                    "trailing_stoploss",
-                    "trailing_stoploss_target",
-                ]
-
-                for col in columns_to_merge:
-                    new_df[col] = existing_df.iloc[-1][col]
-
-            df = new_df
-        except FileNotFoundError:
-            df = new_df
-
-        data_frames.append(df)
-
-    combined_df: pd.DataFrame = pd.concat(data_frames, axis=0)
-    combined_df.drop_duplicates(subset=["time", "mint"], keep="last", inplace=True)
+    evaluated = {
+        mint
+        for mint, symbol in selected
+        if candles.get(symbol) is not None and len(candles[symbol])
+    }
+    if new_bars:
+        evaluated_at = clock().time()
+        for mint, symbol in selected:
+            if mint in evaluated:
+                metrics().observe("bar_close_lag", evaluated_at - closes[mint], symbol)
+
+    if not _latest_rows:
+        log_general.warning("No candle data available this cycle; skipping analysis.")
+        return evaluated
+
+    dashboard_started = time.perf_counter()
+    # Mints skipped this pass keep showing their last evaluated row
+    mint_names, market = market_rows(
+        [_latest_rows[mint] for mint in secondary_mints if mint in _latest_rows]
+    )
 
     current_primary_balance = _balance_cache.get(primary_mint)
     current_secondary_balances = [_balance_cache.get(mint) for mint in secondary_mints]
@@ -207,219 +331,349 @@ def perform_analysis() -> None:
     profit_color = "green" if total_profit >= 0 else "red"
     profit_symbol = "📈" if total_profit >= 0 else "📉"
     
-    wallet_info = Table.grid(padding=(0, 2))
-    wallet_info.add_column(style="bold cyan", justify="right", no_wrap=True)
-    wallet_info.add_column(style="white", no_wrap=True)
-    
-    wallet_info.add_row("💰 Primary Balance:", f"{current_primary_balance:.4f} {primary_mint_symbol}")
-    wallet_info.add_row("📌 Reserved for Fees:", f"0.02 {primary_mint_symbol}")
-    wallet_info.add_row("💵 Portfolio Value:", format_as_money(current_total_value))
-    wallet_info.add_row(f"{profit_symbol} Total Profit:", f"[{profit_color}]{format_as_money(total_profit)}[/{profit_color}]")
+    wallet = (
+        ("💰 Primary Balance:", f"{current_primary_balance:.4f} {primary_mint_symbol}"),
+        ("📌 Reserved for Fees:", f"0.02 {primary_mint_symbol}"),
+        ("💵 Portfolio Value:", format_as_money(current_total_value)),
+        (f"{profit_symbol} Total Profit:", f"[{profit_color}]{format_as_money(total_profit)}[/{profit_color}]"),
+    )
     
-    last_rows = combined_df.groupby("mint").tail(1)
-
-    pivot_columns = [
-        "close",
-        "ema_s",
-        "ema_m",
-        "upper_bband",
-        "lower_bband",
-        "rsi",
-        "entry",
-        "exit",
-        "entry_price",
-        "stoploss",
-        "takeprofit",
-        "trailing_stoploss",
-        "trailing_stoploss_target",
-        "position",
-    ]
-
-    pivot_columns = [col for col in pivot_columns if col in last_rows.columns]
-    last_rows_pivoted = last_rows.pivot(
-        index="mint", columns="time", values=pivot_columns
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    _publish(
+        DashboardSnapshot(wallet, mint_names, market, timestamp, status="⏳ Refreshing data...")
     )
-    last_rows_pivoted.columns = [f"{col[0]}" for col in last_rows_pivoted.columns]
-    last_rows_pivoted = last_rows_pivoted.T
-
-    custom_headers = {
-        "close": "Price",
-        "ema_s": "EMA Short",
-        "ema_m": "EMA Medium",
-        "upper_bband": "Upper Bollinger Band",
-        "lower_bband": "Lower Bollinger Band",
-        "rsi": "RSI",
-        "entry": "Entry Signal",
-        "exit": "Exit Signal",
-        "entry_price": "Entry Price",
-        "stoploss": "Stoploss",
-        "takeprofit": "Take Profit",
-        "trailing_stoploss": "Trailing Stoploss",
-        "trailing_stoploss_target": "Trailing Stoploss Target",
-        "position": "Position",
-    }
-    last_rows_pivoted.rename(index=custom_headers, inplace=True)
+    metrics().observe("dashboard", time.perf_counter() - dashboard_started)
 
-    price_row = cast(pd.Series, last_rows_pivoted.loc["Price"])
-    last_rows_pivoted.loc["Price"] = price_row.apply(format_as_money)  # pyright: ignore[reportGeneralTypeIssues]
+    orders = collect_orders(analysed)
+    if orders:
+        execute_orders(orders)
+    metrics().observe("analysis_cycle", time.perf_counter() - cycle_started)
 
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    
-    market_table = Table(
-        title=f"📊 [bold cyan]Market Analysis[/bold cyan] [dim]({timestamp})[/dim]", 
-        box=box.ROUNDED, 
-        show_header=True,
-        header_style="bold magenta",
-        border_style="cyan",
-        row_styles=["", "dim"]
-    )
-    
-    market_table.add_column("📈 Metric", style="bold yellow", no_wrap=True, width=25)
-    for col in last_rows_pivoted.columns:
-        market_table.add_column(str(col), style="cyan", justify="right", width=15)
-    
-    for idx in last_rows_pivoted.index:
-        row_data = [str(idx)]
-        for col in last_rows_pivoted.columns:
-            value = last_rows_pivoted.loc[idx, col]
-            
-            if idx == "Entry Signal" and value:
-                value_str = "[bold green]✓ BUY[/bold green]"
-            elif idx == "Exit Signal" and value:
-                value_str = "[bold red]✗ SELL[/bold red]"
-            elif idx in ["Entry Signal", "Exit Signal"]:
-                value_str = "[dim]-[/dim]"
-            else:
-                value_str = str(value)
-            
-            row_data.append(value_str)
-        market_table.add_row(*row_data)
-    
-    wallet_panel = Panel(wallet_info, title="💼 Wallet Overview", border_style="cyan", padding=(1, 2), expand=False)
+    return evaluated
 
-    dashboard = _render_dashboard(wallet_panel, market_table, "⏳ Refreshing data...")
-    _update_live(dashboard)
 
-    for df, secondary_mint, secondary_mint_symbol in zip(
-        data_frames, secondary_mints, secondary_mint_symbols
-    ):
-        data_file_path = f"data/{secondary_mint_symbol}_data.csv"
-        if not df["position"].iat[-1]:
-            handle_buy_signal(df, secondary_mint, data_file_path, secondary_mint_symbol)
-        else:
-            handle_sell_signal(df, secondary_mint, data_file_path, secondary_mint_symbol)
+def analyse_closed_bars() -> None:
+    """Sleep until the next bar close plus ``bar_settle_seconds`` and evaluate the mints it closed.
 
+    Mints whose candles could not be fetched are retried after
+    ``price_update_seconds`` rather than waiting for their next bar.
+    """
+    if dashboard is not None:
+        # The render thread counts down on its own
+        dashboard.set_status("", next_update=bar_scheduler.next_wake())
     try:
-        for remaining in range(price_update_seconds, 0, -1):
-            countdown_text = f"⏱️  Next update in {remaining} seconds | Press Ctrl+C to stop"
-            _update_live(_render_dashboard(wallet_panel, market_table, countdown_text))
-            time.sleep(1)
+        due = bar_scheduler.wait()
     except KeyboardInterrupt:
-        _update_live(_render_dashboard(wallet_panel, market_table, "⏹️  Stopping..."))
+        if dashboard is not None:
+            dashboard.set_status("⏹️  Stopping...")
         raise
+    _complete_bars(due, perform_analysis(due))
+
+
+def _complete_bars(due: Dict[str, int], evaluated: Set[str]) -> None:
+    for mint, close in due.items():
+        if mint in evaluated:
+            bar_scheduler.complete(mint, close)
+        else:
+            bar_scheduler.retry(mint, price_update_seconds)
+
+
+def prefetch_order(
+    df: pd.DataFrame,
+    secondary_mint: str,
+    secondary_mint_symbol: str,
+    near_entry: bool,
+    near_exit: bool,
+) -> None:
+    """Request an Ultra order ahead of time when a signal is close to firing."""
+    if order_slicer().active(secondary_mint) is not None:
+        return
+    if not df["position"].iat[-1] and near_entry:
+        order_prefetcher().request(
+            _allocate([secondary_mint_symbol])[secondary_mint_symbol],
+            primary_mint,
+            secondary_mint,
+            secondary_mint_symbol,
+        )
+    elif df["position"].iat[-1] and near_exit:
+        order_prefetcher().request(
+            _balance_cache.available(secondary_mint),
+            secondary_mint,
+            primary_mint,
+            secondary_mint_symbol,
+        )
 
 
-def handle_buy_signal(df: pd.DataFrame, secondary_mint: str, data_file_path: str, secondary_mint_symbol: str) -> bool:
-    input_amount = _balance_cache.get(primary_mint)
-    if df["entry"].iat[-1] == 1:
+def _allocate(symbols: List[str]) -> Dict[str, float]:
+    """Primary balance for each buy signal in ``symbols``, per ``allocation_policy``."""
+    return allocate(
+        _balance_cache.available(primary_mint),
+        symbols,
+        str(config().allocation_policy),
+        float(config().allocation_fraction),
+        float(config().allocation_min_value),
+    )
+
+
+def collect_orders(analysed: List[Tuple[pd.DataFrame, str, str]]) -> List[Order]:
+    """The swaps called for by a pass's entry and exit signals, buys sized together."""
+    orders: List[Order] = []
+    buys = []
+    for df, secondary_mint, secondary_mint_symbol in analysed:
+        plan = order_slicer().active(secondary_mint)
+        if plan is not None:
+            # No new orders while one is being sliced; the opposite signal stops it
+            if df[plan.flip_signal].iat[-1] == 1 and not plan.cancelled:
+                log_transaction.info(
+                    f"SolTrade is stopping the sliced {plan.order.side} for "
+                    f"{secondary_mint_symbol}: its {plan.flip_signal} signal fired."
+                )
+                plan.cancel()
+            continue
+        if not df["position"].iat[-1]:
+            if df["entry"].iat[-1] == 1:
+                buys.append((df, secondary_mint, secondary_mint_symbol))
+            continue
+        if df["exit"].iat[-1] != 1:
+            continue
+        input_amount = _balance_cache.available(secondary_mint)
+        mint_symbol = cast(str, df["mint"].iat[0])
+        log_transaction.info(
+            f"SolTrade has detected a sell signal for {input_amount} {mint_symbol}."
+        )
+        orders.append(
+            Order(
+                "sell",
+                df,
+                secondary_mint,
+                secondary_mint_symbol,
+                input_amount,
+                secondary_mint,
+                primary_mint,
+                secondary_mint_symbol,
+                primary_mint_symbol,
+                order_prefetcher().take(input_amount, secondary_mint, primary_mint),
+            )
+        )
+
+    amounts = _allocate([symbol for _, _, symbol in buys])
+    for df, secondary_mint, secondary_mint_symbol in buys:
+        input_amount = amounts[secondary_mint_symbol]
         mint_symbol = cast(str, df["mint"].iat[0])
         if input_amount <= 0:
             log_transaction.info(
-                f"SolTrade has detected a buy signal, but does not have enough {primary_mint_symbol} to trade."
+                f"SolTrade has detected a buy signal for {mint_symbol}, but does not have enough {primary_mint_symbol} to trade."
             )
-            return False
+            continue
         log_transaction.info(
             f"SolTrade has detected a buy signal for {mint_symbol} using {input_amount} {primary_mint_symbol}."
         )
-        is_swapped = asyncio.run(
-            perform_swap(
+        orders.append(
+            Order(
+                "buy",
+                df,
+                secondary_mint,
+                secondary_mint_symbol,
                 input_amount,
                 primary_mint,
                 secondary_mint,
                 primary_mint_symbol,
                 secondary_mint_symbol,
+                order_prefetcher().take(input_amount, primary_mint, secondary_mint),
             )
         )
-        if is_swapped:
-            df = calc_entry_price(df)
-            df = calc_stoploss(df)
-            df = calc_takeprofit(df)
-            df = calc_trailing_stoploss(df)
-            df = set_position(df, True)
-            save_dataframe_to_csv(df, data_file_path)
-            _balance_cache.invalidate(primary_mint)
-            _balance_cache.invalidate(secondary_mint)
-            return True
+    return orders
+
+
+def _open_position(order: Order, amount: float, entry_price: Optional[float] = None) -> None:
+    """Journal a filled buy, with levels from ``entry_price`` (default: the signal bar's close)."""
+    df = calc_entry_price(order.df)
+    df = calc_stoploss(df, order.mint)
+    df = calc_takeprofit(df, order.mint)
+    if entry_price is not None:
+        settings = strategy_registry().instance(order.mint)
+        df["entry_price"] = entry_price
+        df["stoploss"] = stoploss_level(entry_price, settings.stoploss)
+        df["takeprofit"] = takeprofit_level(entry_price, settings.takeprofit)
+    # No bar has closed since the entry, so the trailing stop starts unset
+    entered = pd.Timestamp(df["time"].iat[-1]).timestamp()
+    df = calc_trailing_stoploss(df, order.mint, entered)
+    df = set_position(df, True)
+    journal().record_entry(
+        order.mint,
+        order.symbol,
+        amount,
+        {col: df[col].iat[-1] for col in POSITION_COLUMNS},
+    )
+
+
+def _is_sliced(order: Order) -> bool:
+    """Whether ``order`` is worked in slices rather than sent at once."""
+    if config().execution_mode != "sliced":
         return False
-    return False
+    value = order.amount if order.side == "buy" else order.amount * float(order.df["close"].iat[-1])
+    return value >= float(config().slice_min_value)
 
 
-def handle_sell_signal(df: pd.DataFrame, secondary_mint: str, data_file_path: str, secondary_mint_symbol: str) -> bool:
-    input_amount = _balance_cache.get(secondary_mint)
-    df = calc_trailing_stoploss(df)
+def execute_orders(orders: List[Order]) -> List[bool]:
+    """Reserve each order's input, run every swap at once and record the fills.
 
-    if df["exit"].iat[-1] == 1:
-        mint_symbol = cast(str, df["mint"].iat[0])
+    Orders worked in slices are started in the background instead and
+    report ``False`` here; ``settle_sliced_orders`` records them once done.
+    """
+    sliced: List[Order] = []
+    immediate: List[Order] = []
+    for order in orders:
+        (sliced if _is_sliced(order) else immediate).append(order)
+
+    for order in sliced:
+        _balance_cache.reserve(order.input_mint, order.amount)
         log_transaction.info(
-            f"SolTrade has detected a sell signal for {input_amount} {mint_symbol}."
+            f"SolTrade is slicing the {order.side} of {order.amount} {order.input_symbol} "
+            f"for {order.symbol} into {config().slice_count} orders."
         )
-        is_swapped = asyncio.run(
-            perform_swap(
-                input_amount,
-                secondary_mint,
-                primary_mint,
-                secondary_mint_symbol,
-                primary_mint_symbol,
+        order_slicer().start(
+            order,
+            int(config().slice_count),
+            float(config().slice_interval_seconds),
+            float(config().slice_max_price_impact_pct),
+        )
+
+    for order in immediate:
+        _balance_cache.reserve(order.input_mint, order.amount)
+    try:
+        filled = runtime().run(submit_orders(immediate)) if immediate else []
+    finally:
+        for order in immediate:
+            _balance_cache.release(order.input_mint, order.amount)
+
+    for order, fill in zip(immediate, filled):
+        # Refetched even when the swap failed: an unconfirmed one may still land
+        _balance_cache.invalidate(order.input_mint)
+        _balance_cache.invalidate(order.output_mint)
+        if fill is None:
+            continue
+        # A pre-fetched order may have spent a little less than the signal asked for
+        if order.side == "buy":
+            _open_position(order, fill.input_amount)
+        else:
+            journal().record_exit(
+                order.mint, order.symbol, order.df["close"].iat[-1], fill.input_amount
             )
+    results = {id(order): fill is not None for order, fill in zip(immediate, filled)}
+    return [results.get(id(order), False) for order in orders]
+
+
+def settle_sliced_orders() -> None:
+    """Release and journal the sliced orders that finished, from their aggregated fills.
+
+    A sell that stopped short of the full amount leaves the position open
+    with the fill recorded, so the rest is sold on a later exit signal.
+    """
+    for plan in order_slicer().finished():
+        order = plan.order
+        _balance_cache.release(order.input_mint, order.amount)
+        _balance_cache.invalidate(order.input_mint)
+        _balance_cache.invalidate(order.output_mint)
+        log_transaction.info(
+            f"Sliced {order.side} for {order.symbol} {'stopped' if plan.cancelled else 'finished'}: "
+            f"{plan.filled_input} of {order.amount} {order.input_symbol} filled in "
+            f"{plan.children} orders at {plan.average_price}."
         )
-        if is_swapped:
-            df = set_position(df, False)
-            df = df.drop(
-                columns=[
-                    "stoploss",
-                    "entry_price",
-                    "trailing_stoploss",
-                    "trailing_stoploss_target",
-                    "takeprofit",
-                ]
+        if plan.outcome_unknown:
+            log_transaction.warning(
+                f"The last order of the sliced {order.side} for {order.symbol} may still land; "
+                "only confirmed fills are journaled and balances will be refetched."
             )
-            save_dataframe_to_csv(df, data_file_path)
-            _balance_cache.invalidate(secondary_mint)
-            _balance_cache.invalidate(primary_mint)
-            return True
-        return False
-    return False
+        if plan.filled_input <= 0 or plan.filled_output <= 0:
+            # Nothing, or only dust with no output, filled: there is no price to journal
+            continue
+        if order.side == "buy":
+            _open_position(order, plan.filled_input, plan.average_price)
+            continue
+        position = journal().latest_position(order.mint)
+        if plan.remaining > 1e-12 and position is not None and position["position"]:
+            journal().record_partial_exit(
+                order.mint, order.symbol, plan.average_price, plan.filled_input, position
+            )
+        else:
+            journal().record_exit(order.mint, order.symbol, plan.average_price, plan.filled_input)
+
+
+def reconcile_positions(stream: WalletStream, mints: Set[str]) -> None:
+    """Close open positions whose tokens the wallet stream reports gone, e.g. sold by hand.
+
+    Mints with a sliced order still running are left to ``settle_sliced_orders``.
+    """
+    for mint in mints:
+        held = stream.held(mint)
+        if held is None or held > 0 or order_slicer().active(mint) is not None:
+            continue
+        position = journal().latest_position(mint)
+        if position is None or not position["position"]:
+            continue
+        symbol = secondary_mint_symbols[secondary_mints.index(mint)]
+        log_transaction.warning(f"The wallet no longer holds any {symbol}; closing its position.")
+        journal().close_position(mint, symbol)
+
+
+def run_streaming() -> None:
+    """Event-driven loop: re-evaluate mints on wallet events and at each bar close."""
+    stream = WalletStream()
+    runtime().run(stream.start())
+    try:
+        while True:
+            changed = stream.wait_for_changes(
+                max(0.0, bar_scheduler.next_wake() - clock().time())
+            )
+            reconcile_positions(stream, changed & set(secondary_mints))
+            due = bar_scheduler.due()
+            if due:
+                _complete_bars(due, perform_analysis(due))
+            # A primary balance change moves every mint's inputs
+            changed_mints = set(secondary_mints) if primary_mint in changed else changed
+            changed_mints = (changed_mints & set(secondary_mints)) - set(due)
+            if changed_mints:
+                perform_analysis(bar_scheduler.latest_closes(changed_mints), new_bars=False)
+            if dashboard is not None:
+                dashboard.set_status(
+                    "📡 Waiting for wallet events or the next candle | Press Ctrl+C to stop"
+                )
+            metrics().maybe_export(float(config().metrics_export_seconds))
+    finally:
+        runtime().run(stream.stop())
 
 
 def start_trading():
-    global live_display
+    global dashboard
 
     silence_console_logging()
     log_general.info("Soltrade has now initialized the trading algorithm.")
+    runtime().run(start_keep_warm())
+    if config().metrics_port:
+        serve_metrics(int(config().metrics_port))
 
-    with Live(console=console, refresh_per_second=4, transient=False) as live:
-        live_display = live
-        _update_live(Panel.fit("🔍 Loading market data...", border_style="yellow"))
-
-        try:
-            while True:
-                perform_analysis()
-        except KeyboardInterrupt:
-            log_general.info("SolTrade has been stopped by user.")
-        finally:
-            live_display = None
-
-    console.print("\n[yellow]⏹️  Shutting down SolTrade...[/yellow]")
-
-
-def save_dataframe_to_csv(df: pd.DataFrame, file_path: str) -> None:
+    dashboard = DashboardRenderer(
+        console, int(config().dashboard_page_size), float(config().dashboard_page_seconds)
+    )
+    dashboard.show_message(Panel.fit("🔍 Loading market data...", border_style="yellow"))
+    dashboard.start()
     try:
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-        df.to_csv(file_path, index=False)
-        log_general.info(f"Data successfully saved to {file_path}")
-    except Exception as e:
-        log_general.error(f"Failed to save data to {file_path}: {e}")
-
+        if config().streaming_mode:
+            run_streaming()
+        while True:
+            analyse_closed_bars()
+            metrics().maybe_export(float(config().metrics_export_seconds))
+    except KeyboardInterrupt:
+        log_general.info("SolTrade has been stopped by user.")
+    finally:
+        # Let in-flight slices land so their fills are journalled
+        order_slicer().cancel_all(timeout=60)
+        settle_sliced_orders()
+        dashboard.stop()
+        dashboard = None
+        metrics().export()
+        runtime().run(close_clients())
+        runtime().stop()
 
-def read_dataframe_from_csv(file_path: str) -> pd.DataFrame:
-    return pd.read_csv(file_path)  # type: ignore[reportGeneralTypeIssues]
+    console.print("\n[yellow]⏹️  Shutting down SolTrade...[/yellow]")
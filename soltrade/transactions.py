@@ -1,12 +1,37 @@
-import base64
+import asyncio
 import os
+import time
+from dataclasses import dataclass
+from typing import Optional
 
 import httpx
-from solders.message import to_bytes_versioned
-from solders.transaction import VersionedTransaction
+
+from solders.keypair import Keypair
 
 from soltrade.config import config
+from soltrade.confirmations import confirmation_tracker
+from soltrade.http_client import jupiter_client
 from soltrade.log import log_general, log_transaction
+from soltrade.metrics import metrics
+from soltrade.resilience import CircuitOpenError, endpoint
+from soltrade.signer import sign_with, signer
+from soltrade.wallet import balance_cache
+
+
+class SwapOutcomeUnknown(Exception):
+    """Raised when a submitted swap was neither confirmed nor seen to fail.
+
+    It may still land, so it must not be sent again; balances are
+    refetched to find out.
+    """
+
+
+@dataclass
+class SwapFill:
+    """The amounts a confirmed swap actually spent and received."""
+
+    input_amount: float
+    output_amount: float
 
 
 class MarketPosition:
@@ -31,7 +56,10 @@ def market(path=None):
 
 
 async def create_order(
-    input_amount: float, input_token_mint: str, output_token_mint: str
+    input_amount: float,
+    input_token_mint: str,
+    output_token_mint: str,
+    label: str = "",
 ) -> dict:
     """
     Creates a swap order using Jupiter Ultra API.
@@ -40,6 +68,7 @@ async def create_order(
         input_amount: The amount of input token to swap (in token units, not lamports)
         input_token_mint: The mint address of the input token
         output_token_mint: The mint address of the output token
+        label: Mint symbol used to tag latency metrics
     
     Returns:
         Dictionary containing the order response from Jupiter API
@@ -57,79 +86,97 @@ async def create_order(
         "inputMint": input_token_mint,
         "outputMint": output_token_mint,
         "amount": amount_in_smallest_unit,
-        "taker": str(config().public_address),
+        "taker": signer().address,
         "slippageBps": int(config().max_slippage or 50),
     }
     
-    headers = {"Content-Type": "application/json"}
-    if config().jupiter_api_key:
-        headers["x-api-key"] = config().jupiter_api_key
-    
     api_link = f"{config().jup_api}/order"
     log_transaction.info(f"SolTrade API Link: {api_link}")
     log_transaction.info(f"Parameters: {params}")
     
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        response = await client.get(api_link, params=params, headers=headers)
+    async def request() -> httpx.Response:
+        response = await jupiter_client().get("/order", params=params)
         response.raise_for_status()
-        result = response.json()
-        log_transaction.info(f"Order response: {result}")
-        return result
+        return response
+
+    with metrics().span("create_order", label):
+        response = await endpoint("jupiter").call(request)
+    result = response.json()
+    log_transaction.info(f"Order response: {result}")
+    return result
 
 
-async def execute_order(order_response: dict) -> dict:
+def sign_transaction(transaction_b64: str, keypair: Optional[Keypair] = None) -> str:
+    """Sign a base64 Ultra order transaction with ``keypair`` (default: the wallet)."""
+    if keypair is None:
+        return signer().sign(transaction_b64)
+    return sign_with(keypair, transaction_b64)
+
+
+def prepare_order(
+    order_response: dict, label: str = "", signed_transaction: Optional[str] = None
+) -> str:
+    """Check an Ultra order and sign it; the signed transaction to submit.
+
+    Nothing is sent, so a failure here leaves no swap in flight.
+    ``signed_transaction`` is returned as is when the order was already signed.
+    """
+    if "errorCode" in order_response:
+        error_msg = order_response.get("errorMessage", "Unknown error")
+        log_transaction.error(f"Order failed: {error_msg}")
+        raise Exception(f"Order error: {error_msg}")
+
+    transaction_b64 = order_response.get("transaction")
+    if not transaction_b64:
+        log_transaction.error("No transaction returned in order response")
+        raise Exception("No transaction in order response")
+
+    if signed_transaction is not None:
+        return signed_transaction
+    with metrics().span("sign", label):
+        return sign_transaction(transaction_b64)
+
+
+async def execute_order(
+    order_response: dict, label: str = "", signed_transaction: Optional[str] = None
+) -> dict:
     """
     Signs and executes a swap order using Jupiter Ultra API.
     This replaces the legacy send_transaction function.
+
+    ``signed_transaction`` skips signing when the order was already signed,
+    e.g. as part of a batch.
     """
     try:
-        if "errorCode" in order_response:
-            error_msg = order_response.get("errorMessage", "Unknown error")
-            log_transaction.error(f"Order failed: {error_msg}")
-            raise Exception(f"Order error: {error_msg}")
-        
-        transaction_b64 = order_response.get("transaction")
-        if not transaction_b64:
-            log_transaction.error("No transaction returned in order response")
-            raise Exception("No transaction in order response")
-        
+        signed_txn_b64 = prepare_order(order_response, label, signed_transaction)
         request_id = order_response["requestId"]
         
-        # Deserialize and sign the transaction
-        raw_txn = VersionedTransaction.from_bytes(base64.b64decode(transaction_b64))
-        signature = config().keypair.sign_message(to_bytes_versioned(raw_txn.message))
-        signed_txn = VersionedTransaction.populate(raw_txn.message, [signature])
-        
-        # Convert signed transaction back to base64
-        signed_txn_b64 = base64.b64encode(bytes(signed_txn)).decode("utf-8")
-        
         log_transaction.info(f"SolTrade is executing order with requestId: {request_id}")
         
-        # Prepare headers with Jupiter API key
-        headers = {"Content-Type": "application/json"}
-        if config().jupiter_api_key:
-            headers["x-api-key"] = config().jupiter_api_key
-        
-        # Execute the transaction via Ultra API
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            execute_response = await client.post(
-                f"{config().jup_api}/execute",
+        # Execute the transaction via Ultra API on the pooled connection.
+        # Resending the same signed transaction cannot fill twice.
+        async def request() -> httpx.Response:
+            response = await jupiter_client().post(
+                "/execute",
                 json={
                     "signedTransaction": signed_txn_b64,
                     "requestId": request_id,
                 },
-                headers=headers
             )
-            execute_response.raise_for_status()
-            result = execute_response.json()
-            
-            if result.get("status") == "Success":
-                log_transaction.info(f"SolTrade TxID: {result.get('signature')}")
-            else:
-                log_transaction.error(f"Transaction failed: {result.get('error')}")
-            
-            return result
-            
+            response.raise_for_status()
+            return response
+
+        with metrics().span("execute_order", label):
+            execute_response = await endpoint("jupiter").call(request)
+        result = execute_response.json()
+
+        if result.get("status") == "Success":
+            log_transaction.info(f"SolTrade TxID: {result.get('signature')}")
+        else:
+            log_transaction.error(f"Transaction failed: {result.get('error')}")
+
+        return result
+
     except Exception as e:
         log_transaction.error(f"Failed to execute transaction: {e}")
         raise
@@ -141,39 +188,97 @@ async def perform_swap(
     output_token_mint: str,
     sent_token_symbol: str,
     output_token_symbol: str,
-):
+    prefetched_order: Optional[dict] = None,
+    signed_transaction: Optional[str] = None,
+) -> Optional[SwapFill]:
+    """Swap ``sent_amount`` of ``sent_token_mint``; the amounts filled, or ``None`` on failure.
+
+    A pre-fetched order may be sized slightly below ``sent_amount``, so the
+    input is taken from what was executed rather than what was asked for.
+
+    Raises ``SwapOutcomeUnknown`` when a submitted swap could not be
+    confirmed either way.
+    """
     log_general.info("SolTrade is taking a market position.")
+    label = (
+        output_token_symbol
+        if sent_token_mint == config().primary_mint
+        else sent_token_symbol
+    )
 
     order = execute_result = None
     is_tx_successful = False
 
+    def outcome_unknown(reason: str) -> SwapOutcomeUnknown:
+        # It may still land: requoting could fill the swap twice
+        log_general.error(f"{reason}; not retrying, balances will be refetched.")
+        balance_cache().invalidate(sent_token_mint)
+        balance_cache().invalidate(output_token_mint)
+        return SwapOutcomeUnknown(reason)
+
     for i in range(0, 3):
         if not is_tx_successful:
+            if i > 0:
+                # Back off before requoting rather than hammering Jupiter
+                await asyncio.sleep(endpoint("jupiter").policy.backoff(i - 1))
+            submitted = False
             try:
-                order = await create_order(
-                    sent_amount, sent_token_mint, output_token_mint
-                )
-                
-                execute_result = await execute_order(order)
-                
+                signed = None
+                if i == 0 and prefetched_order is not None:
+                    # Signal fired while a speculative quote was still valid
+                    order = prefetched_order
+                    signed = signed_transaction
+                else:
+                    order = await create_order(
+                        sent_amount, sent_token_mint, output_token_mint, label
+                    )
+
+                signed = prepare_order(order, label, signed)
+                # From here on the swap may reach the chain whatever goes wrong
+                submitted = True
+                submitted_at = time.perf_counter()
+                execute_result = await execute_order(order, label, signed)
+
                 if execute_result.get("status") == "Success":
-                    is_tx_successful = True
-                    break
+                    # Positions and balances only move once the chain confirms the swap
+                    signature = execute_result.get("signature")
+                    landed = None
+                    if signature:
+                        landed = await confirmation_tracker().confirm(
+                            signature, label, submitted_at
+                        )
+                    if landed:
+                        is_tx_successful = True
+                        break
+                    if landed is None:
+                        raise outcome_unknown(
+                            f"SolTrade could not confirm transaction {signature} on chain"
+                        )
+                    log_general.warning(
+                        f"SolTrade transaction {i} failed on chain. Retrying."
+                    )
                 else:
                     log_general.warning(
                         f"SolTrade failed to complete transaction {i}. Error: {execute_result.get('error')}. Retrying."
                     )
+            except SwapOutcomeUnknown:
+                raise
             except Exception as e:
+                if submitted:
+                    raise outcome_unknown(
+                        f"SolTrade lost track of submitted transaction {i}: {e}"
+                    ) from e
+                if isinstance(e, CircuitOpenError):
+                    log_general.warning(f"SolTrade failed to complete transaction {i}: {e}")
+                    break
                 log_general.warning(
                     f"SolTrade failed to complete transaction {i}. Retrying. Error: {e}"
                 )
                 continue
 
     if not is_tx_successful:
-        log_general.error(
-            "SolTrade failed to complete the transaction after 3 attempts."
-        )
-        return False
+        log_general.error("SolTrade failed to complete the transaction.")
+        return None
 
     # Calculate the actual amounts from the execution result
     decimals = config().decimals(output_token_mint)
@@ -185,8 +290,14 @@ async def perform_swap(
         output_amount_str = order.get("outAmount")
     
     bought_amount = int(output_amount_str) / decimals
+
+    input_amount = sent_amount
+    if execute_result and execute_result.get("totalInputAmount"):
+        input_amount = int(execute_result["totalInputAmount"]) / config().decimals(sent_token_mint)
+    elif order and order.get("inAmount"):
+        input_amount = int(order["inAmount"]) / config().decimals(sent_token_mint)
     
     log_transaction.info(
-        f"Sold {sent_amount} {sent_token_symbol} for {bought_amount:.2f} {output_token_symbol}"
+        f"Sold {input_amount} {sent_token_symbol} for {bought_amount:.2f} {output_token_symbol}"
     )
-    return True
+    return SwapFill(input_amount, bought_amount)
@@ -1,27 +1,18 @@
-import time
 from functools import wraps
 
-from solana.exceptions import SolanaRpcException
+from soltrade.resilience import endpoint
 
-from soltrade.log import log_general
 
+def handle_rate_limiting(endpoint_name="rpc"):
+    """Run a blocking client call through ``endpoint_name``'s retries and circuit breaker.
 
-def handle_rate_limiting(retry_attempts=3, retry_delay=10):
+    Once retries are exhausted the last error is raised rather than
+    swallowed, so a failed lookup is never mistaken for a ``None`` result.
+    """
     def decorator(client_function):
         @wraps(client_function)
         def wrapper(*args, **kwargs):
-            for _ in range(retry_attempts):
-                try:
-                    return client_function(*args, **kwargs)
-                except SolanaRpcException as e:
-                    if 'HTTPStatusError' in e.error_msg:
-                        log_general.warning(
-                            f"Rate limit exceeded in {client_function.__name__}, retrying in {retry_delay} seconds...")
-                        time.sleep(retry_delay)
-                    else:
-                        raise
-            log_general.warning("Rate limit error persisting, skipping this iteration.")
-            return None
+            return endpoint(endpoint_name).call_sync(lambda: client_function(*args, **kwargs))
 
         return wrapper
 
@@ -1,26 +1,51 @@
+import asyncio
 import json
+import math
+from typing import Dict, Set
 
 from solana.rpc.types import TokenAccountOpts
 from solders.pubkey import Pubkey
 
+from soltrade.async_runtime import runtime
+from soltrade.clock import clock
 from soltrade.config import config
+from soltrade.log import log_general
+from soltrade.metrics import metrics
+from soltrade.resilience import endpoint
+from soltrade.signer import signer
 from soltrade.utils import handle_rate_limiting
 
+TOKEN_PROGRAM_ID = Pubkey.from_string("TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA")
+TOKEN_2022_PROGRAM_ID = Pubkey.from_string("TokenzQdBNbLqP5VEhdkAS6EPFLC1PHnBqCXEpPxuEb")
+# Token accounts are owned by one of these depending on the mint
+TOKEN_PROGRAM_IDS = (TOKEN_PROGRAM_ID, TOKEN_2022_PROGRAM_ID)
+
+# SOL kept aside for transaction fees
+SOL_FEE_RESERVE = 0.02
+
+
+def spendable_sol(lamports: int) -> float:
+    balance = lamports / (10**9)
+    if balance < SOL_FEE_RESERVE:
+        return 0.0
+    return balance - SOL_FEE_RESERVE
+
 
 # Returns the current balance of token in the wallet
 @handle_rate_limiting()
 def find_balance(token_mint: str) -> float:
+    with metrics().span("find_balance", token_mint):
+        return _find_balance(token_mint)
+
+
+def _find_balance(token_mint: str) -> float:
     if token_mint == config().sol_mint:
-        balance_response = config().client.get_balance(config().public_address).value
-        balance_response = balance_response / (10**9)
-        if balance_response < 0.02:
-            return 0.0
-        return balance_response - 0.02
+        return spendable_sol(config().client.get_balance(signer().public_key).value)
 
     response = (
         config()
         .client.get_token_accounts_by_owner_json_parsed(
-            config().public_address,
+            signer().public_key,
             TokenAccountOpts(mint=Pubkey.from_string(token_mint)),
         )
         .to_json()
@@ -31,3 +56,121 @@ def find_balance(token_mint: str) -> float:
     return json_response["result"]["value"][0]["account"]["data"]["parsed"]["info"][
         "tokenAmount"
     ]["uiAmount"]
+
+
+async def fetch_balances() -> Dict[str, float]:
+    """Fetch every SPL and Token-2022 balance plus SOL in concurrent RPC calls.
+
+    One call per token program and one for SOL, however many mints are
+    held. Returns a mint -> balance map; mints the wallet holds no account
+    for are simply absent.
+    """
+    owner = signer().public_key
+    client = config().async_client
+
+    def request():
+        return asyncio.gather(
+            client.get_balance(owner),
+            *(
+                client.get_token_accounts_by_owner_json_parsed(
+                    owner, TokenAccountOpts(program_id=program_id)
+                )
+                for program_id in TOKEN_PROGRAM_IDS
+            ),
+        )
+
+    with metrics().span("fetch_balances"):
+        sol_response, *token_responses = await endpoint("rpc").call(request)
+
+    balances: Dict[str, float] = {}
+    for token_response in token_responses:
+        for keyed_account in token_response.value:
+            info = keyed_account.account.data.parsed["info"]
+            amount = info["tokenAmount"]["uiAmount"] or 0
+            balances[info["mint"]] = balances.get(info["mint"], 0.0) + float(amount)
+    balances[config().sol_mint] = spendable_sol(sol_response.value)
+    return balances
+
+
+class BalanceCache:
+    """Bulk balance cache that refreshes every mint at once when stale.
+
+    Entries expire after ``ttl`` seconds, or one mint at a time on
+    ``invalidate``; the next ``get`` of an expired mint refetches the whole
+    wallet with ``fetch_balances``, so the RPC cost does not grow with the
+    number of configured mints.
+
+    Amounts promised to swaps still in flight are ``reserve``d so that
+    ``available`` never hands the same balance out twice.
+    """
+
+    def __init__(self, ttl: float) -> None:
+        self.ttl = ttl
+        self._cache: Dict[str, float] = {}
+        self._reserved: Dict[str, float] = {}
+        self._fetched_at = -math.inf
+        # Mints invalidated since the last refresh
+        self._stale: Set[str] = set()
+
+    def _is_stale(self) -> bool:
+        return clock().monotonic() - self._fetched_at >= self.ttl
+
+    def refresh(self) -> Dict[str, float]:
+        self._stale.clear()
+        try:
+            self._cache = runtime().run(fetch_balances())
+            self._fetched_at = clock().monotonic()
+        except Exception as e:
+            # Keep serving the last known balances and retry after another TTL
+            log_general.error(f"Failed to refresh wallet balances: {e}")
+            self._fetched_at = clock().monotonic()
+        return self._cache
+
+    def get(self, mint: str) -> float:
+        if self._is_stale() or mint in self._stale:
+            self.refresh()
+        return self._cache.get(mint, 0.0)
+
+    def available(self, mint: str) -> float:
+        """Balance not yet reserved for a pending swap."""
+        return max(0.0, self.get(mint) - self._reserved.get(mint, 0.0))
+
+    def reserve(self, mint: str, amount: float) -> None:
+        self._reserved[mint] = self._reserved.get(mint, 0.0) + amount
+
+    def release(self, mint: str, amount: float) -> None:
+        remaining = self._reserved.get(mint, 0.0) - amount
+        if remaining > 1e-12:
+            self._reserved[mint] = remaining
+        else:
+            self._reserved.pop(mint, None)
+
+    def snapshot(self) -> Dict[str, float]:
+        if self._is_stale() or self._stale:
+            self.refresh()
+        return dict(self._cache)
+
+    def set(self, mint: str, balance: float) -> None:
+        """Overwrite one cached balance, e.g. from an account notification."""
+        self._cache[mint] = balance
+
+    def adjust(self, mint: str, delta: float) -> None:
+        self._cache[mint] = self._cache.get(mint, 0.0) + delta
+
+    def invalidate(self, mint: str | None = None) -> None:
+        """Refetch ``mint`` on its next ``get``, or every mint when ``mint`` is ``None``."""
+        if mint is None:
+            self._fetched_at = -math.inf
+        else:
+            self._stale.add(mint)
+
+
+_balance_cache_instance = None
+
+
+def balance_cache() -> BalanceCache:
+    """Singleton pattern to ensure only one BalanceCache instance exists."""
+    global _balance_cache_instance
+    if _balance_cache_instance is None:
+        _balance_cache_instance = BalanceCache(float(config().balance_ttl_seconds))
+    return _balance_cache_instance
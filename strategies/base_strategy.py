@@ -1,9 +1,52 @@
+from typing import Dict, Optional, Tuple
+
+import numpy as np
 import pandas as pd
 
+from soltrade.indicators import IndicatorEngine, StreamingIndicator
+from soltrade.panel import CandlePanel
+
 
 class BaseStrategy:
+    indicator_engine: Optional[IndicatorEngine] = None
+    # Bars of history the strategy is handed each update. ``None`` means just
+    # enough for every indicator to warm up.
+    lookback: Optional[int] = None
+
     def __init__(self, df: pd.DataFrame):
         self.df = df
 
     def apply_strategy(self):
         raise NotImplementedError("Strategy must implement the apply_strategy method")
+
+    def apply_panel(self, panel: CandlePanel) -> Dict[str, np.ndarray]:
+        """Strategy columns, ``entry``/``exit`` included, for every mint of ``panel`` at once.
+
+        Returns ``(mints, bars)`` arrays. Strategies without a panel form
+        leave this unimplemented and are run per mint.
+        """
+        raise NotImplementedError("Strategy does not implement apply_panel")
+
+    def indicators(self) -> Dict[str, StreamingIndicator]:
+        """Streaming indicators consumed through ``stream_indicators``."""
+        return {}
+
+    def warmup_bars(self) -> int:
+        """Bars the slowest indicator needs before its outputs are defined."""
+        return max((ind.warmup for ind in self.indicators().values()), default=1)
+
+    def required_bars(self) -> int:
+        """The declared ``lookback``, but never fewer bars than the indicators' warm-up."""
+        return max(int(self.lookback or 0), self.warmup_bars())
+
+    def near_signal(self, distance: float) -> Tuple[bool, bool]:
+        """Whether the latest bar is within ``distance`` of an entry or exit signal."""
+        return False, False
+
+    def stream_indicators(self) -> pd.DataFrame:
+        """Advance the indicator engine over new bars and add its outputs as columns."""
+        if self.indicator_engine is None:
+            self.indicator_engine = IndicatorEngine(self.indicators())
+        for column, values in self.indicator_engine.advance(self.df).items():
+            self.df[column] = values
+        return self.df
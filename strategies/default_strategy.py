@@ -1,11 +1,17 @@
-import talib as ta
 from soltrade.config import config
+from soltrade.indicators import EMA, RSI, RollingStats
 from soltrade.log import log_general
+from soltrade.panel import CandlePanel, ema, rolling_std, rsi, sma
 from .base_strategy import BaseStrategy
+import numpy as np
 import pandas as pd
 
 
 class DefaultStrategy(BaseStrategy):
+    # EMA(21) is only SMA-seeded after 21 bars; the extra bars let it settle
+    # before the first signal is read
+    lookback = 50
+
     def __init__(self, df: pd.DataFrame):
         self.df = df
         self.stoploss = 5
@@ -13,22 +19,33 @@ class DefaultStrategy(BaseStrategy):
         self.trailing_stoploss = 2
         self.trailing_stoploss_target = 5
 
+    def indicators(self):
+        return {
+            "ema_s": EMA(5),
+            "ema_m": EMA(21),
+            "bband": RollingStats(14),
+            "rsi": RSI(14),
+        }
+
+    def near_signal(self, distance):
+        if "rsi" not in self.df.columns:
+            return False, False
+        last = self.df.iloc[-1]
+        bullish = last["ema_s"] > last["ema_m"] or last["close"] < last["lower_bband"]
+        bearish = last["ema_s"] < last["ema_m"] or last["close"] > last["upper_bband"]
+        near_entry = bool(bullish and last["rsi"] <= 30 + distance)
+        near_exit = bool(bearish and last["rsi"] >= 70 - distance)
+        return near_entry, near_exit
+
     def apply_strategy(self):
         if config().strategy == "default":
-            ### Populate default indicators:
-
-            # Calculates EMA
-            self.df["ema_s"] = ta.EMA(self.df["close"], timeperiod=5)
-            self.df["ema_m"] = ta.EMA(self.df["close"], timeperiod=21)
+            ### Populate default indicators (EMA, Bollinger Bands, RSI):
+            self.stream_indicators()
 
             # Bollinger Bands
-            sma = ta.SMA(self.df["close"], timeperiod=14)
-            std = self.df["close"].rolling(14).std()
-            self.df["upper_bband"] = sma + std * 2
-            self.df["lower_bband"] = sma - std * 2
-
-            # RSI
-            self.df["rsi"] = ta.RSI(self.df["close"], timeperiod=14)
+            self.df["upper_bband"] = self.df["bband_mean"] + self.df["bband_std"] * 2
+            self.df["lower_bband"] = self.df["bband_mean"] - self.df["bband_std"] * 2
+            self.df = self.df.drop(columns=["bband_mean", "bband_std"])
 
             # Entry
             entry = (
@@ -55,3 +72,39 @@ class DefaultStrategy(BaseStrategy):
             self.df.loc[exit, "exit"] = 1
 
         return self.df
+
+    def apply_panel(self, panel: CandlePanel):
+        columns = {}
+        if config().strategy == "default":
+            close = panel.close
+            ema_s = ema(close, 5)
+            ema_m = ema(close, 21)
+            bband_mean = sma(close, 14)
+            bband_std = rolling_std(close, 14)
+            upper_bband = bband_mean + bband_std * 2
+            lower_bband = bband_mean - bband_std * 2
+            rsi_values = rsi(close, 14)
+
+            entry = ((ema_s > ema_m) | (close < lower_bband)) & (rsi_values <= 30)
+            exit = ((ema_s < ema_m) | (close > upper_bband)) & (rsi_values >= 70)
+
+            if "takeprofit" in panel.columns:
+                exit |= close >= panel.columns["takeprofit"]
+
+            if "stoploss" in panel.columns:
+                exit |= close <= panel.columns["stoploss"]
+
+            if "trailing_stoploss" in panel.columns:
+                exit |= close <= panel.columns["trailing_stoploss"]
+
+            columns = {
+                "ema_s": ema_s,
+                "ema_m": ema_m,
+                "rsi": rsi_values,
+                "upper_bband": upper_bband,
+                "lower_bband": lower_bband,
+                "entry": np.where(entry, 1.0, np.nan),
+                "exit": np.where(exit, 1.0, np.nan),
+            }
+
+        return columns
@@ -0,0 +1,75 @@
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from soltrade import config as config_module
+from soltrade import resilience, robustness, sweep
+from soltrade.candles import records_frame
+from soltrade.config import Config
+
+
+class DefaultConfig(Config):
+    """The built-in defaults, without reading config.json."""
+
+    def load_config(self):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def default_config(monkeypatch):
+    cfg = DefaultConfig()
+    monkeypatch.setattr(config_module, "_config_instance", cfg)
+    # Endpoints keep breaker state and settings; start every test afresh
+    monkeypatch.setattr(resilience, "_endpoints", {})
+    return cfg
+
+
+def make_candles(bars=400, seed=1):
+    """Noisy sine-wave candles that make the default strategy trade."""
+    close = 100 + 10 * np.sin(np.arange(bars) / 40) + np.random.default_rng(seed).normal(0, 0.3, bars)
+    return pd.DataFrame(
+        {
+            "time": pd.date_range("2026-01-01", periods=bars, freq="min"),
+            "open": np.r_[close[0], close[:-1]],
+            "high": close + 0.2,
+            "low": close - 0.2,
+            "close": close,
+            "volume": np.ones(bars),
+        }
+    )
+
+
+@pytest.fixture
+def candles():
+    return make_candles
+
+
+class InProcessPool:
+    """``candle_pool`` without worker processes; records every task it runs."""
+
+    def __init__(self, monkeypatch):
+        self.monkeypatch = monkeypatch
+        self.tasks = []
+
+    @contextmanager
+    def __call__(self, records, settings, workers=None):
+        self.monkeypatch.setattr(sweep, "_worker_frame", records_frame(records))
+        self.monkeypatch.setattr(sweep, "_worker_settings", settings)
+        self.monkeypatch.setattr(sweep, "_worker_window", None)
+        self.monkeypatch.setattr(sweep, "_worker_indicator_cache", {})
+        yield self
+
+    def map(self, fn, *iterables, chunksize=1):
+        tasks = list(zip(*iterables))
+        self.tasks.extend(tasks)
+        return [fn(*task) for task in tasks]
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    pool = InProcessPool(monkeypatch)
+    monkeypatch.setattr(sweep, "candle_pool", pool)
+    monkeypatch.setattr(robustness, "candle_pool", pool)
+    return pool
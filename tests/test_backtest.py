@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from soltrade import backtest
+from soltrade.backtest import run_backtest
+from soltrade.panel import build_panel
+from soltrade.strategy import calc_trailing_stoploss, position_panel_columns
+from strategies.default_strategy import DefaultStrategy
+
+# Flat, then falling through the 5% stoploss of an entry at 100
+CLOSES = [100.0, 100.0, 100.0, 99.0, 97.0, 94.0, 90.0]
+ENTRY = 2
+STOPPED = 5
+POSITION = {
+    "position": True,
+    "entry_price": 100.0,
+    "stoploss": 95.0,
+    "takeprofit": 110.0,
+    "trailing_stoploss": np.nan,
+    "trailing_stoploss_target": 105.0,
+}
+
+
+def _candles(bars):
+    close = np.array(CLOSES[:bars])
+    return pd.DataFrame(
+        {
+            "time": pd.date_range("2026-01-01", periods=len(close), freq="min"),
+            "open": close,
+            "high": close,
+            "low": close,
+            "close": close,
+            "volume": np.ones(len(close)),
+        }
+    )
+
+
+@pytest.fixture
+def entry_at_bar_two(monkeypatch):
+    def generate_signals(df, strategy_name=None, params=None, indicator_cache=None):
+        signals = df.copy()
+        signals["entry"] = np.where(np.arange(len(df)) == ENTRY, 1.0, np.nan)
+        return signals, DefaultStrategy(df)
+
+    monkeypatch.setattr(backtest, "generate_signals", generate_signals)
+
+
+def test_backtest_exits_at_the_stoploss(entry_at_bar_two):
+    result = run_backtest(_candles(len(CLOSES)), fee_pct=0, slippage_pct=0)
+
+    trade = result.trades.iloc[0]
+    assert trade["reason"] == "stoploss"
+    assert trade["bars_held"] == STOPPED - ENTRY
+    assert trade["exit_price"] == CLOSES[STOPPED]
+
+
+def _live_frame(bars):
+    # What _analyse_each hands the strategy for a mint holding a position
+    df = _candles(bars)
+    for column, value in POSITION.items():
+        df[column] = value
+    return calc_trailing_stoploss(df)
+
+
+@pytest.mark.parametrize("bars, fired", [(STOPPED, False), (STOPPED + 1, True)])
+def test_live_strategy_exits_on_the_same_bar(bars, fired):
+    df = DefaultStrategy(_live_frame(bars)).apply_strategy()
+
+    assert (df["exit"].iat[-1] == 1) == fired
+
+
+@pytest.mark.parametrize("bars, fired", [(STOPPED, False), (STOPPED + 1, True)])
+def test_live_panel_exits_on_the_same_bar(bars, fired):
+    panel = build_panel([_candles(bars), _candles(bars)], ["HELD", "FLAT"])
+    panel.columns = position_panel_columns(panel, ["HELD", "FLAT"], [POSITION, None])
+
+    exits = DefaultStrategy(None).apply_panel(panel)["exit"][:, -1]
+
+    assert (exits[0] == 1) == fired
+    # Without a position there is nothing to stop out of
+    assert np.isnan(exits[1])
+
+
+def test_panel_has_no_position_columns_without_positions():
+    panel = build_panel([_candles(3)], ["FLAT"])
+
+    assert position_panel_columns(panel, ["FLAT"], [None]) == {}
+    assert position_panel_columns(panel, ["FLAT"], [{**POSITION, "position": False}]) == {}
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from soltrade import candles
+from soltrade.candles import CandleStore, candle_store
+
+STEP = 60
+T0 = 1_700_000_000 // STEP * STEP
+
+
+def _rows(minutes):
+    return [{"time": T0 + m * STEP, "close": 1.0} for m in minutes]
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = CandleStore(str(tmp_path / "candles" / "SOL_USDC_1m.bin"), 1, 50)
+    # Bars 0-9 and 20-29, with a hole in between
+    store.ingest(_rows([*range(0, 10), *range(20, 30)]))
+    return store
+
+
+def _gap_windows(store):
+    return store.pending_windows(T0 + 29 * STEP)[1:]
+
+
+def test_gap_is_asked_for_again_until_a_fetch_succeeds(store):
+    window = (T0 + 19 * STEP, 10)
+
+    assert _gap_windows(store) == [window]
+    # The request failed, so nothing was recorded
+    assert _gap_windows(store) == [window]
+
+    store.fetched(window[0])
+    assert _gap_windows(store) == []
+
+
+def test_gap_upstream_has_no_bars_for_is_not_asked_for_again(store):
+    to_ts, _ = _gap_windows(store)[0]
+
+    store.ingest([])
+    store.fetched(to_ts)
+
+    assert _gap_windows(store) == []
+    assert len(store.records()) == 20
+
+
+def test_backfilled_gap_is_merged(store):
+    to_ts, _ = _gap_windows(store)[0]
+
+    store.ingest(_rows(range(10, 20)))
+    store.fetched(to_ts)
+
+    np.testing.assert_array_equal(store.records()["time"], [T0 + m * STEP for m in range(30)])
+    assert _gap_windows(store) == []
+
+
+def test_shared_store_keeps_the_longest_history(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(candles, "_store_instances", {})
+
+    first = candle_store("SOL", "USDC", 1, 100)
+    second = candle_store("SOL", "USDC", 1, 300)
+    third = candle_store("SOL", "USDC", 1, 50)
+
+    assert first is second is third
+    assert first.history_bars == 300
@@ -0,0 +1,229 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+from solders.keypair import Keypair
+from solders.rpc.responses import GetSignatureStatusesResp
+
+from soltrade import transactions
+from soltrade.confirmations import MAX_SIGNATURES_PER_CALL, ConfirmationTracker
+
+
+def _signature(seed: int) -> str:
+    return str(Keypair().sign_message(bytes([seed % 256, seed // 256])))
+
+
+def _status(confirmation_status, err=None):
+    if confirmation_status is None:
+        return None
+    return {
+        "slot": 1,
+        "confirmations": None,
+        "err": err,
+        "status": {"Err": err} if err else {"Ok": None},
+        "confirmationStatus": confirmation_status,
+    }
+
+
+class FakeRpc:
+    """``get_signature_statuses`` answering each poll with ``statuses(poll, index)``."""
+
+    def __init__(self, statuses):
+        self.statuses = statuses
+        self.calls = []
+
+    async def get_signature_statuses(self, signatures):
+        self.calls.append(len(signatures))
+        poll = len(self.calls)
+        value = [self.statuses(poll, i) for i in range(len(signatures))]
+        return GetSignatureStatusesResp.from_json(
+            json.dumps({"jsonrpc": "2.0", "id": 1, "result": {"context": {"slot": 5}, "value": value}})
+        )
+
+
+class FailingRpc:
+    def __init__(self):
+        self.calls = 0
+
+    async def get_signature_statuses(self, signatures):
+        self.calls += 1
+        raise RuntimeError("status RPC down")
+
+
+def _confirm_all(tracker, signatures, timeout=5.0):
+    async def run():
+        return await asyncio.wait_for(
+            asyncio.gather(*(tracker.confirm(s, "TEST") for s in signatures)), timeout
+        )
+
+    return asyncio.run(run())
+
+
+def test_many_signatures_cost_one_call_per_poll(default_config):
+    rpc = FakeRpc(lambda poll, i: _status("confirmed" if poll == 1 else "finalized"))
+    default_config._async_client = rpc
+    tracker = ConfirmationTracker(poll_seconds=0.01, timeout_seconds=5)
+
+    results = _confirm_all(tracker, [_signature(i) for i in range(100)])
+
+    assert results == [True] * 100
+    assert rpc.calls[0] == 100
+
+
+def test_batches_are_capped_at_the_rpc_limit(default_config):
+    rpc = FakeRpc(lambda poll, i: _status("finalized"))
+    default_config._async_client = rpc
+    tracker = ConfirmationTracker(poll_seconds=0.01, timeout_seconds=5)
+
+    results = _confirm_all(tracker, [_signature(i) for i in range(MAX_SIGNATURES_PER_CALL + 4)])
+
+    assert all(results)
+    assert rpc.calls[:2] == [MAX_SIGNATURES_PER_CALL, 4]
+    assert len(tracker) == 0
+
+
+def test_error_on_chain_is_a_failure(default_config):
+    rpc = FakeRpc(lambda poll, i: _status("confirmed", {"InstructionError": [0, "InvalidArgument"]}))
+    default_config._async_client = rpc
+    tracker = ConfirmationTracker(poll_seconds=0.01, timeout_seconds=5)
+
+    assert _confirm_all(tracker, [_signature(1)]) == [False]
+
+
+def test_signature_never_seen_is_unknown_after_timeout(default_config):
+    default_config._async_client = FakeRpc(lambda poll, i: None)
+    tracker = ConfirmationTracker(poll_seconds=0.01, timeout_seconds=0.1)
+
+    assert _confirm_all(tracker, [_signature(1)]) == [None]
+    assert len(tracker) == 0
+
+
+def test_failing_status_calls_still_time_out(default_config):
+    rpc = FailingRpc()
+    default_config._async_client = rpc
+    tracker = ConfirmationTracker(poll_seconds=0.01, timeout_seconds=0.1)
+
+    assert _confirm_all(tracker, [_signature(1), _signature(2)], timeout=2.0) == [None, None]
+    assert rpc.calls > 0
+    assert len(tracker) == 0
+
+
+def test_confirmed_but_never_finalized_stays_confirmed(default_config):
+    rpc = FakeRpc(lambda poll, i: _status("confirmed"))
+    default_config._async_client = rpc
+    tracker = ConfirmationTracker(poll_seconds=0.01, timeout_seconds=0.1)
+
+    assert _confirm_all(tracker, [_signature(1)]) == [True]
+
+
+class _Swap:
+    """Stands in for Jupiter: every order executes with ``Success``."""
+
+    def __init__(self, outcome, rejected=0, execute_error=None, executed_input=None):
+        self.outcome = outcome
+        self.rejected = rejected
+        self.execute_error = execute_error
+        self.executed_input = executed_input
+        self.orders = 0
+        self.executed = 0
+
+    async def create_order(self, *args, **kwargs):
+        self.orders += 1
+        if self.orders <= self.rejected:
+            return {"errorCode": 1, "errorMessage": "no route"}
+        return {"requestId": str(self.orders), "transaction": "tx", "outAmount": "1000"}
+
+    async def execute_order(self, order, label="", signed_transaction=None):
+        self.executed += 1
+        if self.execute_error is not None:
+            raise self.execute_error
+        result = {"status": "Success", "signature": _signature(self.orders), "totalOutputAmount": "1000"}
+        if self.executed_input is not None:
+            result["totalInputAmount"] = self.executed_input
+        return result
+
+    async def confirm(self, signature, label="", submitted_at=None):
+        return self.outcome
+
+
+class _Cache:
+    def __init__(self):
+        self.invalidated = []
+
+    def invalidate(self, mint=None):
+        self.invalidated.append(mint)
+
+
+@pytest.fixture
+def swap(monkeypatch, default_config):
+    default_config.retry_base_delay_seconds = 0.001
+
+    def install(outcome, **kwargs):
+        fake = _Swap(outcome, **kwargs)
+        monkeypatch.setattr(transactions, "sign_transaction", lambda transaction: "signed")
+        monkeypatch.setattr(transactions, "create_order", fake.create_order)
+        monkeypatch.setattr(transactions, "execute_order", fake.execute_order)
+        monkeypatch.setattr(transactions, "confirmation_tracker", lambda: fake)
+        monkeypatch.setattr(default_config, "decimals", lambda mint: 1000)
+        return fake
+
+    return install
+
+
+def _perform_swap():
+    return asyncio.run(transactions.perform_swap(1.0, "IN", "OUT", "IN", "OUT"))
+
+
+def test_unknown_outcome_is_not_requoted(swap):
+    fake = swap(None)
+
+    with pytest.raises(transactions.SwapOutcomeUnknown):
+        _perform_swap()
+    assert fake.orders == 1
+
+
+def test_failure_on_chain_is_requoted(swap):
+    fake = swap(False)
+
+    assert _perform_swap() is None
+    assert fake.orders == 3
+
+
+def test_confirmed_swap_returns_the_output_amount(swap):
+    fake = swap(True)
+
+    assert _perform_swap().output_amount == 1.0
+    assert fake.orders == 1
+
+
+def test_confirmed_swap_returns_the_executed_input_amount(swap):
+    # A pre-fetched order may have been sized a little below the signal
+    swap(True, executed_input="980")
+
+    assert _perform_swap() == transactions.SwapFill(input_amount=0.98, output_amount=1.0)
+
+
+def test_input_amount_falls_back_to_the_amount_asked_for(swap):
+    swap(True)
+
+    assert _perform_swap().input_amount == 1.0
+
+
+def test_error_after_submitting_is_an_unknown_outcome(swap, monkeypatch):
+    fake = swap(True, execute_error=httpx.ReadTimeout("no response"))
+    cache = _Cache()
+    monkeypatch.setattr(transactions, "balance_cache", lambda: cache)
+
+    with pytest.raises(transactions.SwapOutcomeUnknown):
+        _perform_swap()
+    assert fake.executed == 1
+    assert cache.invalidated == ["IN", "OUT"]
+
+
+def test_error_before_submitting_is_requoted(swap):
+    fake = swap(True, rejected=2)
+
+    assert _perform_swap().output_amount == 1.0
+    assert fake.orders == 3
+    assert fake.executed == 1
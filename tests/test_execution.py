@@ -0,0 +1,38 @@
+import pytest
+
+from soltrade.execution import allocate
+
+SYMBOLS = ["A", "B", "C"]
+
+
+def test_equal_splits_the_budget_evenly():
+    assert allocate(90.0, SYMBOLS, "equal") == {"A": 30.0, "B": 30.0, "C": 30.0}
+
+
+def test_fraction_is_handed_out_in_signal_order_until_it_runs_out():
+    assert allocate(100.0, SYMBOLS, "fraction", 0.4) == {"A": 40.0, "B": 40.0, "C": 20.0}
+
+
+def test_first_takes_the_whole_budget():
+    assert allocate(100.0, SYMBOLS, "first") == {"A": 100.0, "B": 0.0, "C": 0.0}
+
+
+def test_nothing_is_allocated_without_a_budget():
+    assert allocate(0.0, SYMBOLS, "equal") == {"A": 0.0, "B": 0.0, "C": 0.0}
+    assert allocate(100.0, [], "equal") == {}
+
+
+def test_shares_below_the_minimum_are_dropped():
+    assert allocate(90.0, SYMBOLS, "equal", min_value=50.0) == {"A": 0.0, "B": 0.0, "C": 0.0}
+    assert allocate(100.0, SYMBOLS, "fraction", 0.45, min_value=20.0) == {
+        "A": 45.0,
+        "B": 45.0,
+        "C": 0.0,
+    }
+    # A share exactly at the minimum is kept
+    assert allocate(90.0, SYMBOLS, "equal", min_value=30.0) == {"A": 30.0, "B": 30.0, "C": 30.0}
+
+
+def test_unknown_policy_is_rejected():
+    with pytest.raises(ValueError):
+        allocate(100.0, SYMBOLS, "largest")
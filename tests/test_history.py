@@ -0,0 +1,102 @@
+import numpy as np
+import pytest
+
+from soltrade import history
+from soltrade.candles import CANDLE_DTYPE
+from soltrade.history import STEP, HistoryStore
+
+T0 = 1_700_000_000 // STEP * STEP
+
+
+def _bars(minutes):
+    records = np.zeros(len(minutes), dtype=CANDLE_DTYPE)
+    records["time"] = [T0 + m * STEP for m in minutes]
+    records["close"] = 1.0
+    return records
+
+
+def _minute(m):
+    return T0 + m * STEP
+
+
+@pytest.fixture
+def store(tmp_path):
+    return HistoryStore(str(tmp_path / "history" / "SOLUSDT_1m.bin"))
+
+
+def test_empty_store_is_missing_everything(store):
+    assert store.missing_ranges(_minute(0), _minute(9)) == [(_minute(0), _minute(9))]
+
+
+def test_interior_gaps_are_missing(store):
+    store.merge(_bars([*range(0, 10), *range(15, 20), 25]))
+
+    assert store.missing_ranges(_minute(0), _minute(29)) == [
+        (_minute(10), _minute(14)),
+        (_minute(20), _minute(24)),
+        (_minute(26), _minute(29)),
+    ]
+
+
+def test_edges_outside_the_stored_history_are_missing(store):
+    store.merge(_bars(range(10, 20)))
+
+    assert store.missing_ranges(_minute(5), _minute(24)) == [
+        (_minute(5), _minute(9)),
+        (_minute(20), _minute(24)),
+    ]
+    assert store.missing_ranges(_minute(12), _minute(15)) == []
+
+
+def test_checked_ranges_are_not_missing(store):
+    store.merge(_bars([*range(0, 10), *range(20, 30)]))
+    store.mark_checked(_minute(12), _minute(15))
+    store.mark_checked(_minute(16), _minute(17))
+
+    assert store.checked_ranges() == [(_minute(12), _minute(17))]
+    assert store.missing_ranges(_minute(0), _minute(29)) == [
+        (_minute(10), _minute(11)),
+        (_minute(18), _minute(19)),
+    ]
+
+
+class FakeExchange:
+    """Serves 1-minute bars for ``listed`` minutes only."""
+
+    def __init__(self, listed):
+        self.listed = set(listed)
+        self.requests = []
+
+    async def download_range(self, symbol, start, end):
+        self.requests.append((start, end))
+        minutes = [m for m in sorted(self.listed) if start <= _minute(m) <= end]
+        return _bars(minutes)
+
+
+def test_empty_ranges_are_downloaded_once(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    # Listed at minute 100, with an outage at 150-159
+    exchange = FakeExchange(m for m in range(100, 200) if not 150 <= m < 160)
+    monkeypatch.setattr(history, "download_range", exchange.download_range)
+
+    first = history.load_candles("SOLUSDT", _minute(0), _minute(199))
+    assert len(first) == 90
+    assert exchange.requests == [(_minute(0), _minute(199))]
+
+    second = history.load_candles("SOLUSDT", _minute(0), _minute(199))
+    assert len(second) == 90
+    assert exchange.requests == [(_minute(0), _minute(199))]
+
+
+def test_only_the_new_tail_is_downloaded(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    exchange = FakeExchange(range(0, 100))
+    monkeypatch.setattr(history, "download_range", exchange.download_range)
+
+    history.load_candles("SOLUSDT", _minute(0), _minute(49))
+    exchange.requests.clear()
+    # Bars past the newest one may not be published yet, so they stay missing
+    history.load_candles("SOLUSDT", _minute(0), _minute(120))
+    history.load_candles("SOLUSDT", _minute(0), _minute(120))
+
+    assert exchange.requests == [(_minute(50), _minute(120)), (_minute(100), _minute(120))]
@@ -0,0 +1,115 @@
+import numpy as np
+import pandas as pd
+import pytest
+import talib
+
+from soltrade.indicators import EMA, RSI, IndicatorEngine, RollingStats
+
+
+@pytest.fixture
+def closes():
+    rng = np.random.default_rng(7)
+    return 100 * np.exp(np.cumsum(rng.normal(0, 0.01, 300)))
+
+
+def _frame(closes, start="2026-01-01"):
+    time = pd.date_range(start, periods=len(closes), freq="min")
+    return pd.DataFrame({"time": time, "close": closes})
+
+
+def _stream(indicator, closes):
+    columns = {}
+    for close in closes:
+        indicator.update(float(close))
+        for key, value in indicator.outputs().items():
+            columns.setdefault(key, []).append(value)
+    return {key: np.asarray(values) for key, values in columns.items()}
+
+
+def _references(closes):
+    return {
+        "ema_s": talib.EMA(closes, timeperiod=5),
+        "ema_m": talib.EMA(closes, timeperiod=21),
+        "rsi": talib.RSI(closes, timeperiod=14),
+        "bband_mean": talib.SMA(closes, timeperiod=14),
+        "bband_std": pd.Series(closes).rolling(14).std().to_numpy(),
+    }
+
+
+def _engine():
+    return IndicatorEngine(
+        {"ema_s": EMA(5), "ema_m": EMA(21), "bband": RollingStats(14), "rsi": RSI(14)}
+    )
+
+
+@pytest.mark.parametrize(
+    "make, reference",
+    [
+        (lambda: EMA(5), lambda c: {"value": talib.EMA(c, timeperiod=5)}),
+        (lambda: EMA(21), lambda c: {"value": talib.EMA(c, timeperiod=21)}),
+        (lambda: RSI(14), lambda c: {"value": talib.RSI(c, timeperiod=14)}),
+        (
+            lambda: RollingStats(14),
+            lambda c: {
+                "mean": talib.SMA(c, timeperiod=14),
+                "std": pd.Series(c).rolling(14).std().to_numpy(),
+            },
+        ),
+    ],
+    ids=["ema5", "ema21", "rsi14", "rolling14"],
+)
+def test_streaming_and_batch_match_talib(make, reference, closes):
+    expected = reference(closes)
+    streamed = _stream(make(), closes)
+    batched = make().batch(closes)
+
+    for key, values in expected.items():
+        np.testing.assert_allclose(streamed[key], values, rtol=1e-9, atol=1e-9, equal_nan=True)
+        np.testing.assert_allclose(batched[key], values, rtol=1e-9, atol=1e-9, equal_nan=True)
+
+
+def test_engine_only_feeds_new_bars_and_matches_talib(closes):
+    engine = _engine()
+    df = _frame(closes)
+
+    for end in range(50, len(closes) + 1, 25):
+        window = df.iloc[max(0, end - 100) : end].reset_index(drop=True)
+        outputs = engine.advance(window)
+
+    expected = _references(closes)
+    for column, values in expected.items():
+        np.testing.assert_allclose(
+            outputs[column], values[-100:], rtol=1e-9, atol=1e-9, equal_nan=True
+        )
+
+
+def test_revised_forming_bar_is_rolled_back(closes):
+    engine = _engine()
+    df = _frame(closes)
+    engine.advance(df.iloc[:-1])
+
+    # The last bar is still forming: it is seen several times with new closes
+    for close in (closes[-1] * 0.98, closes[-1] * 1.03, closes[-1]):
+        forming = df.copy()
+        forming.loc[forming.index[-1], "close"] = close
+        outputs = engine.advance(forming)
+
+    expected = _references(closes)
+    for column, values in expected.items():
+        np.testing.assert_allclose(outputs[column], values, rtol=1e-9, atol=1e-9, equal_nan=True)
+
+
+def test_state_round_trip_resumes_where_it_left_off(closes):
+    df = _frame(closes)
+    engine = _engine()
+    engine.advance(df.iloc[:200])
+
+    restored = _engine()
+    restored.load_state(engine.state())
+    outputs = restored.advance(df)
+
+    expected = _references(closes)
+    for column, values in expected.items():
+        np.testing.assert_allclose(
+            outputs[column][200:], values[200:], rtol=1e-9, atol=1e-9, equal_nan=True
+        )
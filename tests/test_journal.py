@@ -0,0 +1,148 @@
+import math
+
+import pandas as pd
+import pytest
+
+from soltrade import clock as clock_module
+from soltrade.clock import VirtualClock
+from soltrade.journal import POSITION_COLUMNS, TradeJournal
+
+STATE = {
+    "entry_price": 2.0,
+    "takeprofit": 2.5,
+    "stoploss": 1.8,
+    "trailing_stoploss": math.nan,
+    "trailing_stoploss_target": 2.2,
+}
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "data" / "soltrade.db")
+
+
+@pytest.fixture
+def journal(path):
+    journal = TradeJournal(path)
+    yield journal
+    journal.close()
+
+
+def test_unknown_mint_has_no_position(journal):
+    assert journal.latest_position("MINT") is None
+
+
+def test_entry_opens_the_position_and_records_a_buy(journal):
+    journal.record_entry("MINT", "TOKEN", 50.0, STATE)
+
+    state = journal.latest_position("MINT")
+    assert state["position"] is True
+    assert state["entry_price"] == 2.0
+    assert state["stoploss"] == 1.8
+    assert math.isnan(state["trailing_stoploss"])
+    fills = journal.fills("MINT")
+    assert fills[["side", "price", "amount"]].values.tolist() == [["buy", 2.0, 50.0]]
+
+
+def test_exit_closes_the_position_and_records_a_sell(journal):
+    journal.record_entry("MINT", "TOKEN", 50.0, STATE)
+
+    journal.record_exit("MINT", "TOKEN", 2.4, 25.0)
+
+    state = journal.latest_position("MINT")
+    assert state["position"] is False
+    assert math.isnan(state["entry_price"])
+    assert journal.fills("MINT")["side"].tolist() == ["buy", "sell"]
+
+
+def test_partial_exit_leaves_the_remainder_open(journal):
+    journal.record_entry("MINT", "TOKEN", 50.0, STATE)
+
+    journal.record_partial_exit("MINT", "TOKEN", 2.4, 10.0, STATE)
+
+    state = journal.latest_position("MINT")
+    assert state["position"] is True
+    assert state["entry_price"] == 2.0
+    assert state["takeprofit"] == 2.5
+    sell = journal.fills("MINT").iloc[-1]
+    assert (sell["side"], sell["price"], sell["amount"]) == ("sell", 2.4, 10.0)
+
+
+def test_close_position_records_no_fill(journal):
+    journal.record_entry("MINT", "TOKEN", 50.0, STATE)
+
+    journal.close_position("MINT", "TOKEN")
+
+    assert journal.latest_position("MINT")["position"] is False
+    assert journal.fills("MINT")["side"].tolist() == ["buy"]
+
+
+def test_entry_time_is_that_of_the_last_buy(journal, monkeypatch):
+    virtual = VirtualClock(start=100.0, speed=math.inf)
+    monkeypatch.setattr(clock_module, "_clock_instance", virtual)
+
+    assert journal.entry_time("MINT") is None
+    journal.record_entry("MINT", "TOKEN", 50.0, STATE)
+    virtual.advance(100)
+    journal.record_exit("MINT", "TOKEN", 2.4, 25.0)
+    virtual.advance(100)
+    journal.record_entry("MINT", "TOKEN", 40.0, STATE)
+    virtual.advance(100)
+    journal.record_partial_exit("MINT", "TOKEN", 2.4, 10.0, STATE)
+
+    assert journal.entry_time("MINT") == 300.0
+
+
+def test_fills_can_be_read_for_every_mint(journal):
+    journal.record_entry("MINT", "TOKEN", 50.0, STATE)
+    journal.record_entry("OTHER", "OTHER", 5.0, STATE)
+
+    assert journal.fills()["mint"].tolist() == ["MINT", "OTHER"]
+    assert journal.fills("OTHER")["mint"].tolist() == ["OTHER"]
+
+
+def test_positions_survive_reopening_the_wal_database(path):
+    first = TradeJournal(path)
+    first.record_entry("MINT", "TOKEN", 50.0, STATE)
+    first.record_partial_exit("MINT", "TOKEN", 2.4, 10.0, STATE)
+    first.close()
+
+    reopened = TradeJournal(path)
+    try:
+        assert reopened._conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert reopened.latest_position("MINT")["position"] is True
+        assert reopened.latest_position("MINT")["entry_price"] == 2.0
+        assert len(reopened.fills("MINT")) == 2
+    finally:
+        reopened.close()
+
+
+def _legacy_csv(tmp_path, position=True, entry_price=2.0):
+    csv_path = tmp_path / "TOKEN_data.csv"
+    row = {"close": 2.1, **STATE, "entry_price": entry_price, "position": position}
+    pd.DataFrame([{**row, "position": False}, row]).to_csv(csv_path, index=False)
+    return str(csv_path)
+
+
+def test_open_csv_position_is_imported_once(journal, tmp_path):
+    journal.import_csv_position("MINT", "TOKEN", _legacy_csv(tmp_path))
+
+    state = journal.latest_position("MINT")
+    assert state["position"] is True
+    assert {col: state[col] for col in POSITION_COLUMNS[1:4]} == {
+        "entry_price": 2.0,
+        "takeprofit": 2.5,
+        "stoploss": 1.8,
+    }
+    assert journal.fills("MINT").empty
+
+    # A later run, with a different legacy file, keeps the journal as it is
+    journal.import_csv_position("MINT", "TOKEN", _legacy_csv(tmp_path, entry_price=9.0))
+    assert journal.latest_position("MINT")["entry_price"] == 2.0
+
+
+def test_closed_or_missing_csv_position_is_not_imported(journal, tmp_path):
+    journal.import_csv_position("MINT", "TOKEN", _legacy_csv(tmp_path, position=False))
+    journal.import_csv_position("MINT", "TOKEN", str(tmp_path / "missing.csv"))
+
+    assert journal.latest_position("MINT") is None
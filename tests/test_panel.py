@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+import pytest
+import talib
+
+from soltrade.panel import build_panel, ema, rolling_std, rsi, sma
+from strategies.default_strategy import DefaultStrategy
+
+LENGTHS = (300, 120, 40, 10)
+
+
+@pytest.fixture
+def frames():
+    rng = np.random.default_rng(21)
+    frames = []
+    for length in LENGTHS:
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, length)))
+        frames.append(
+            pd.DataFrame(
+                {
+                    "time": pd.date_range(end="2026-01-01", periods=length, freq="min"),
+                    "open": close,
+                    "high": close * 1.002,
+                    "low": close * 0.998,
+                    "close": close,
+                    "volume": np.ones(length),
+                }
+            )
+        )
+    return frames
+
+
+@pytest.mark.parametrize(
+    "panel_indicator, reference",
+    [
+        (lambda c: ema(c, 5), lambda c: talib.EMA(c, timeperiod=5)),
+        (lambda c: ema(c, 21), lambda c: talib.EMA(c, timeperiod=21)),
+        (lambda c: rsi(c, 14), lambda c: talib.RSI(c, timeperiod=14)),
+        (lambda c: sma(c, 14), lambda c: talib.SMA(c, timeperiod=14)),
+        (lambda c: rolling_std(c, 14), lambda c: pd.Series(c).rolling(14).std().to_numpy()),
+    ],
+    ids=["ema5", "ema21", "rsi14", "sma14", "std14"],
+)
+def test_panel_indicators_match_talib_per_row(panel_indicator, reference, frames):
+    panel = build_panel(frames, [f"MINT{i}" for i in range(len(frames))])
+
+    outputs = panel_indicator(panel.close)
+
+    assert outputs.shape == panel.close.shape
+    for row, df in enumerate(frames):
+        padding = panel.close.shape[1] - len(df)
+        assert np.isnan(outputs[row, :padding]).all()
+        np.testing.assert_allclose(
+            outputs[row, padding:],
+            reference(df["close"].to_numpy()),
+            rtol=1e-9,
+            atol=1e-9,
+            equal_nan=True,
+        )
+
+
+def test_apply_panel_signals_match_the_per_mint_strategy(frames):
+    panel = build_panel(frames, [f"MINT{i}" for i in range(len(frames))])
+
+    columns = DefaultStrategy(None).apply_panel(panel)
+
+    for row, df in enumerate(frames):
+        expected = DefaultStrategy(df.copy()).apply_strategy()
+        got = panel.frame(row, columns)
+        for column in ("ema_s", "ema_m", "rsi", "upper_bband", "lower_bband"):
+            np.testing.assert_allclose(
+                got[column], expected[column], rtol=1e-9, atol=1e-9, equal_nan=True
+            )
+        for column in ("entry", "exit"):
+            expected_signal = expected.get(column, pd.Series(np.nan, index=expected.index))
+            np.testing.assert_array_equal(
+                got[column].fillna(0).to_numpy(), expected_signal.fillna(0).to_numpy()
+            )
@@ -0,0 +1,27 @@
+from soltrade.prefetch import OrderPrefetcher, PrefetchedOrder
+
+
+def _prefetcher_with(amount):
+    prefetcher = OrderPrefetcher()
+    prefetcher._orders[("IN", "OUT")] = PrefetchedOrder(
+        order={"transaction": "tx"}, amount=amount, expires_at=float("inf")
+    )
+    return prefetcher
+
+
+def test_order_slightly_smaller_than_the_trade_is_used(default_config):
+    default_config.prefetch_size_tolerance_pct = 1
+
+    assert _prefetcher_with(99.5).take(100.0, "IN", "OUT") == {"transaction": "tx"}
+
+
+def test_order_larger_than_the_trade_is_discarded(default_config):
+    default_config.prefetch_size_tolerance_pct = 1
+
+    assert _prefetcher_with(100.5).take(100.0, "IN", "OUT") is None
+
+
+def test_order_too_small_for_the_trade_is_discarded(default_config):
+    default_config.prefetch_size_tolerance_pct = 1
+
+    assert _prefetcher_with(98.0).take(100.0, "IN", "OUT") is None
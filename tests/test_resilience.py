@@ -0,0 +1,197 @@
+import math
+
+import httpx
+import pytest
+import requests
+
+from soltrade import clock as clock_module
+from soltrade.clock import VirtualClock
+from soltrade.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    Endpoint,
+    RetryBudget,
+    RetryPolicy,
+    classify,
+)
+
+
+@pytest.fixture
+def virtual_clock(monkeypatch):
+    virtual = VirtualClock(start=1_000_000.0, speed=math.inf)
+    monkeypatch.setattr(clock_module, "_clock_instance", virtual)
+    return virtual
+
+
+def _fail(breaker, times):
+    for _ in range(times):
+        assert breaker.allow()
+        breaker.record_failure()
+
+
+def test_circuit_opens_after_consecutive_failures(virtual_clock):
+    breaker = CircuitBreaker(failure_threshold=3, reset_seconds=30)
+
+    _fail(breaker, 2)
+    assert breaker.state == "closed"
+    _fail(breaker, 1)
+
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+
+def test_half_open_lets_a_single_trial_through(virtual_clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=30)
+    _fail(breaker, 1)
+
+    virtual_clock.advance(29)
+    assert not breaker.allow()
+    virtual_clock.advance(1)
+
+    assert breaker.allow()
+    assert breaker.state == "half_open"
+    assert not breaker.allow()
+
+
+def test_successful_trial_closes_the_circuit(virtual_clock):
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=30)
+    _fail(breaker, 2)
+    virtual_clock.advance(30)
+
+    assert breaker.allow()
+    breaker.record_success()
+
+    assert breaker.state == "closed"
+    # The failure count starts over
+    _fail(breaker, 1)
+    assert breaker.state == "closed"
+
+
+def test_failed_trial_reopens_the_circuit(virtual_clock):
+    breaker = CircuitBreaker(failure_threshold=5, reset_seconds=30)
+    _fail(breaker, 5)
+    virtual_clock.advance(30)
+
+    assert breaker.allow()
+    assert breaker.record_failure()
+
+    assert breaker.state == "open"
+    assert breaker.remaining() == 30
+    assert not breaker.allow()
+
+
+def test_abandoned_trial_frees_the_half_open_slot(virtual_clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=30)
+    _fail(breaker, 1)
+    virtual_clock.advance(30)
+
+    assert breaker.allow()
+    breaker.abandon()
+
+    assert breaker.allow()
+
+
+def test_hold_keeps_the_circuit_open_longer(virtual_clock):
+    breaker = CircuitBreaker(failure_threshold=5, reset_seconds=30)
+
+    assert breaker.record_failure(hold=120)
+
+    assert breaker.state == "open"
+    assert breaker.remaining() == 120
+
+
+def test_retry_budget_spends_its_reserve_then_only_earns_the_ratio():
+    budget = RetryBudget(ratio=0.2, reserve=10)
+
+    assert sum(budget.withdraw() for _ in range(20)) == 10
+    for _ in range(10):
+        budget.deposit()
+    assert sum(budget.withdraw() for _ in range(20)) == 2
+
+
+def test_retry_budget_reserve_is_a_cap():
+    budget = RetryBudget(ratio=0.5, reserve=3)
+
+    for _ in range(100):
+        budget.deposit()
+
+    assert sum(budget.withdraw() for _ in range(10)) == 3
+
+
+def _endpoint(attempts=3, failure_threshold=1000, ratio=0.2):
+    return Endpoint(
+        "test",
+        RetryPolicy(attempts=attempts, base_delay=0.01, max_delay=1),
+        RetryBudget(ratio=ratio, reserve=10),
+        CircuitBreaker(failure_threshold=failure_threshold, reset_seconds=30),
+    )
+
+
+def test_failing_upstream_load_is_capped_by_the_budget(virtual_clock):
+    endpoint = _endpoint(attempts=5)
+    attempts = 0
+
+    def request():
+        nonlocal attempts
+        attempts += 1
+        raise requests.ConnectionError("down")
+
+    calls = 200
+    for _ in range(calls):
+        with pytest.raises(requests.ConnectionError):
+            endpoint.call_sync(request)
+
+    retries = attempts - calls
+    assert retries <= 10 + 0.2 * calls
+    assert retries < calls * (endpoint.policy.attempts - 1)
+
+
+def test_request_refused_by_the_upstream_is_not_retried(virtual_clock):
+    endpoint = _endpoint()
+    attempts = 0
+    response = httpx.Response(400, request=httpx.Request("GET", "https://example.invalid"))
+
+    def request():
+        nonlocal attempts
+        attempts += 1
+        raise httpx.HTTPStatusError("bad request", request=response.request, response=response)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        endpoint.call_sync(request)
+
+    assert attempts == 1
+    assert endpoint.breaker.state == "closed"
+
+
+def test_open_circuit_fails_fast_without_calling(virtual_clock):
+    endpoint = _endpoint(attempts=1, failure_threshold=1)
+    attempts = 0
+
+    def request():
+        nonlocal attempts
+        attempts += 1
+        raise requests.Timeout("slow")
+
+    with pytest.raises(requests.Timeout):
+        endpoint.call_sync(request)
+    with pytest.raises(CircuitOpenError):
+        endpoint.call_sync(request)
+
+    assert attempts == 1
+
+
+def test_classify_follows_wrapped_errors_and_retry_after():
+    response = httpx.Response(
+        429,
+        headers={"Retry-After": "7"},
+        request=httpx.Request("GET", "https://example.invalid"),
+    )
+    try:
+        try:
+            raise httpx.HTTPStatusError("throttled", request=response.request, response=response)
+        except httpx.HTTPStatusError as e:
+            raise RuntimeError("client wrapper") from e
+    except RuntimeError as wrapped:
+        assert classify(wrapped) == (True, 7.0)
+
+    assert classify(ValueError("bad input")) == (False, None)
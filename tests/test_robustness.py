@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from soltrade.robustness import monte_carlo, walk_forward, walk_forward_folds
+
+
+def test_folds_roll_forward_by_one_out_of_sample_window():
+    assert walk_forward_folds(100, 40, 20, 10) == [
+        (0, 40, 40, 60),
+        (20, 60, 60, 80),
+        (40, 80, 80, 100),
+    ]
+
+
+def test_last_fold_must_fit_entirely():
+    assert walk_forward_folds(99, 40, 20, 10) == [(0, 40, 40, 60), (20, 60, 60, 80)]
+    assert walk_forward_folds(59, 40, 20, 10) == []
+
+
+def test_warmup_longer_than_the_in_sample_window_is_rejected():
+    with pytest.raises(ValueError):
+        walk_forward_folds(100, 40, 20, 41)
+
+
+def test_out_of_sample_runs_start_a_warmup_early(pool, candles):
+    df = candles(400)
+    grid = [{"stoploss": 2.0}, {"stoploss": 5.0}]
+
+    folds = walk_forward(df, grid, 200, 100, warmup_bars=50)
+
+    in_sample = [task[1] for task in pool.tasks if len(task) == 2]
+    out_of_sample = [task[1] for task in pool.tasks if len(task) == 3]
+    assert in_sample == [(0, 200, 0)] * 2 + [(100, 300, 0)] * 2
+    assert out_of_sample == [(150, 300, 50), (250, 400, 50)]
+    assert folds["out_of_sample_start"].tolist() == [df["time"].iat[200], df["time"].iat[300]]
+    assert folds["out_of_sample_end"].tolist() == [df["time"].iat[299], df["time"].iat[399]]
+
+
+def test_shuffled_paths_keep_the_final_return():
+    returns = [5.0, -3.0, 2.0, -1.0]
+
+    paths = monte_carlo(returns, simulations=50, method="shuffle", seed=7, workers=1)
+
+    expected = (np.prod(1 + np.array(returns) / 100) - 1) * 100
+    np.testing.assert_allclose(paths["total_return_pct"], expected)
+    assert (paths["max_drawdown_pct"] >= 0).all()
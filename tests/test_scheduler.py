@@ -0,0 +1,102 @@
+import math
+
+import pytest
+
+from soltrade import clock as clock_module
+from soltrade.clock import VirtualClock
+from soltrade.scheduler import BarScheduler
+
+# A minute boundary, so bar closes fall on multiples of 60 from here
+T0 = 1_700_000_000 // 3600 * 3600
+
+
+@pytest.fixture
+def virtual_clock(monkeypatch):
+    virtual = VirtualClock(start=T0 + 10.0, speed=math.inf)
+    monkeypatch.setattr(clock_module, "_clock_instance", virtual)
+    return virtual
+
+
+def test_bar_is_due_once_it_has_settled(virtual_clock):
+    scheduler = BarScheduler({"A": 60}, settle_seconds=2)
+    scheduler.complete("A", T0)
+
+    virtual_clock.advance(51)
+    assert scheduler.due() == {}
+    assert scheduler.next_wake() == T0 + 62
+
+    virtual_clock.advance(1)
+    assert scheduler.due() == {"A": T0 + 60}
+
+
+def test_bar_stays_due_until_completed(virtual_clock):
+    scheduler = BarScheduler({"A": 60})
+
+    assert scheduler.due() == {"A": T0}
+    assert scheduler.due() == {"A": T0}
+    scheduler.complete("A", T0)
+
+    assert scheduler.due() == {}
+
+
+def test_overrun_catches_up_on_the_latest_bar_only(virtual_clock):
+    scheduler = BarScheduler({"A": 60})
+    scheduler.complete("A", T0)
+
+    # A pass that took long enough for three more bars to close
+    virtual_clock.advance(185)
+
+    assert scheduler.due() == {"A": T0 + 180}
+    assert scheduler.next_wake() == virtual_clock.time()
+    scheduler.complete("A", T0 + 180)
+    assert scheduler.due() == {}
+    assert scheduler.next_wake() == T0 + 240
+
+
+def test_completing_an_older_bar_does_not_go_back(virtual_clock):
+    scheduler = BarScheduler({"A": 60})
+    scheduler.complete("A", T0)
+    scheduler.complete("A", T0 - 60)
+
+    assert scheduler.due() == {}
+
+
+def test_next_wake_is_the_earliest_close_across_intervals(virtual_clock):
+    scheduler = BarScheduler({"A": 60, "B": 300}, settle_seconds=1)
+    scheduler.complete("A", T0)
+    scheduler.complete("B", T0)
+
+    assert scheduler.next_wake() == T0 + 61
+    virtual_clock.advance(51)
+    assert scheduler.due() == {"A": T0 + 60}
+    scheduler.complete("A", T0 + 60)
+
+    virtual_clock.advance(240)
+    assert scheduler.due() == {"A": T0 + 300, "B": T0 + 300}
+
+
+def test_retry_holds_the_bar_back_for_the_delay(virtual_clock):
+    scheduler = BarScheduler({"A": 60, "B": 60})
+
+    scheduler.retry("A", 5)
+
+    assert scheduler.due() == {"B": T0}
+    assert scheduler.next_wake() == virtual_clock.time()
+    scheduler.complete("B", T0)
+    assert scheduler.next_wake() == T0 + 15
+
+    virtual_clock.advance(5)
+    assert scheduler.due() == {"A": T0}
+    scheduler.complete("A", T0)
+    assert scheduler.due() == {}
+    # Completing clears the retry, so the next bar is due on time
+    virtual_clock.advance(45)
+    assert scheduler.due() == {"A": T0 + 60, "B": T0 + 60}
+
+
+def test_wait_sleeps_until_the_next_close(virtual_clock):
+    scheduler = BarScheduler({"A": 60}, settle_seconds=2)
+    scheduler.complete("A", T0)
+
+    assert scheduler.wait() == {"A": T0 + 60}
+    assert virtual_clock.time() == T0 + 62
@@ -0,0 +1,63 @@
+import asyncio
+import base64
+
+from solders.hash import Hash
+from solders.keypair import Keypair
+from solders.message import MessageV0, to_bytes_versioned
+from solders.signature import Signature
+from solders.system_program import TransferParams, transfer
+from solders.transaction import VersionedTransaction
+
+from soltrade.signer import Signer, sign_with
+
+
+def _unsigned_transaction(keypair, lamports):
+    taker = keypair.pubkey()
+    message = MessageV0.try_compile(
+        taker,
+        [transfer(TransferParams(from_pubkey=taker, to_pubkey=taker, lamports=lamports))],
+        [],
+        Hash.default(),
+    )
+    transaction = VersionedTransaction.populate(message, [Signature.default()])
+    return base64.b64encode(bytes(transaction)).decode("utf-8")
+
+
+def _decode(transaction_b64):
+    return VersionedTransaction.from_bytes(base64.b64decode(transaction_b64))
+
+
+def test_batches_are_signed_in_order():
+    keypair = Keypair()
+    unsigned = [_unsigned_transaction(keypair, lamports) for lamports in range(20)]
+    signer = Signer(keypair)
+
+    signed = signer.sign_many(unsigned)
+
+    assert len(signed) == len(unsigned)
+    for before, after in zip(unsigned, signed):
+        transaction = _decode(after)
+        assert transaction.message == _decode(before).message
+        assert transaction.signatures[0].verify(
+            keypair.pubkey(), to_bytes_versioned(transaction.message)
+        )
+    assert signed == [sign_with(keypair, transaction) for transaction in unsigned]
+
+
+def test_async_batches_keep_their_order():
+    keypair = Keypair()
+    unsigned = [_unsigned_transaction(keypair, lamports) for lamports in range(20)]
+    signer = Signer(keypair)
+
+    async def sign_both():
+        return await asyncio.gather(
+            signer.sign_many_async(unsigned), signer.sign_many_async(unsigned[::-1])
+        )
+
+    try:
+        forward, backward = asyncio.run(sign_both())
+    finally:
+        signer.close()
+
+    assert forward == signer.sign_many(unsigned)
+    assert backward == forward[::-1]
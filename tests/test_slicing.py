@@ -0,0 +1,209 @@
+import asyncio
+import threading
+
+import pandas as pd
+import pytest
+
+from soltrade import metrics as metrics_module
+from soltrade import slicing
+from soltrade.execution import Order
+from soltrade.metrics import LatencyMetrics
+from soltrade.slicing import OrderSlicer, SlicePlan
+from soltrade.transactions import SwapFill, SwapOutcomeUnknown
+
+
+class FakeSwaps:
+    """Stands in for Jupiter: fills at ``price`` unless told otherwise per child."""
+
+    def __init__(self, outcomes=(), price=2.0, impact=lambda amount: 0.0):
+        self.outcomes = list(outcomes)
+        self.price = price
+        self.impact = impact
+        self.sent = []
+        self.quotes = []
+
+    async def create_order(self, amount, input_mint, output_mint, label=""):
+        self.quotes.append(amount)
+        return {"transaction": "tx", "priceImpactPct": str(self.impact(amount))}
+
+    async def perform_swap(self, amount, input_mint, output_mint, input_symbol, output_symbol, ultra_order=None):
+        self.sent.append(amount)
+        outcome = self.outcomes.pop(0) if self.outcomes else "fill"
+        if outcome == "unknown":
+            raise SwapOutcomeUnknown("not confirmed")
+        if outcome == "fail":
+            return None
+        return SwapFill(amount, amount / self.price)
+
+
+@pytest.fixture
+def swaps(monkeypatch):
+    def install(*args, **kwargs):
+        fake = FakeSwaps(*args, **kwargs)
+        monkeypatch.setattr(slicing, "perform_swap", fake.perform_swap)
+        monkeypatch.setattr(slicing, "create_order", fake.create_order)
+        return fake
+
+    return install
+
+
+@pytest.fixture
+def latencies(monkeypatch):
+    registry = LatencyMetrics()
+    monkeypatch.setattr(metrics_module, "_metrics_instance", registry)
+    return registry
+
+
+def _order(amount=100.0, side="buy"):
+    return Order(
+        side,
+        pd.DataFrame({"close": [2.0]}),
+        "MINT",
+        "TOKEN",
+        amount,
+        "USDC" if side == "buy" else "MINT",
+        "MINT" if side == "buy" else "USDC",
+        "USDC" if side == "buy" else "TOKEN",
+        "TOKEN" if side == "buy" else "USDC",
+    )
+
+
+def _run(plan):
+    asyncio.run(plan.run())
+    return plan
+
+
+def test_unknown_outcome_stops_the_plan(swaps):
+    fake = swaps(outcomes=["fill", "unknown"])
+
+    plan = _run(SlicePlan(_order(100.0), slices=4, interval=0))
+
+    assert fake.sent == [25.0, 25.0]
+    assert plan.outcome_unknown
+    assert plan.cancelled
+    assert plan.children == 2
+    # Only the confirmed child counts as filled
+    assert plan.filled_input == 25.0
+    assert plan.filled_output == 12.5
+
+
+def test_costly_children_are_halved_including_the_last(swaps):
+    # Anything over 20 moves the price more than the 1% limit
+    fake = swaps(impact=lambda amount: 2.0 if amount > 20 else 0.5)
+
+    plan = _run(SlicePlan(_order(100.0), slices=2, interval=0, max_impact_pct=1.0))
+
+    # 50 -> 25 -> 12.5, then 87.5 -> 43.75 -> 21.875 -> 10.9375
+    assert fake.sent == [12.5, 10.9375]
+    # The last child's unsent remainder is left for settling as a partial fill
+    assert plan.remaining == 100.0 - 12.5 - 10.9375
+
+
+def test_halving_stops_at_the_limit_and_sends_what_was_quoted(swaps):
+    fake = swaps(impact=lambda amount: 5.0)
+
+    plan = _run(SlicePlan(_order(80.0), slices=1, interval=0, max_impact_pct=1.0))
+
+    assert fake.quotes == [80.0, 40.0, 20.0, 10.0]
+    assert fake.sent == [10.0]
+    assert plan.remaining == 70.0
+
+
+def test_failed_children_leave_a_partial_fill(swaps):
+    fake = swaps(outcomes=["fill", "fail", "fill"])
+
+    plan = _run(SlicePlan(_order(90.0), slices=3, interval=0))
+
+    # The failed child's share is spread over the children after it
+    assert fake.sent == [30.0, 30.0, 60.0]
+    assert plan.children == 3
+    assert plan.filled_input == 90.0
+    assert plan.filled_output == 45.0
+    assert not plan.outcome_unknown
+
+
+def test_unfilled_children_are_not_retried_past_the_last(swaps):
+    swaps(outcomes=["fill", "fail"])
+
+    plan = _run(SlicePlan(_order(100.0), slices=2, interval=0))
+
+    assert plan.filled_input == 50.0
+    assert plan.remaining == 50.0
+
+
+def test_cancel_stops_before_the_next_child(swaps):
+    fake = swaps()
+    plan = SlicePlan(_order(100.0), slices=4, interval=0)
+    perform_swap = fake.perform_swap
+
+    async def cancel_after_first(*args, **kwargs):
+        plan.cancel()
+        return await perform_swap(*args, **kwargs)
+
+    slicing.perform_swap = cancel_after_first
+    _run(plan)
+
+    # The child in flight still counts
+    assert fake.sent == [25.0]
+    assert plan.children == 1
+    assert plan.filled_input == 25.0
+    assert plan.remaining == 75.0
+
+
+def test_signal_to_fill_is_observed_at_the_first_fill(swaps, latencies):
+    swaps(outcomes=["fail", "fill", "fill"])
+
+    _run(SlicePlan(_order(90.0), slices=3, interval=0))
+
+    assert len(latencies._histograms[("signal_to_fill", "TOKEN")].samples) == 1
+    assert len(latencies._histograms[("sliced_order", "TOKEN")].samples) == 1
+
+
+def test_unfilled_plan_observes_no_signal_to_fill(swaps, latencies):
+    swaps(outcomes=["fail", "fail"])
+
+    _run(SlicePlan(_order(100.0), slices=2, interval=0))
+
+    assert ("signal_to_fill", "TOKEN") not in latencies._histograms
+
+
+def test_slicer_runs_one_plan_per_mint_and_hands_back_finished_ones(swaps):
+    swaps()
+    slicer = OrderSlicer()
+
+    plan = slicer.start(_order(100.0), slices=2, interval=0, max_impact_pct=0)
+    with pytest.raises(ValueError):
+        slicer.start(_order(100.0), slices=2, interval=0, max_impact_pct=0)
+    plan.wait(5)
+
+    assert slicer.finished() == [plan]
+    assert slicer.active("MINT") is None
+    assert slicer.finished() == []
+    assert plan.filled_input == 100.0
+
+
+def test_cancel_all_stops_every_plan(swaps):
+    fake = swaps()
+    slicer = OrderSlicer()
+    plans = []
+    in_flight = threading.Semaphore(0)
+    perform_swap = fake.perform_swap
+
+    async def held_until_cancelled(*args, **kwargs):
+        # Keeps the first child in flight until cancel_all reaches its plan
+        in_flight.release()
+        while not all(plan.cancelled for plan in plans):
+            await asyncio.sleep(0.001)
+        return await perform_swap(*args, **kwargs)
+
+    slicing.perform_swap = held_until_cancelled
+    plans.append(slicer.start(_order(100.0), slices=4, interval=0, max_impact_pct=0))
+    other = _order(60.0)
+    other.mint = "OTHER"
+    plans.append(slicer.start(other, slices=3, interval=0, max_impact_pct=0))
+    assert in_flight.acquire(timeout=5) and in_flight.acquire(timeout=5)
+    slicer.cancel_all(timeout=5)
+
+    assert all(plan.done for plan in plans)
+    assert sorted(fake.sent) == [20.0, 25.0]
+    assert {plan.order.mint for plan in slicer.finished()} == {"MINT", "OTHER"}
@@ -0,0 +1,86 @@
+import pytest
+from solders.keypair import Keypair
+
+from soltrade import streaming
+from soltrade.async_runtime import runtime
+from soltrade.standins import StandInRpcWebsocket
+from soltrade.wallet import TOKEN_2022_PROGRAM_ID, TOKEN_PROGRAM_ID
+
+
+class FakeCache:
+    def __init__(self):
+        self.balances = {}
+        self.invalidated = []
+
+    def set(self, mint, balance):
+        self.balances[mint] = balance
+
+    def adjust(self, mint, delta):
+        self.balances[mint] = self.balances.get(mint, 0.0) + delta
+
+    def invalidate(self, mint=None):
+        self.invalidated.append(mint)
+
+
+@pytest.fixture
+def stream(monkeypatch, default_config):
+    default_config.private_key = str(Keypair())
+    cache = FakeCache()
+    monkeypatch.setattr(streaming, "balance_cache", lambda: cache)
+    server = StandInRpcWebsocket()
+    runtime().run(server.start())
+    wallet_stream = streaming.WalletStream(server.url)
+    runtime().run(wallet_stream.start())
+    runtime().run(server.wait_for_subscriptions({"accountSubscribe", "programSubscribe"}))
+    yield server, wallet_stream, cache
+    runtime().run(wallet_stream.stop())
+    runtime().run(server.stop())
+
+
+def test_token_accounts_of_both_programs_are_streamed(stream):
+    server, wallet_stream, cache = stream
+
+    runtime().run(server.push_token_account("Acc1", "MintX", 5.0))
+    assert wallet_stream.wait_for_changes(2) == {"MintX"}
+    runtime().run(
+        server.push_token_account("Acc2", "MintY", 3.0, program_id=str(TOKEN_2022_PROGRAM_ID))
+    )
+    assert wallet_stream.wait_for_changes(2) == {"MintY"}
+
+    assert cache.invalidated == ["MintX", "MintY"]
+    assert wallet_stream.held("MintX") == 5.0
+    assert wallet_stream.held("MintY") == 3.0
+    assert wallet_stream.held("MintZ") is None
+
+
+def test_held_follows_balance_changes(stream):
+    server, wallet_stream, cache = stream
+
+    runtime().run(server.push_token_account("Acc1", "MintX", 5.0))
+    wallet_stream.wait_for_changes(2)
+    runtime().run(server.push_token_account("Acc1", "MintX", 0.0))
+    wallet_stream.wait_for_changes(2)
+
+    assert wallet_stream.held("MintX") == 0.0
+    assert cache.balances["MintX"] == -5.0
+
+
+def test_malformed_notifications_are_skipped_without_reconnecting(stream):
+    server, wallet_stream, cache = stream
+
+    # Not jsonParsed, and missing the account altogether
+    runtime().run(
+        server._notify(
+            "programSubscribe",
+            {"pubkey": "Acc1", "account": {"data": ["", "base64"]}},
+            str(TOKEN_PROGRAM_ID),
+        )
+    )
+    runtime().run(server._notify("programSubscribe", {"pubkey": "Acc2"}, str(TOKEN_PROGRAM_ID)))
+    runtime().run(server._notify("accountSubscribe", {}))
+    runtime().run(server.push_token_account("Acc3", "MintX", 2.0))
+
+    assert wallet_stream.wait_for_changes(2) == {"MintX"}
+    # A reconnect would have invalidated every balance
+    assert None not in cache.invalidated
+    assert cache.balances == {}
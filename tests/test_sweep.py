@@ -0,0 +1,49 @@
+import pandas as pd
+
+from soltrade.sweep import parameter_grid, run_sweep
+
+
+GRID = parameter_grid({"stoploss": [2.0, 5.0], "takeprofit": [4.0, 10.0]})
+
+
+def test_repeated_sweep_is_served_from_the_cache(pool, candles, tmp_path):
+    cache_path = str(tmp_path / "data" / "sweeps.db")
+    first = run_sweep(candles(), GRID, cache_path=cache_path)
+    assert len(pool.tasks) == len(GRID)
+
+    pool.tasks.clear()
+    second = run_sweep(candles(), GRID, cache_path=cache_path)
+
+    assert pool.tasks == []
+    pd.testing.assert_frame_equal(first, second)
+
+
+def test_only_new_configurations_are_run(pool, candles, tmp_path):
+    cache_path = str(tmp_path / "data" / "sweeps.db")
+    run_sweep(candles(), GRID[:2], cache_path=cache_path)
+    pool.tasks.clear()
+
+    report = run_sweep(candles(), GRID, cache_path=cache_path)
+
+    assert [task[0] for task in pool.tasks] == GRID[2:]
+    assert len(report) == len(GRID)
+
+
+def test_cache_is_keyed_on_the_candles_and_settings(pool, candles, tmp_path):
+    cache_path = str(tmp_path / "data" / "sweeps.db")
+    run_sweep(candles(), GRID, cache_path=cache_path)
+    pool.tasks.clear()
+
+    run_sweep(candles(seed=2), GRID, cache_path=cache_path)
+    assert len(pool.tasks) == len(GRID)
+    pool.tasks.clear()
+
+    run_sweep(candles(), GRID, fee_pct=0.2, cache_path=cache_path)
+    assert len(pool.tasks) == len(GRID)
+
+
+def test_sweep_without_a_cache_runs_everything(pool, candles, tmp_path):
+    run_sweep(candles(), GRID, cache_path=None)
+    run_sweep(candles(), GRID, cache_path=None)
+
+    assert len(pool.tasks) == 2 * len(GRID)
@@ -0,0 +1,104 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from soltrade.panel import build_panel
+from soltrade.strategy import (
+    calc_trailing_stoploss,
+    position_panel_columns,
+    trailing_stoploss_levels,
+)
+
+
+def loop_trailing_stoploss(high, entry_price, tsl, tslt):
+    """The per-bar loop ``calc_trailing_stoploss`` used before it was vectorized."""
+    trailing_stop = []
+    tracking_started = False
+    highest_price = high[0]
+
+    for price in high:
+        if not tracking_started and price >= entry_price * (1 + tslt / 100):
+            tracking_started = True
+            highest_price = price
+        if tracking_started:
+            if price > highest_price:
+                highest_price = price
+            trailing_stop.append(highest_price * (1 - tsl / 100))
+        else:
+            trailing_stop.append(np.nan)
+    return np.asarray(trailing_stop, dtype=float)
+
+
+def _paths(rows, bars, seed=3):
+    rng = np.random.default_rng(seed)
+    return 100 * np.exp(np.cumsum(rng.normal(0, 0.02, (rows, bars)), axis=1))
+
+
+@pytest.mark.parametrize("tsl, tslt", [(2, 5), (1, 0), (5, 20), (0.5, 100)])
+def test_matches_the_loop_for_one_path(tsl, tslt):
+    for high in _paths(20, 200):
+        expected = loop_trailing_stoploss(high, high[0], tsl, tslt)
+        np.testing.assert_allclose(
+            trailing_stoploss_levels(high, high[0], tsl, tslt), expected, equal_nan=True
+        )
+
+
+def test_matches_the_loop_for_many_paths_with_per_row_parameters():
+    highs = _paths(50, 120, seed=11)
+    rng = np.random.default_rng(5)
+    entry = highs[:, 0] * rng.uniform(0.9, 1.1, len(highs))
+    tsl = rng.uniform(0.5, 5, len(highs))
+    tslt = rng.uniform(0, 10, len(highs))
+
+    stops = trailing_stoploss_levels(highs, entry, tsl, tslt)
+
+    assert stops.shape == highs.shape
+    for row, high in enumerate(highs):
+        expected = loop_trailing_stoploss(high, entry[row], tsl[row], tslt[row])
+        np.testing.assert_allclose(stops[row], expected, equal_nan=True)
+
+
+def test_never_activated_is_all_nan():
+    high = np.linspace(100, 104, 10)
+
+    assert np.isnan(trailing_stoploss_levels(high, 100.0, 2, 5)).all()
+
+
+def _position_frame(highs, entry_price):
+    return pd.DataFrame(
+        {
+            "time": pd.date_range("2026-01-01", periods=len(highs), freq="min"),
+            "high": highs,
+            "entry_price": entry_price,
+        }
+    )
+
+
+def test_highs_before_the_entry_do_not_move_the_stop():
+    # Bought at 90 on bar 2 after a fall from 110
+    df = _position_frame([110.0, 100.0, 90.0, 92.0, 96.0], 90.0)
+    entered = pd.Timestamp(df["time"].iat[2]).timestamp()
+
+    stops = calc_trailing_stoploss(df.copy(), since=entered)["trailing_stoploss"].to_numpy()
+    unbounded = calc_trailing_stoploss(df.copy())["trailing_stoploss"].to_numpy()
+
+    # The default strategy activates 5% above the entry and trails 2% below the high
+    np.testing.assert_allclose(stops, [np.nan, np.nan, np.nan, np.nan, 96.0 * 0.98])
+    assert unbounded[-1] == 110.0 * 0.98
+
+
+def test_panel_stops_follow_each_rows_entry():
+    frames = [_position_frame([110.0, 100.0, 90.0, 92.0, 96.0], 90.0) for _ in range(2)]
+    for df in frames:
+        df["open"] = df["low"] = df["close"] = df["high"]
+    panel = build_panel(frames, ["A", "B"])
+    state = {"position": True, "entry_price": 90.0, "stoploss": 85.5, "takeprofit": 99.0}
+    entered = pd.Timestamp(frames[0]["time"].iat[2]).timestamp()
+
+    columns = position_panel_columns(panel, ["A", "B"], [state, state], [entered, None])
+
+    for row, df in enumerate(frames):
+        expected = calc_trailing_stoploss(df.copy(), since=[entered, None][row])
+        np.testing.assert_allclose(
+            columns["trailing_stoploss"][row], expected["trailing_stoploss"], equal_nan=True
+        )
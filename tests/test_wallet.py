@@ -0,0 +1,154 @@
+import asyncio
+import json
+
+from solders.keypair import Keypair
+from solders.rpc.responses import GetBalanceResp, GetTokenAccountsByOwnerJsonParsedResp
+
+from soltrade import wallet
+from soltrade.signer import Signer
+from soltrade.wallet import TOKEN_2022_PROGRAM_ID, TOKEN_PROGRAM_ID, BalanceCache
+
+USDC = "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v"
+PYUSD = "2b1kV6DkPAnxd5ixfnxCpjxmKwqjjaYmCZfHsFu24GXo"
+
+
+def _token_account(mint, program_id, ui_amount):
+    return {
+        "pubkey": str(Keypair().pubkey()),
+        "account": {
+            "lamports": 2039280,
+            "owner": str(program_id),
+            "executable": False,
+            "rentEpoch": 0,
+            "space": 165,
+            "data": {
+                "program": "spl-token",
+                "space": 165,
+                "parsed": {
+                    "type": "account",
+                    "info": {
+                        "mint": mint,
+                        "tokenAmount": {
+                            "amount": str(int(ui_amount * 10**6)),
+                            "decimals": 6,
+                            "uiAmount": ui_amount,
+                            "uiAmountString": str(ui_amount),
+                        },
+                    },
+                },
+            },
+        },
+    }
+
+
+class FakeRpc:
+    """Serves token accounts for whichever program a query asks for."""
+
+    def __init__(self, accounts):
+        self.accounts = accounts
+        self.programs = []
+
+    async def get_balance(self, owner):
+        return GetBalanceResp.from_json(
+            json.dumps({"jsonrpc": "2.0", "id": 1, "result": {"context": {"slot": 1}, "value": 10**9}})
+        )
+
+    async def get_token_accounts_by_owner_json_parsed(self, owner, opts):
+        self.programs.append(opts.program_id)
+        value = [
+            _token_account(mint, program_id, amount)
+            for mint, program_id, amount in self.accounts
+            if program_id == opts.program_id
+        ]
+        return GetTokenAccountsByOwnerJsonParsedResp.from_json(
+            json.dumps({"jsonrpc": "2.0", "id": 1, "result": {"context": {"slot": 1}, "value": value}})
+        )
+
+
+def test_fetch_balances_merges_both_token_programs(monkeypatch, default_config):
+    rpc = FakeRpc(
+        [
+            (USDC, TOKEN_PROGRAM_ID, 5.0),
+            (USDC, TOKEN_PROGRAM_ID, 1.5),
+            (PYUSD, TOKEN_2022_PROGRAM_ID, 7.0),
+        ]
+    )
+    default_config._async_client = rpc
+    monkeypatch.setattr(wallet, "signer", lambda: Signer(Keypair()))
+
+    balances = asyncio.run(wallet.fetch_balances())
+
+    assert balances[USDC] == 6.5
+    assert balances[PYUSD] == 7.0
+    assert balances[default_config.sol_mint] == wallet.spendable_sol(10**9)
+    assert sorted(map(str, rpc.programs)) == sorted(map(str, wallet.TOKEN_PROGRAM_IDS))
+
+
+class FakeWallet:
+    def __init__(self, balances):
+        self.balances = balances
+        self.fetches = 0
+
+    async def fetch_balances(self):
+        self.fetches += 1
+        return dict(self.balances)
+
+
+def test_invalidate_only_refetches_for_that_mint(monkeypatch):
+    fake = FakeWallet({USDC: 1.0, PYUSD: 2.0})
+    monkeypatch.setattr(wallet, "fetch_balances", fake.fetch_balances)
+    cache = BalanceCache(ttl=60.0)
+    cache.get(USDC)
+
+    cache.invalidate(PYUSD)
+    cache.get(USDC)
+    assert fake.fetches == 1
+
+    fake.balances[PYUSD] = 3.0
+    assert cache.get(PYUSD) == 3.0
+    assert fake.fetches == 2
+
+    cache.get(PYUSD)
+    assert fake.fetches == 2
+
+
+def test_invalidate_without_a_mint_refetches_everything(monkeypatch):
+    fake = FakeWallet({USDC: 1.0})
+    monkeypatch.setattr(wallet, "fetch_balances", fake.fetch_balances)
+    cache = BalanceCache(ttl=60.0)
+    cache.get(USDC)
+
+    cache.invalidate()
+    cache.get(USDC)
+
+    assert fake.fetches == 2
+
+
+def test_reserved_balance_is_not_available_until_released(monkeypatch):
+    fake = FakeWallet({USDC: 10.0})
+    monkeypatch.setattr(wallet, "fetch_balances", fake.fetch_balances)
+    cache = BalanceCache(ttl=60.0)
+
+    cache.reserve(USDC, 4.0)
+    cache.reserve(USDC, 3.0)
+    assert cache.available(USDC) == 3.0
+    assert cache.get(USDC) == 10.0
+
+    cache.release(USDC, 4.0)
+    assert cache.available(USDC) == 7.0
+    cache.release(USDC, 3.0)
+    assert cache.available(USDC) == 10.0
+
+
+def test_available_never_goes_negative(monkeypatch):
+    fake = FakeWallet({USDC: 1.0})
+    monkeypatch.setattr(wallet, "fetch_balances", fake.fetch_balances)
+    cache = BalanceCache(ttl=60.0)
+
+    cache.reserve(USDC, 5.0)
+    assert cache.available(USDC) == 0.0
+
+    # Releasing more than was reserved leaves nothing reserved, not a credit
+    cache.release(USDC, 6.0)
+    cache.reserve(USDC, 0.5)
+    assert cache.available(USDC) == 0.5